@@ -0,0 +1,61 @@
+"""Synthetic NDBC text files for benchmarking
+
+Generates data in the layout of NDBC standard meteorological files, including
+the header and units lines and the usual missing-data flags.
+"""
+
+import numpy as np
+import pandas as pd
+
+STDMET_HEADER = (
+    "#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP"
+    "  VIS  TIDE\n"
+    "#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC"
+    "  mi    ft\n"
+)
+
+
+def stdmet_frame(year: int, freq: str = "10min", seed: int = 0) -> pd.DataFrame:
+    """Return a year of synthetic stdmet observations with missing flags"""
+    rng = np.random.default_rng(seed + year)
+    times = pd.date_range(f"{year}-01-01", f"{year}-12-31 23:59", freq=freq)
+    n = len(times)
+    df = pd.DataFrame(
+        {
+            "#YY": times.year,
+            "MM": times.month,
+            "DD": times.day,
+            "hh": times.hour,
+            "mm": times.minute,
+            "WDIR": rng.integers(0, 360, n),
+            "WSPD": rng.uniform(0, 20, n).round(1),
+            "GST": rng.uniform(0, 25, n).round(1),
+            "WVHT": rng.uniform(0.3, 6, n).round(2),
+            "DPD": rng.uniform(3, 20, n).round(2),
+            "APD": rng.uniform(3, 12, n).round(2),
+            "MWD": rng.integers(0, 360, n),
+            "PRES": rng.uniform(990, 1035, n).round(1),
+            "ATMP": rng.uniform(5, 20, n).round(1),
+            "WTMP": rng.uniform(8, 18, n).round(1),
+            "DEWP": np.full(n, 999.0),
+            "VIS": np.full(n, 99.0),
+            "TIDE": np.full(n, 99.0),
+        }
+    )
+    # Waves are only reported hourly, the remaining rows carry flags
+    no_wave = times.minute != 40
+    df.loc[no_wave, ["WVHT", "DPD", "APD"]] = 99.0
+    df.loc[no_wave, "MWD"] = 999
+    gaps = rng.random(n) < 0.02
+    df.loc[gaps, "WDIR"] = 999
+    df.loc[gaps, ["WSPD", "GST"]] = 99.0
+    return df
+
+
+def stdmet_text(year: int, freq: str = "10min", seed: int = 0) -> str:
+    """Return a year of synthetic stdmet observations as NDBC formatted text"""
+    df = stdmet_frame(year, freq=freq, seed=seed)
+    # Single spaces instead of NDBC's aligned columns, the parsers split on
+    # any whitespace and to_string takes several seconds per year
+    body = df.to_csv(sep=" ", header=False, index=False)
+    return STDMET_HEADER + body
@@ -0,0 +1,77 @@
+"""Benchmark joining data packages recorded on different timestamps
+
+Compares chaining `merge_asof` over each pair of packages against aligning all
+packages on one shared index with `align_frames`.  Hourly stdmet, 10-minute
+cwind, hourly srad and a 47 bin hourly spectral package are joined on the
+stdmet timestamps within 10 minutes.
+
+Usage:
+    python benchmarks/bench_align.py [years]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from NDBC.align import align_frames
+
+PACKAGES = {
+    "stdmet": ("50min", "H", 13),
+    "cwind": ("0min", "10min", 5),
+    "srad": ("0min", "H", 3),
+    "swden": ("40min", "H", 47),
+}
+
+
+def package_frames(years, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    for pkg, (offset, freq, n_cols) in PACKAGES.items():
+        start = pd.Timestamp("2000-01-01") + pd.Timedelta(offset)
+        index = pd.date_range(start, f"{2000 + years - 1}-12-31 23:59", freq=freq)
+        # Columns are held in one block, as in a parsed data package
+        frames[pkg] = pd.DataFrame(
+            {
+                f"{pkg}_{i}": rng.uniform(0, 10, len(index)).astype(np.float32)
+                for i in range(n_cols)
+            },
+            index=index,
+        )
+    return frames
+
+
+def chained_merge_asof(frames):
+    base, *others = frames
+    data = frames[base]
+    for pkg in others:
+        data = pd.merge_asof(
+            data,
+            frames[pkg],
+            left_index=True,
+            right_index=True,
+            tolerance=pd.Timedelta("10min"),
+            direction="nearest",
+        )
+    return data
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    max_years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'years':>5} {'merge_asof (s)':>14} {'align (s)':>9} {'speedup':>7}")
+    for years in sorted({1, max_years // 4 or 1, max_years // 2 or 1, max_years}):
+        frames = package_frames(years)
+        chained = timed(chained_merge_asof, frames)
+        aligned = timed(align_frames, frames, on="stdmet", tolerance="10min")
+        print(f"{years:5d} {chained:14.3f} {aligned:9.3f} {chained / aligned:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark parsing a year of stdmet data for a few columns
+
+Compares running every column of a file through the parse and cleaning
+pipeline against reading only the requested columns, as `get_data` does when
+given `columns`.
+
+Usage:
+    python benchmarks/bench_columns.py [repeats]
+"""
+
+import sys
+import time
+
+from _synthetic import stdmet_text
+from NDBC.NDBC import DataBuoy
+
+
+def best_of(repeats, func, *args, **kwargs):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    text = stdmet_text(2020)
+    full = best_of(repeats, DataBuoy._parse_text, text, True)
+    print(f"{'columns':>18} {'time (s)':>9} {'vs all':>7}")
+    print(f"{'all':>18} {full:9.3f} {1:7.2f}")
+    for columns in [["WVHT"], ["WVHT", "DPD", "MWD"]]:
+        narrow = best_of(repeats, DataBuoy._parse_text, text, True, columns=columns)
+        print(f"{','.join(columns):>18} {narrow:9.3f} {narrow / full:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
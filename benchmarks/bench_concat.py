@@ -0,0 +1,51 @@
+"""Benchmark merging many parsed periods into one data package
+
+Compares growing the data package with one concat per period, as DataBuoy used
+to do, against collecting the periods and merging them in a single pass.  The
+time per year of the single pass stays flat as the history grows, while the
+per-period concat grows with the size of the data already loaded.
+
+Usage:
+    python benchmarks/bench_concat.py [years]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from _synthetic import stdmet_frame
+from NDBC.frames import merge_frames
+
+DATE_PARTS = {"#YY": "year", "MM": "month", "DD": "day", "hh": "hour", "mm": "minute"}
+
+
+def year_frame(year):
+    df = stdmet_frame(year)
+    times = pd.to_datetime(df[list(DATE_PARTS)].rename(columns=DATE_PARTS))
+    return df.drop(columns=list(DATE_PARTS)).set_index(times)
+
+
+def repeated_concat(frames):
+    data = frames[0]
+    for df in frames[1:]:
+        data = pd.concat([data, df])
+    return data
+
+
+def main():
+    n_years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    frames = [year_frame(year) for year in range(1990, 1990 + n_years)]
+    print(f"{'years':>6} {'rows':>9} {'repeated (s)':>13} {'single (s)':>11}")
+    for n in sorted({n for n in [1, 5, 10, 20, n_years] if n <= n_years}):
+        start = time.perf_counter()
+        repeated_concat(frames[:n])
+        repeated = time.perf_counter() - start
+        start = time.perf_counter()
+        merged = merge_frames(frames[:n])
+        single = time.perf_counter() - start
+        print(f"{n:6d} {len(merged):9d} {repeated:13.3f} {single:11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark parsing many years of stdmet files with threads and processes
+
+Parses the same set of files the way `DataBuoy.get_data` does: a thread per
+file in flight, parsing either in the thread (limited by the GIL) or in a
+process pool (`parse_workers`), with frames returned as Arrow IPC streams, in
+shared memory or pickled.  Speedups are against parsing every file in one thread.
+
+With one CPU only single worker runs are made, more workers cannot help.
+
+Usage:
+    python benchmarks/bench_parse_workers.py [years]
+
+years defaults to four files per CPU.
+"""
+
+import os
+import sys
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from _synthetic import stdmet_text
+from NDBC.NDBC import DataBuoy
+from NDBC.parallel import ProcessParser, pa
+
+
+def parse_all(texts, workers, parse=DataBuoy._parse_text):
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda text: parse(text, True), texts))
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 4 * cpus
+    # Twenty distinct years of text, repeated for longer histories
+    distinct = {year: stdmet_text(year) for year in range(2000, 2000 + min(years, 20))}
+    texts = [distinct[2000 + i % 20] for i in range(years)]
+    counts = sorted({1, 2, 4, cpus}) if cpus > 1 else [1]
+    modes = ["ipc", "shm", "pickle"] if pa is not None else ["shm", "pickle"]
+    baseline = timed(parse_all, texts, 1)
+    print(f"{years} files, one thread: {baseline:.2f} s")
+    print(f"{'workers':>7} {'threads':>8}" + "".join(f" {m:>8}" for m in modes))
+    for workers in counts:
+        row = f"{workers:7d} {baseline / timed(parse_all, texts, workers):7.1f}x"
+        for mode in modes:
+            with ProcessParser(workers, transport=mode) as parser:
+                # Start the worker processes before timing
+                parse_all(texts[:workers], workers, parser)
+                elapsed = timed(parse_all, texts, workers, parser)
+            row += f" {baseline / elapsed:7.1f}x"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
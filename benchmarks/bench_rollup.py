@@ -0,0 +1,43 @@
+"""Benchmark daily and monthly statistics of a long stdmet series
+
+Compares resampling the full 10-minute series for each request against
+reading precomputed rollups, and reports the one-off cost of rolling up the
+data as each year is loaded.
+
+Usage:
+    python benchmarks/bench_rollup.py [years]
+"""
+
+import sys
+import time
+
+import pandas as pd
+
+from bench_concat import year_frame
+from NDBC.rollup import Rollup
+
+STATS = ["mean", "max"]
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    frames = [year_frame(2000 + i) for i in range(years)]
+    data = pd.concat(frames)
+    rollup = Rollup()
+    update = sum(timed(rollup.update, df) for df in frames)
+    print(f"{years} years, {len(data)} rows; rolling up as loaded: {update:.3f} s")
+    print(f"{'freq':>6} {'resample (s)':>12} {'rollup (s)':>10} {'speedup':>8}")
+    for freq, rule in [("day", "D"), ("month", "MS")]:
+        resample = timed(lambda: data.resample(rule).agg(STATS))
+        query = timed(rollup.query, freq, STATS)
+        print(f"{freq:>6} {resample:12.3f} {query:10.4f} {resample / query:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark DataBuoy persistence formats
+
+Compares save/load time and on-disk size of the JSON format against the
+binary columnar storage backends for a multi-year stdmet history.
+
+Usage:
+    python benchmarks/bench_storage.py [years]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from _synthetic import stdmet_text
+from NDBC.NDBC import DataBuoy
+from NDBC.repository.storage import BACKENDS
+
+
+def build_buoy(n_years: int) -> DataBuoy:
+    db = DataBuoy("46042")
+    db.station_info = {"lat": "36.785 N", "lon": "122.398 W"}
+    results = [
+        db._parse_text(stdmet_text(year), datetime_index=True)
+        for year in range(2000, 2000 + n_years)
+    ]
+    db._DataBuoy__store_data(results, data_type="stdmet")
+    return db
+
+
+def disk_usage(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def main():
+    n_years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    db = build_buoy(n_years)
+    print(f"{n_years} years, {len(db.stdmet)} rows")
+    print(f"{'format':>10} {'save (s)':>10} {'load (s)':>10} {'size (MB)':>10}")
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        for backend in ["json"] + list(BACKENDS.keys()):
+            path = os.path.join(tmp_dir, f"buoy_{backend}")
+            path += ".json" if backend == "json" else ""
+            try:
+                start = time.perf_counter()
+                db.save(path, backend=backend)
+                saved = time.perf_counter()
+                DataBuoy.load(path)
+                loaded = time.perf_counter()
+            except ImportError as e:
+                print(f"{backend:>10} skipped: {e}")
+                continue
+            print(
+                f"{backend:>10} {saved - start:10.2f} {loaded - saved:10.2f} "
+                f"{disk_usage(path) / 1e6:10.1f}"
+            )
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
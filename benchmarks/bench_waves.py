@@ -0,0 +1,82 @@
+"""Benchmark integrated wave parameters from spectral data
+
+Compares `NDBC.waves.wave_parameters` with computing the same parameters one
+observation at a time from the wide DataFrames DataBuoy stores, for hourly
+synthetic spectra with 47 frequency bins.
+
+Usage:
+    python benchmarks/bench_waves.py [years]
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from NDBC.spectral import SpectralData
+from NDBC.waves import bandwidths, wave_parameters
+
+FREQS = np.round(
+    np.concatenate([np.arange(0.02, 0.1, 0.005), np.arange(0.1, 0.49, 0.0125)]), 4
+).astype(np.float32)[:47]
+
+
+def synthetic_frames(n_years: int):
+    times = pd.date_range("2000-01-01", periods=n_years * 8760, freq="H")
+    rng = np.random.default_rng(0)
+    shape = (len(times), len(FREQS))
+    columns = [f"{f:.4f}".lstrip("0") for f in FREQS]
+    frames = {}
+    for data_type, low, high in [
+        ("swden", 0, 5),
+        ("swdir", 0, 360),
+        ("swr1", 0.2, 0.95),
+    ]:
+        values = rng.uniform(low, high, shape).round(2)
+        frames[data_type] = pd.DataFrame(values, index=times, columns=columns)
+    return frames
+
+
+def per_row(frames):
+    """Compute the parameters by iterating over the rows of each DataFrame"""
+    freqs = np.array([float(c) for c in frames["swden"].columns])
+    df = bandwidths(freqs)
+    rows = {}
+    for (t, s), (_, a), (_, r) in zip(
+        frames["swden"].iterrows(),
+        frames["swdir"].iterrows(),
+        frames["swr1"].iterrows(),
+    ):
+        s, a, r = s.to_numpy(), np.deg2rad(a.to_numpy()), r.to_numpy()
+        m0, m1, m2 = [np.sum(s * df * freqs**n) for n in range(3)]
+        a1 = np.sum(s * df * r * np.cos(a)) / m0
+        b1 = np.sum(s * df * r * np.sin(a)) / m0
+        rows[t] = [
+            4 * np.sqrt(m0),
+            1 / freqs[np.argmax(s)],
+            m0 / m1,
+            np.sqrt(m0 / m2),
+            np.rad2deg(np.arctan2(b1, a1)) % 360,
+            np.rad2deg(np.sqrt(2 * (1 - np.hypot(a1, b1)))),
+        ]
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def main():
+    n_years = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    frames = synthetic_frames(n_years)
+    print(f"{n_years} years, {len(frames['swden'])} spectra, {len(FREQS)} bins")
+
+    start = time.perf_counter()
+    per_row(frames)
+    print(f"per row:    {time.perf_counter() - start:8.3f} s")
+
+    start = time.perf_counter()
+    spectra = {k: SpectralData.from_frame(v, k) for k, v in frames.items()}
+    wave_parameters(spectra["swden"], alpha1=spectra["swdir"], r1=spectra["swr1"])
+    print(f"vectorized: {time.perf_counter() - start:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
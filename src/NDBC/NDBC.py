@@ -7,20 +7,45 @@ Classes:
 
 import requests
 import pandas as pd
+import io
 import json
+import os
 import re
 import numpy as np
 
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
 from deprecation import deprecated
 from datetime import datetime as dt
 from bs4 import BeautifulSoup
-from typing import Union
+from typing import Iterator, Tuple, Union
 
 
 from logging import getLogger
 
+from NDBC.align import align_frames
+from NDBC.cache import text_digest
+from NDBC.fetch import fetch_first, get_session
+from NDBC.frames import ChunkedFrame, frame_times, merge_frames, project
+from NDBC.metadata import STATION_URL, parse_station_page
+from NDBC.missing import fixed_sentinels, mask_sentinels
+from NDBC.parallel import ProcessParser
+from NDBC.parsers import parse_ndbc_text, read_ndbc_text, read_text
+from NDBC.realtime import REALTIME_URL, fetch_since, realtime_url, to_ndbc_text
+from NDBC.repository.storage import LazyFrame, time_slice
+from NDBC.rollup import Rollup
+from NDBC.schema import compact_frame, memory_usage, parse_dtypes
+from NDBC.spectral import SPECTRAL_PACKAGES, SpectralData, align_spectra, to_dataset
+from NDBC.waves import DEFAULT_CHUNK_SIZE, wave_parameters
+
 logger = getLogger(__name__)
 
+# Periods fetched at once by time range queries, unless max_workers is given
+WINDOW_WORKERS = 4
+
 
 class DataBuoy(object):
     """
@@ -58,11 +83,8 @@ class DataBuoy(object):
     UOMS = {"metric": "M", "english": "E"}
     OBS_TYPES = {"buoy": "B", "ship": "S", "all": "A"}
     BASE_URL = "https://www.ndbc.noaa.gov/"
-    STATION_URL = BASE_URL + "station_page.php?station={}"
-    # REGEX PATTERNS FOR PARSING HTML STATION PAGES
-    LAT_PAT = r"\d+\.\d+\s+N"
-    LON_PAT = r"\d+\.\d+\s+W"
-    ATTR_PAT = r"<b>(.*):</b>\s*(.*)<br/>"
+    # Station pages are parsed by NDBC.metadata
+    STATION_URL = STATION_URL
     # Defining some template strings as class variables that will be
     # used to define specific data URLS for each instance.
     data_monthurls = [
@@ -76,15 +98,34 @@ class DataBuoy(object):
         "station}{url_char}{year}.txt.gz&dir=data/historical/{dtype}/"
     ]
 
+    # Realtime files holding the last 45 days of data, see NDBC.realtime
+    data_realtimeurl = REALTIME_URL
+
     # DEFINING METHODS
-    def __init__(self, station_id=False) -> None:
+    # Instance attributes holding runtime helpers rather than station state.
+    # These are not written out when the object is saved.  Rollups are
+    # written to their own files by the archive backends (see BuoyORM).
+    RUNTIME_ATTRS = ["cache", "frame_cache", "session", "rollups"]
+
+    def __init__(
+        self, station_id=False, cache=None, frame_cache=None, session=None
+    ) -> None:
         """
         Initialize object instance
         :param station_id: Station identifier <- required for data access
+        :param cache: Optional NDBC.cache.HTTPCache used to store downloaded files
+        :param frame_cache: Optional NDBC.cache.FrameCache used to store parsed data
+        :param session: Optional requests.Session used for downloads, defaults
+        to the shared session of NDBC.fetch
         """
         if station_id:
             self.station_id = str(station_id).lower()
         self.data = {}
+        self.cache = cache
+        self.frame_cache = frame_cache
+        self.session = session
+        # NDBC.rollup.Rollup of each data package with tracked aggregates
+        self.rollups = {}
 
     def __str__(self) -> str:
         """
@@ -114,10 +155,214 @@ class DataBuoy(object):
         Returns:
             pd.DataFrame|str: Dataframe if pkg in data dictionary, else string.
         """
-        return (
-            self.data[pkg]["data"]
-            if pkg in self.data.keys()
-            else f"{pkg} not found in data dictionary for {self.__str__()}"
+        if pkg not in self.data.keys():
+            return f"{pkg} not found in data dictionary for {self.__str__()}"
+        # Data packages from a lazily loaded archive, or with chunks not yet
+        # merged, are combined into a single DataFrame on first access
+        if isinstance(self.data[pkg]["data"], (LazyFrame, ChunkedFrame)):
+            self.data[pkg]["data"] = self.data[pkg]["data"].load()
+        return self.data[pkg]["data"]
+
+    def read(self, data_type="stdmet", columns=None, start=None, end=None):
+        """
+        Return data for a package limited to columns and a time range.  Packages
+        not yet read from a lazily loaded archive only read the requested
+        columns and time range from disk.
+        :param data_type: Data package to read
+        :param columns: List of columns to return, defaults to all columns
+        :param start: Earliest timestamp to include
+        :param end: Latest timestamp to include
+        :return: pandas DataFrame
+        """
+        if data_type not in self.data.keys():
+            raise LookupError(
+                f"{data_type} not found in data dictionary for {self.__str__()}"
+            )
+        data_df = self.data[data_type]["data"]
+        if isinstance(data_df, LazyFrame):
+            if columns is None and start is None and end is None:
+                return self.__get_dataframe(data_type)
+            return data_df.load(columns=columns, start=start, end=end)
+        if isinstance(data_df, ChunkedFrame):
+            data_df = self.__get_dataframe(data_type)
+        return project(time_slice(data_df, start, end), columns)
+
+    def share(self, data_type="stdmet", columns=None, start=None, end=None):
+        """
+        Copy data for a package into shared memory, so other processes can
+        map it without pickling or copying it, see NDBC.shm.
+        :param data_type: Data package to share
+        :param columns: List of columns to share, defaults to all columns
+        :param start: Earliest timestamp to include
+        :param end: Latest timestamp to include
+        :return: NDBC.shm.SharedFrame handle, picklable, to be opened with
+        SharedFrame.open in the receiving process
+        """
+        from NDBC.shm import SharedFrame
+
+        return SharedFrame.publish(self.read(data_type, columns, start, end))
+
+    def memory_usage(self) -> dict:
+        """
+        Report the memory held by each loaded data package
+        :return: Dictionary of data package to bytes.  Packages not yet read
+        from a lazily loaded archive are reported as 0.
+        """
+        usage = {}
+        for pkg, contents in self.data.items():
+            data_df = contents.get("data")
+            if isinstance(data_df, ChunkedFrame):
+                usage[pkg] = sum(memory_usage(c) for c in data_df.chunks)
+            elif isinstance(data_df, pd.DataFrame):
+                usage[pkg] = memory_usage(data_df)
+            else:
+                usage[pkg] = 0
+        return usage
+
+    def spectral(self, data_type="swden"):
+        """
+        Return a spectral wave package as a (time, frequency) float32 array
+        :param data_type: One of the spectral packages (swden, swdir, swdir2, swr1, swr2)
+        :return: NDBC.spectral.SpectralData
+        """
+        if data_type not in SPECTRAL_PACKAGES:
+            raise ValueError(
+                f"{data_type} is not a spectral data package.  Please use one of "
+                f'the following: {", ".join(SPECTRAL_PACKAGES)}'
+            )
+        data_df = self.__get_dataframe(data_type)
+        if isinstance(data_df, str):
+            raise LookupError(data_df)
+        units = self.data[data_type].get("meta", {}).get("units", False)
+        return SpectralData.from_frame(data_df, data_type, units=units)
+
+    def spectral_dataset(self, data_types=None, join="outer", as_xarray=True):
+        """
+        Return spectral wave packages on shared time and frequency axes
+        :param data_types: Spectral packages to include, defaults to all loaded
+        :param join: "outer" keeps all times and frequencies, "inner" only shared ones
+        :param as_xarray: Return an xarray Dataset (True) or a dictionary of
+        NDBC.spectral.SpectralData (False)
+        :return: xarray.Dataset or dictionary of aligned SpectralData
+        """
+        if data_types is None:
+            data_types = [k for k in SPECTRAL_PACKAGES if k in self.data.keys()]
+        spectra = {k: self.spectral(k) for k in data_types}
+        if as_xarray:
+            return to_dataset(spectra, join=join)
+        return align_spectra(spectra, join=join)
+
+    def align(
+        self,
+        data_types=None,
+        on=None,
+        rule=None,
+        tolerance=None,
+        direction="nearest",
+        agg=None,
+    ):
+        """
+        Join loaded data packages on one sorted DatetimeIndex, see
+        NDBC.align.align_frames
+        :param data_types: Packages to join, defaults to all loaded packages
+        :param on: Package or DatetimeIndex to align on, defaults to the
+        timestamps of all packages
+        :param rule: Pandas offset alias of a regular time axis, e.g. "1H"
+        :param tolerance: Largest time difference matched, e.g. "10min".
+        Defaults to exact matches only.
+        :param direction: "nearest", "backward" or "forward"
+        :param agg: Aggregation such as "mean" applied over each period of rule
+        :return: pandas DataFrame with (package, column) column labels
+        """
+        if data_types is None:
+            data_types = [k for k in self.DATA_PACKAGES if k in self.data.keys()]
+        frames = {}
+        for data_type in data_types:
+            if data_type not in self.DATA_PACKAGES:
+                raise ValueError(
+                    f"Unknown data package {data_type}.  Please use one of the "
+                    f'following: {", ".join(self.DATA_PACKAGES)}'
+                )
+            data_df = self.__get_dataframe(data_type)
+            if isinstance(data_df, str):
+                raise LookupError(data_df)
+            frames[data_type] = data_df
+        return align_frames(
+            frames,
+            on=on,
+            rule=rule,
+            tolerance=tolerance,
+            direction=direction,
+            agg=agg,
+        )
+
+    def track_rollups(self, data_type="stdmet", frequencies=None):
+        """
+        Keep hourly, daily and monthly aggregates of a data package, updated
+        as periods are loaded (see NDBC.rollup).  Data already held is rolled
+        up once when tracking starts.
+        :param data_type: Data package to aggregate
+        :param frequencies: Frequencies to keep, defaults to all of
+        NDBC.rollup.FREQUENCIES
+        :return: NDBC.rollup.Rollup
+        """
+        if data_type not in self.DATA_PACKAGES:
+            raise ValueError(
+                f"Unknown data package {data_type}.  Please use one of the "
+                f'following: {", ".join(self.DATA_PACKAGES)}'
+            )
+        rollup = Rollup(frequencies)
+        if data_type in self.data.keys():
+            rollup.update(self.__get_dataframe(data_type))
+        self.rollups[data_type] = rollup
+        return rollup
+
+    def rollup(
+        self,
+        data_type="stdmet",
+        freq="day",
+        stats=("mean",),
+        columns=None,
+        start=None,
+        end=None,
+    ):
+        """
+        Return precomputed aggregates of a data package without reading its
+        observations, see track_rollups
+        :param data_type: Data package with tracked rollups
+        :param freq: "hour", "day" or "month"
+        :param stats: Statistics to return from "mean", "min", "max", "count"
+        and "sum".  Counts are of valid (not missing) observations.
+        :param columns: Columns to return, defaults to all columns
+        :param start: Earliest period to include
+        :param end: Latest period to include
+        :return: pandas DataFrame indexed by period start with (column,
+        statistic) column labels
+        """
+        if data_type not in self.rollups:
+            raise LookupError(
+                f"{data_type} rollups are not tracked for {self.__str__()}.  "
+                "Use track_rollups to start tracking them."
+            )
+        return self.rollups[data_type].query(
+            freq=freq, stats=stats, columns=columns, start=start, end=end
+        )
+
+    def wave_parameters(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Compute integrated wave parameters (Hm0, Tp, Tm01, Tm02, MeanDir,
+        Spread) from the loaded spectral wave packages.  swden is required, the
+        directional parameters also require swdir and swr1.
+        :param chunk_size: Number of observations processed at a time
+        :return: pandas DataFrame indexed by observation time
+        """
+        directional = [k for k in ["swdir", "swr1"] if k in self.data.keys()]
+        spectra = {k: self.spectral(k) for k in ["swden"] + directional}
+        return wave_parameters(
+            spectra["swden"],
+            alpha1=spectra.get("swdir"),
+            r1=spectra.get("swr1"),
+            chunk_size=chunk_size,
         )
 
     @property
@@ -161,111 +406,37 @@ class DataBuoy(object):
         return self.__get_dataframe(pkg)
 
     # DEFINING DATA FETCHING & PARSING FUNCTIONS
-    @staticmethod
-    def __check_urls__(urls):
-        """
-        Simple method to check list of urls, check if they return a 200 status
-        code with a HEAD request, and return the first valid URL (if any).
-        :param urls: The list of urls to check
-        :return: The valid URL or False if none
-        """
-        url_check = [requests.head(url).status_code == 200 for url in urls]
-        return urls[url_check.index(True)] if any(url_check) else False
-
     @staticmethod
     def __build_urls__(urls, format_kwargs):
         return [url.format(**format_kwargs) for url in urls]
 
     @staticmethod
-    def __bad_data_func(x, n):
-        """
-        Check an individual value from NDBC data files to see if it meets the
-        standard for NDBC bad data flag.
-        :param x: The value being checked
-        :param n: the max length of the values for a given metric.
-        :return: Value if valid, None if not.
-        """
-        val = (
-            np.NaN
-            if all([d == "9" for d in str(int(x))]) and len(str(int(x))) == n
-            else x
-        )
-        return val
-
-    def __bad_data_check(self, df, datetime_index):
+    def __bad_data_check(df, datetime_index):
         """Replace NDBC bad data flag with NumPy NaN"""
-        cols = df.columns.to_list()
-        if not datetime_index:
-            cols.remove("datetime")
-        for col in cols:
-            n = len(str(int(df[col].max())))
-            df[col] = df[col].apply(self.__bad_data_func, n=n)
-        return df
-
-    def __parse_metadata(self, element, station_metadata=None):
-        """
-        Parse out station meta data from the element containing it
-        :param element: BeautifulSoup element containing station metadata
-        :return: None: Meta data appended to DataBuoy object
-        """
-        if station_metadata is None:
-            station_metadata = {}
-        # There's probably a more elegant way to do this but trying to
-        # optimize code before you write it is a fool's errand.
-        for line in str(element).split("\n"):
-            if re.search(self.LAT_PAT, line):
-                station_metadata["lat"] = re.search(self.LAT_PAT, line).group()
-            if re.search(self.LON_PAT, line):
-                station_metadata["lon"] = re.search(self.LON_PAT, line).group()
-            if re.search(self.ATTR_PAT, line):
-                k, v = re.search(self.ATTR_PAT, line).groups()
-                station_metadata[k] = v
-        self.station_info = station_metadata
-
-    def get_station_metadata(self) -> None:
+        return mask_sentinels(df)
+
+    def get_station_metadata(self, service=None) -> None:
         """
         Define method to capture and store station metadata
+        :param service: Optional NDBC.metadata.StationMetadata used to fetch
+        the metadata, e.g. through its cache
         :return: None
         """
         if not hasattr(self, "station_id"):
             raise LookupError("No station ID provided")
-        response = requests.get(self.STATION_URL.format(self.station_id))
-        soup = BeautifulSoup(response.content, "html.parser")
-        meta_div = soup.find("div", id="stn_metadata")
-        if meta_div:
-            for el in meta_div.find_all("p"):
-                # Iterate over <p> tags.  One of these will have the station
-                # details we are looking for.
-                if (
-                    re.search(self.LAT_PAT, str(el))
-                    and re.search(self.LON_PAT, str(el))
-                    and re.search(self.ATTR_PAT, str(el))
-                ):
-                    self.__parse_metadata(el)
-        else:
-            raise ValueError("Station metadata not found")
-
-    def __separate_units(self, data: pd.DataFrame) -> pd.DataFrame:
-        """
-        If data DataFrame contains a row that corresponds to the units for
-        the columns provided, separate them out and place them in stdmet
-        metadata.
-        :param data: pandas DataFrame result of reading in NDBC text file.
-        :return: data DataFrame with units row removed, if present
-        """
-        # Check to see if the first row is the units - true after 2009 for stdmet.
-        unit_dict = False
-        if isinstance(data.loc[0][0], str) and data.loc[0][0][0] == "#":
-            units = data.loc[0]
-            columns = data.columns
-            data = data.drop([0])
-            unit_dict = {k: units[i] for i, k in enumerate(columns)}
-            # if "meta" not in self.data["stdmet"].keys():
-            #     self.data["stdmet"]["meta"] = {}
-            # self.data["stdmet"]["meta"]["units"] = {
-            #     k: units[i] for i, k in enumerate(columns)
-            # }
-        return data, unit_dict
+        if service is not None:
+            self.station_info = service.get(self.station_id)
+            return
+        response = get_session().get(self.STATION_URL.format(self.station_id))
+        self._parse_station_page(response.content)
+
+    def _parse_station_page(self, content) -> None:
+        """
+        Store the station metadata found in the HTML of a station page
+        :param content: HTML of the station page
+        :return: None
+        """
+        self.station_info = parse_station_page(content)
 
     def __assign_units(self, units, data_type):
         if "meta" not in self.data[data_type].keys():
@@ -275,61 +446,39 @@ class DataBuoy(object):
     @staticmethod
     def __get_dt_parts(df: pd.DataFrame) -> dict:
         """
-        Determine the date part columns and format string from df
+        Determine the date part columns and their datetime components from df
         :param df: pandas DataFrame of stdmet data
-        :return: dicitonary containing format string and list of columns
+        :return: dicitonary containing list of columns and component mapping
         """
-        # Define columns and datetime string formats
+        # Define columns and the datetime components they represent
         col_types = {
-            "YYYY": "%Y",
-            "YY": "%Y",
-            "MM": "%m",
-            "DD": "%d",
-            "hh": "%H",
-            "mm": "%M",
+            "YYYY": "year",
+            "YY": "year",
+            "MM": "month",
+            "DD": "day",
+            "hh": "hour",
+            "mm": "minute",
         }
         # Identifying the date part columns in the current dataframe
         dt_cols = [c for c in df.columns if c in col_types.keys()]
-        # Building the formatting string used to construct datetime objects
-        dt_format = " ".join([col_types[c] for c in dt_cols])
-        return {"columns": dt_cols, "format_string": dt_format}
-
-    @staticmethod
-    def __set_dtypes(df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Assign data types for better comparison performance
-        :param df: DataFrame of data after removing units row (if exists)
-        :return: DataFrame object
-        """
-        # Defining those columns most often storing integer values for
-        # stdmet data.  This may apply to other data packages as well
-        int_cols = ["YY", "MM", "DD", "hh", "mm", "WDIR"]
-        # Remaining columns will be treated as floating point numbers
-        for col in df.columns.to_list():
-            dtype = "int32" if col in int_cols else "float64"
-            df[col] = df[col].astype(dtype)
-        return df
+        # Mapping components to columns for pandas.to_datetime
+        components = {col_types[c]: c for c in dt_cols}
+        return {"columns": dt_cols, "components": components}
 
     @classmethod
-    def __build_datetime(cls, data: pd.DataFrame) -> list:
+    def __build_datetime(cls, data: pd.DataFrame) -> pd.DatetimeIndex:
         """
-        Return datetime series constructed from extracted date parts
+        Return datetimes constructed from extracted date parts
         :param data:Standard meteorological data
-        :return: list of Python datetime instances.
+        :return: DatetimeIndex with one entry per row in data
         """
         dtdict = cls.__get_dt_parts(data)
+        parts = {k: data[c].to_numpy() for k, c in dtdict["components"].items()}
         # Addressing issues with 2 digit years (pre 1996 data)
-        year_column = dtdict["columns"][0]
-        if data[year_column].iloc[0] < 100:
-            data[year_column] = data[year_column] + 1900
-        # Return a list of datetime objects for each row in dataframe
-        return [
-            dt.strptime(
-                " ".join([str(getattr(r, v)) for v in dtdict["columns"]]),
-                dtdict["format_string"],
-            )
-            for r in data.itertuples()
-        ]
+        parts["year"] = np.where(
+            parts["year"] < 100, parts["year"] + 1900, parts["year"]
+        )
+        return pd.DatetimeIndex(pd.to_datetime(parts))
 
     @classmethod
     def __add_datetime(cls, data: pd.DataFrame, datetime_index) -> pd.DataFrame:
@@ -340,17 +489,85 @@ class DataBuoy(object):
         or dataframe index
         :return: dataframe with datetime appended and date part columns dopped
         """
-        # Getting the list of dates to add
-        dt_list = cls.__build_datetime(data)
+        # Getting the dates to add
+        dt_index = cls.__build_datetime(data)
         # Get list of columns to drop
         dt_cols = cls.__get_dt_parts(data)["columns"]
         if datetime_index:
-            data.index = dt_list
+            data.index = dt_index
         else:
-            data["datetime"] = dt_list
+            data["datetime"] = dt_index
 
         return data.drop(columns=dt_cols)
 
+    @classmethod
+    def _parse_text(
+        cls,
+        text,
+        datetime_index=False,
+        data_type="stdmet",
+        compact=False,
+        columns=None,
+        realtime=False,
+    ):
+        """
+        Parse the contents of a single NDBC text file through the cleaning pipeline.
+        This does not depend on instance state, so it can be run in worker processes.
+        :param text: Text content of the file
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param data_type: Type of data package being parsed
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to read and clean, defaults to all columns
+        :param realtime: The text is from a realtime file, whose missing values
+        are mostly "MM", so bad data flags are looked up per column rather than
+        inferred from the column maximum (see NDBC.missing)
+        :return: Tuple of the parsed DataFrame and units dictionary (or False)
+        """
+        dtypes = partial(parse_dtypes, data_type) if compact else None
+        data_df, units = parse_ndbc_text(text, dtypes=dtypes, columns=columns)
+        data_df = cls.__add_datetime(data_df, datetime_index)
+        if realtime:
+            data_df = mask_sentinels(
+                data_df, sentinels=fixed_sentinels(data_df, data_type)
+            )
+        else:
+            data_df = cls.__bad_data_check(data_df, datetime_index)
+        if compact:
+            data_df = compact_frame(data_df, data_type)
+        return data_df, units
+
+    def __store_data(self, results, data_type="stdmet", defer_merge=False):
+        """
+        Add parsed periods to the data package, merging them with any existing
+        data in a single pass (see NDBC.frames.merge_frames)
+        :param results: List of (DataFrame, units) tuples in chronological order
+        :param data_type: Type of data package being stored
+        :param defer_merge: Hold the periods as unmerged chunks until first access
+        :return: None
+        """
+        if not results:
+            return
+        if data_type not in self.data.keys():
+            self.data[data_type] = {}
+        units = [u for _, u in results if u]
+        if units:
+            self.__assign_units(units[-1], data_type)
+        frames = [df for df, _ in results]
+        if data_type in self.rollups:
+            for data_df in frames:
+                self.rollups[data_type].update(data_df)
+        existing = self.data[data_type].get("data")
+        if isinstance(existing, ChunkedFrame):
+            existing.extend(frames)
+            if not defer_merge:
+                self.__get_dataframe(data_type)
+            return
+        if existing is not None:
+            frames.insert(0, self.__get_dataframe(data_type))
+        self.data[data_type]["data"] = (
+            ChunkedFrame(frames) if defer_merge else merge_frames(frames)
+        )
+
     def __load_data(self, url, datetime_index=False, data_type="stdmet"):
         """
         Load retrieved data as part of object
@@ -359,56 +576,295 @@ class DataBuoy(object):
         :param data_type: Type of data package to retrieve
         :return: None
         """
-        if data_type not in self.data.keys():
-            self.data[data_type] = {}
-        data_df = pd.read_csv(url, sep=r"\s+")
-        rename_cols = {c: c.replace("#", "") for c in data_df.columns if "#" in c}
-        data_df.rename(columns=rename_cols, inplace=True)
-        data_df, units = self.__separate_units(data_df)
-        if units:
-            self.__assign_units(units, data_type)
-        data_df = self.__set_dtypes(data_df)
-        data_df = self.__add_datetime(data_df, datetime_index)
-        data_df = self.__bad_data_check(data_df, datetime_index)
-        if "data" in self.data[data_type].keys():
-            self.data[data_type]["data"] = pd.concat(
-                objs=[self.data[data_type]["data"], data_df]
+        self.__store_data([self._parse_text(read_text(url), datetime_index)], data_type)
+
+    def _year_period(self, data_type, year) -> dict:
+        """
+        Describe the historical file holding a year of data
+        :param data_type: Type of data package
+        :param year: Calendar year
+        :return: dictionary with sort key, candidate URLs and unavailable message
+        """
+        kws = {
+            "year": year,
+            "station": self.station_id,
+            "dtype": data_type,
+            "url_char": self.DATA_PACKAGES[data_type]["url_char"],
+        }
+        return {
+            "period": (year, 0),
+            "urls": self.__build_urls__(self.data_yearurls, kws),
+            "unavailable": "Year " + str(year) + " not available.\n",
+            "data_type": data_type,
+            "key": f"{self.station_id}/{data_type}/{year}",
+            # Historical files are not changed once published
+            "immutable": True,
+        }
+
+    def _month_period(self, data_type, year, month) -> dict:
+        """
+        Describe the monthly file holding a month of data
+        :param data_type: Type of data package
+        :param year: Calendar year the month falls in
+        :param month: Month number (1-12)
+        :return: dictionary with sort key, candidate URLs and unavailable message
+        """
+        month_abbrv = dt(year, month, 1).strftime("%b")
+        # When using the 2nd of the stdmet_monthurl patterns, two digit
+        # month numbers are converted into the letters a, b, and c.
+        kws = {
+            "year": year,
+            "month_abbrv": month_abbrv,
+            "month_num": month if month < 10 else chr(97 + (month - 10)),
+            "station": self.station_id,
+            "dtype": data_type,
+        }
+        return {
+            "period": (year, month),
+            "urls": self.__build_urls__(self.data_monthurls, kws),
+            "unavailable": month_abbrv + " not available.\n",
+            "data_type": data_type,
+            "key": f"{self.station_id}/{data_type}/{year}-{month:02d}",
+            "immutable": False,
+        }
+
+    def __fetch_text(self, period):
+        """
+        Download the file for a single period, through the cache if one is set
+        :param period: Period description from _year_period or _month_period
+        :return: Tuple of the URL and text of the file, or (False, None)
+        """
+        if self.cache is not None:
+            return self.cache.fetch(
+                period["key"],
+                period["urls"],
+                immutable=period["immutable"],
+                session=self.session,
             )
-        else:
-            self.data[data_type]["data"] = data_df
+        return fetch_first(period["urls"], session=self.session)
+
+    def _fetch_period(
+        self, period, datetime_index=False, compact=False, columns=None, parser=None
+    ):
+        """
+        Download and parse the file for a single period
+        :param period: Period description from _year_period or _month_period
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to return, defaults to all columns
+        :param parser: Callable used in place of _parse_text, such as an
+        NDBC.parallel.ProcessParser
+        :return: Tuple of DataFrame and units, or None if no file is available
+        """
+        result = self._cached_period(period, datetime_index, compact, columns)
+        if result is not None:
+            return result
+        my_url, text = self.__fetch_text(period)
+        return (
+            self._parse_period(period, text, datetime_index, compact, columns, parser)
+            if my_url
+            else None
+        )
+
+    @staticmethod
+    def __frame_cache_key(period, compact):
+        # Compact frames are cached separately from those with default types
+        return period["key"] + (".compact" if compact else "")
+
+    @staticmethod
+    def __cached_result(result, datetime_index, columns=None):
+        data_df, units = result
+        data_df = project(data_df, columns)
+        if datetime_index:
+            data_df = data_df.set_index("datetime")
+            data_df.index.name = None
+        return data_df, units
+
+    def _cached_period(self, period, datetime_index=False, compact=False, columns=None):
+        """
+        Return a period from the frame cache without downloading it.  Only
+        historical files, which never change, are reused without a download.
+        :param period: Period description from _year_period or _month_period
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to return, defaults to all columns
+        :return: Tuple of DataFrame and units, or None if not cached
+        """
+        if self.frame_cache is None or not period["immutable"]:
+            return None
+        result = self.frame_cache.get(self.__frame_cache_key(period, compact))
+        if result is None:
+            return None
+        return self.__cached_result(result, datetime_index, columns)
+
+    def _parse_period(
+        self,
+        period,
+        text,
+        datetime_index=False,
+        compact=False,
+        columns=None,
+        parser=None,
+    ):
+        """
+        Parse the downloaded file for a period, through the frame cache if one
+        is set.  Cached frames are only reused if parsed from the same file.
+        Only the requested columns are parsed unless the frame cache is set,
+        which always stores every column.
+        :param period: Period description from _year_period or _month_period
+        :param text: Text content of the file
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to return, defaults to all columns
+        :param parser: Callable used in place of _parse_text
+        :return: Tuple of DataFrame and units
+        """
+        parse = parser if parser is not None else self._parse_text
+        parse_kws = {"data_type": period["data_type"], "compact": compact}
+        if self.frame_cache is None:
+            return parse(text, datetime_index, columns=columns, **parse_kws)
+        key = self.__frame_cache_key(period, compact)
+        digest = text_digest(text)
+        result = self.frame_cache.get(key, digest=digest)
+        if result is None:
+            result = parse(text, datetime_index=False, **parse_kws)
+            self.frame_cache.put(key, *result, digest=digest)
+        return self.__cached_result(result, datetime_index, columns)
+
+    def _periods(self, data_type, years=[], months=[]) -> list:
+        """
+        Describe the files holding the requested years and months
+        :param data_type: Type of data package
+        :param years: List of years
+        :param months: List of months, taken from the last 12 months
+        :return: List of period descriptions, years first
+        """
+        periods = [self._year_period(data_type, year) for year in years]
+        for month in months:
+            # Adjusting for month wrapping cases (e.g. wanting December monthly data in January).
+            year = dt.today().year if month <= dt.today().month else dt.today().year - 1
+            periods.append(self._month_period(data_type, year, month))
+        return periods
+
+    def _window_periods(self, data_type, start, end=None) -> list:
+        """
+        Describe the files holding the data between two times.  Past years are
+        read from the historical files and the current year from monthly files.
+        The current month is not published as a monthly file yet, its data is
+        left to `realtime` and `sync`.
+        :param data_type: Type of data package
+        :param start: Earliest timestamp wanted
+        :param end: Latest timestamp wanted, defaults to now
+        :return: List of period descriptions, years first
+        """
+        if start is None:
+            raise ValueError("A start time is required for time range queries")
+        today = dt.today()
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp(today)
+        if end < start:
+            raise ValueError("The end time must not be before the start time")
+        periods = [
+            self._year_period(data_type, year)
+            for year in range(start.year, min(end.year, today.year - 1) + 1)
+        ]
+        if end.year >= today.year:
+            first = start.month if start.year == today.year else 1
+            # The last published monthly file is the previous month's
+            last = (
+                min(end.month, today.month - 1)
+                if end.year == today.year
+                else today.month - 1
+            )
+            periods += [
+                self._month_period(data_type, today.year, month)
+                for month in range(first, last + 1)
+            ]
+        return periods
+
+    @staticmethod
+    def _window(result, start, end):
+        """Limit a parsed period to a time range"""
+        if result is None:
+            return None
+        data_df, units = result
+        data_df = time_slice(data_df, start, end)
+        if not isinstance(data_df.index, pd.DatetimeIndex):
+            data_df = data_df.reset_index(drop=True)
+        return data_df, units
+
+    def _store_periods(self, periods, results, data_type, defer_merge=False) -> str:
+        """
+        Store fetched periods in chronological order with a single merge
+        :param periods: List of period descriptions
+        :param results: Result of _fetch_period for each period, None if unavailable
+        :param data_type: Type of data package
+        :param defer_merge: Hold the periods as unmerged chunks until first access
+        :return: Messages for the unavailable periods, in request order
+        """
+        unavailable = "".join(
+            p["unavailable"] for p, r in zip(periods, results) if r is None
+        )
+        ordered = sorted(zip(periods, results), key=lambda pr: pr[0]["period"])
+        self.__store_data(
+            [r for _, r in ordered if r is not None],
+            data_type=data_type,
+            defer_merge=defer_merge,
+        )
+        return unavailable
+
+    def __fetch_periods(
+        self,
+        periods,
+        datetime_index=False,
+        max_workers=1,
+        compact=False,
+        columns=None,
+        parser=None,
+    ):
+        """
+        Fetch and parse periods, concurrently when more than one worker is allowed
+        :param periods: List of period descriptions
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param max_workers: Maximum number of periods downloaded at once
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to return, defaults to all columns
+        :param parser: NDBC.parallel.ProcessParser parsing files in worker processes
+        :return: List of results matching the order of periods
+        """
+        fetch = partial(
+            self._fetch_period,
+            datetime_index=datetime_index,
+            compact=compact,
+            columns=columns,
+            parser=parser,
+        )
+        if parser is not None:
+            # Each thread waits on the file it handed to a worker process,
+            # so one thread per process keeps every process busy
+            max_workers = max(max_workers, parser.max_workers)
+        if max_workers > 1 and len(periods) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                return list(pool.map(fetch, periods))
+        return [fetch(p) for p in periods]
 
     def load_stdmet(self, url, datetime_index=False) -> None:
         """
         Transform NDBC Standard Meteorological text data into pandas Dataframe
         and append to results
-        :param url: Location of text data
+        :param url: Location of text data, or a file-like object holding it
         :return: None
         """
-        if "stdmet" not in self.data.keys():
-            self.data["stdmet"] = {}
-        data_df = pd.read_csv(url, sep=r"\s+")
-        # The first column name often contains a # symbol.
-        rename_cols = {c: c.replace("#", "") for c in data_df.columns if "#" in c}
+        # Parse text, separating the units line (if exists) from the data
+        data_df, units = read_ndbc_text(url)
         # Applying a basic fix for change in WDIR naming in earlier (<2000) data
-        rename_cols["WD"] = "WDIR"
-
-        data_df.rename(columns=rename_cols, inplace=True)
-        # Remove units row (if exists) and add to stdmet metadata
-        data_df, units = self.__separate_units(data_df)
-        if units:
-            self.__assign_units(units, data_type="stdmet")
-        # Explicitly setting dtypes
-        data_df = self.__set_dtypes(data_df)
+        data_df.rename(columns={"WD": "WDIR"}, inplace=True)
         # Building and appending datetimes from date parts
         data_df = self.__add_datetime(data_df, datetime_index)
         # Replacing NDBC bad data flags with Numpy NaNs
         data_df = self.__bad_data_check(data_df, datetime_index)
-        # Append to existing stdmet dataframe if exists
-        if "data" in self.data["stdmet"].keys():
-            self.data["stdmet"]["data"] = self.data["stdmet"]["data"].append(data_df)
-        # otherwise assign dataframe to stdment['data']
-        else:
-            self.data["stdmet"]["data"] = data_df
+        # Merge with any existing stdmet data
+        self.__store_data([(data_df, units)], data_type="stdmet")
 
     @deprecated(
         deprecated_in="1.0.2",
@@ -440,8 +896,9 @@ class DataBuoy(object):
                         "year": year_num,
                         "dtype": "stdmet",
                     }
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_monthurls, kws)
+                    my_url, text = fetch_first(
+                        self.__build_urls__(self.data_monthurls, kws),
+                        session=self.session,
                     )
                     if not my_url:
                         times_unavailable += (
@@ -459,15 +916,21 @@ class DataBuoy(object):
                             Please review station {self.station_id} and data package {data_type}
                             """
                 if my_url:
-                    self.load_stdmet(my_url, datetime_index)
+                    self.load_stdmet(io.StringIO(text), datetime_index)
             else:
                 for year in years:
-                    kws = {"year": year, "station": self.station_id, "dtype": "stdmet"}
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_yearurls, kws)
+                    kws = {
+                        "year": year,
+                        "station": self.station_id,
+                        "dtype": "stdmet",
+                        "url_char": self.DATA_PACKAGES["stdmet"]["url_char"],
+                    }
+                    my_url, text = fetch_first(
+                        self.__build_urls__(self.data_yearurls, kws),
+                        session=self.session,
                     )
                     if my_url:
-                        self.load_stdmet(my_url, datetime_index)
+                        self.load_stdmet(io.StringIO(text), datetime_index)
                     else:
                         times_unavailable += "Year " + str(year) + " not available.\n"
 
@@ -488,11 +951,12 @@ class DataBuoy(object):
                         "station": self.station_id,
                         "dtype": "stdmet",
                     }
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_monthurls, kws)
+                    my_url, text = fetch_first(
+                        self.__build_urls__(self.data_monthurls, kws),
+                        session=self.session,
                     )
                     if my_url:
-                        self.load_stdmet(my_url, datetime_index)
+                        self.load_stdmet(io.StringIO(text), datetime_index)
                     else:
                         times_unavailable += month_abbrv + " not available.\n"
 
@@ -502,13 +966,41 @@ class DataBuoy(object):
         except requests.exceptions.SSLError as e:
             logger.error(f"NDBC Server unavailable: {e}")
 
-    def get_data(self, years=[], months=[], datetime_index=False, data_type="stdmet"):
+    def get_data(
+        self,
+        years=[],
+        months=[],
+        datetime_index=False,
+        data_type="stdmet",
+        max_workers=None,
+        defer_merge=False,
+        compact=False,
+        start=None,
+        end=None,
+        columns=None,
+        parse_workers=None,
+    ):
         """
         Fetch data paylod for a given NDBC data station.
         :param years: List of years
         :param months: List of months
         :param datetime_index: Whether to use datetime as DataFrame index or column
         :param data_type: Data payload type
+        :param max_workers: Number of periods to download and parse concurrently.
+        Defaults to 1, or WINDOW_WORKERS for time range queries.
+        :param defer_merge: Keep each period as a separate chunk, merging them
+        when the data package is first accessed
+        :param compact: Store measured values as float32 and whole number
+        columns as nullable small integers, see NDBC.schema
+        :param start: Earliest timestamp to fetch, instead of years and months.
+        The files covering start to end are found automatically, up to the
+        last published month.  Use realtime or sync for the current month.
+        :param end: Latest timestamp to fetch, defaults to now when start is given
+        :param columns: Columns to fetch, only these are parsed and cleaned.
+        Defaults to all columns.
+        :param parse_workers: Number of processes parsing files, a
+        concurrent.futures process pool or an NDBC.parallel.ProcessParser to
+        use, see NDBC.parallel.  Defaults to parsing in the downloading threads.
         :return: None, data stored as part of Class object
         """
         if data_type not in self.DATA_PACKAGES.keys():
@@ -522,28 +1014,25 @@ class DataBuoy(object):
                 {pkgs}
             """
             )
+        window = start is not None or end is not None
+        if window and (years or months):
+            raise ValueError("Use either years and months or a start and end time")
         times_unavailable = ""
         # If no time frame is specified we retrieve the most current complete
         # month for the given station.
         try:
-            if not years and not months:
+            if not years and not months and not window:
                 month_num = dt.today().month
                 year_num = dt.today().year
-                my_url = False
+                result = None
                 # Looping through potentially available months.
-                while not my_url:
-                    month_abbrv = dt(year_num, month_num, 1).strftime("%b")
-                    kws = {
-                        "month_abbrv": month_abbrv,
-                        "month_num": month_num,
-                        "station": self.station_id,
-                        "year": year_num,
-                        "dtype": data_type,
-                    }
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_monthurls, kws)
+                while result is None:
+                    period = self._month_period(data_type, year_num, month_num)
+                    result = self._fetch_period(
+                        period, datetime_index, compact, columns
                     )
-                    if not my_url:
+                    if result is None:
+                        month_abbrv = dt(year_num, month_num, 1).strftime("%b")
                         times_unavailable += (
                             f"{month_abbrv} {year_num} not " f"available.\n "
                         )
@@ -558,54 +1047,35 @@ class DataBuoy(object):
                             Recent data could not be accessed for over 1 year.
                             Please review station {self.station_id} and data package {data_type}
                             """
-                if my_url:
-                    self.__load_data(
-                        my_url, datetime_index=datetime_index, data_type=data_type
-                    )
+                self.__store_data(
+                    [result], data_type=data_type, defer_merge=defer_merge
+                )
             else:
-                for year in years:
-                    kws = {
-                        "year": year,
-                        "station": self.station_id,
-                        "dtype": data_type,
-                        "url_char": self.DATA_PACKAGES[data_type]["url_char"],
-                    }
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_yearurls, kws)
-                    )
-                    if my_url:
-                        self.__load_data(
-                            my_url, datetime_index=datetime_index, data_type=data_type
-                        )
+                periods = (
+                    self._window_periods(data_type, start, end)
+                    if window
+                    else self._periods(data_type, years, months)
+                )
+                with ExitStack() as stack:
+                    if isinstance(parse_workers, ProcessParser):
+                        parser = parse_workers
+                    elif parse_workers:
+                        parser = stack.enter_context(ProcessParser(parse_workers))
                     else:
-                        times_unavailable += "Year " + str(year) + " not available.\n"
-
-                for month in months:
-                    month_abbrv = dt(dt.today().year, month, 1).strftime("%b")
-                    # Adjusting for month wrapping cases (e.g. wanting December monthly data in January).
-                    year = (
-                        dt.today().year
-                        if month <= dt.today().month
-                        else dt.today().year - 1
-                    )
-                    # When using the 2nd of the stdmet_monthurl patterns, two digit
-                    # month numbers are converted into the letters a, b, and c.
-                    kws = {
-                        "year": year,
-                        "month_abbrv": month_abbrv,
-                        "month_num": month if month < 10 else chr(97 + (month - 10)),
-                        "station": self.station_id,
-                        "dtype": data_type,
-                    }
-                    my_url = self.__check_urls__(
-                        self.__build_urls__(self.data_monthurls, kws)
+                        parser = None
+                    results = self.__fetch_periods(
+                        periods,
+                        datetime_index,
+                        max_workers or (WINDOW_WORKERS if window else 1),
+                        compact,
+                        columns,
+                        parser,
                     )
-                    if my_url:
-                        self.__load_data(
-                            my_url, datetime_index=datetime_index, data_type=data_type
-                        )
-                    else:
-                        times_unavailable += month_abbrv + " not available.\n"
+                if window:
+                    results = [self._window(r, start, end) for r in results]
+                times_unavailable += self._store_periods(
+                    periods, results, data_type, defer_merge
+                )
 
             if len(times_unavailable) > 0:
                 station_data_url = f"https://www.ndbc.noaa.gov/station_history.php?station={self.station_id}"
@@ -617,6 +1087,132 @@ class DataBuoy(object):
         except requests.exceptions.SSLError as e:
             logger.error(f"NDBC Server unavailable: {e}")
 
+    def iter_data(
+        self,
+        years=[],
+        months=[],
+        datetime_index=False,
+        data_type="stdmet",
+        compact=False,
+        prefetch=1,
+        sink=None,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Fetch data one period at a time without storing it on the object, so
+        histories of any length are processed in bounded memory.  Periods are
+        parsed as in get_data and yielded in chronological order.
+        :param years: List of years
+        :param months: List of months
+        :param datetime_index: Whether to use datetime as DataFrame index or column
+        :param data_type: Data payload type
+        :param compact: Use the compact data types of NDBC.schema
+        :param prefetch: Number of periods downloaded and parsed in the
+        background while the current one is processed, 0 to fetch on demand
+        :param sink: Optional callable, called as sink(key, dataframe) with each
+        period before it is yielded, e.g. NDBC.repository.storage.ChunkSink
+        :return: Iterator of (period key, DataFrame) tuples
+        """
+        if data_type not in self.DATA_PACKAGES.keys():
+            raise ValueError(
+                f"Data type {data_type} not understood.  Please use one of the "
+                f'following: {", ".join(self.DATA_PACKAGES.keys())}'
+            )
+        periods = sorted(
+            self._periods(data_type, years, months), key=lambda p: p["period"]
+        )
+        fetch = partial(
+            self._fetch_period, datetime_index=datetime_index, compact=compact
+        )
+        remaining = deque(periods)
+        with ThreadPoolExecutor(max_workers=max(prefetch, 1)) as pool:
+            ahead = deque()
+            while remaining or ahead:
+                # Keep up to `prefetch` periods in flight beyond the current one
+                while remaining and len(ahead) <= prefetch:
+                    period = remaining.popleft()
+                    ahead.append((period, pool.submit(fetch, period)))
+                period, future = ahead.popleft()
+                result = future.result()
+                if result is None:
+                    logger.warning(period["unavailable"])
+                    continue
+                if sink is not None:
+                    sink(period["key"], result[0])
+                yield period["key"], result[0]
+
+    def last_time(self, data_type="stdmet"):
+        """
+        Return the latest timestamp held for a data package.  Packages not yet
+        read from a lazily loaded archive only read their timestamps from disk.
+        :param data_type: Data package
+        :return: pandas Timestamp, or None if the package holds no data
+        """
+        if data_type not in self.data.keys():
+            return None
+        data_df = self.data[data_type]["data"]
+        if isinstance(data_df, LazyFrame):
+            data_df = data_df.load(columns=[])
+        elif isinstance(data_df, ChunkedFrame):
+            data_df = self.__get_dataframe(data_type)
+        times = frame_times(data_df)
+        return times.max() if times is not None and len(times) else None
+
+    def __fetch_realtime(self, data_type, since, datetime_index, compact):
+        """
+        Download and parse the rows of a realtime file recorded after a timestamp
+        :return: Tuple of DataFrame and units, None if the file is not available
+        or has no new rows
+        """
+        url = realtime_url(self.station_id, data_type, self.data_realtimeurl)
+        lines = fetch_since(url, since, session=self.session)
+        if lines is None:
+            logger.warning(f"Realtime {data_type} data not available.\n {url}")
+            return None
+        text = to_ndbc_text(lines, data_type, since)
+        if not text:
+            return None
+        return self._parse_text(text, datetime_index, data_type, compact, realtime=True)
+
+    def realtime(
+        self, data_type="stdmet", since=None, datetime_index=False, compact=False
+    ):
+        """
+        Fetch the last 45 days of data from a station's realtime file without
+        storing it.  Rows are read newest first and reading stops at `since`,
+        so polling only parses the rows recorded since the last poll.
+        :param data_type: Data package, see NDBC.realtime.REALTIME_EXTENSIONS
+        :param since: Only return rows recorded after this timestamp
+        :param datetime_index: Use datetime as index (True) or column (False)
+        :param compact: Use the compact data types of NDBC.schema
+        :return: pandas DataFrame in time order, empty if there are no new rows
+        """
+        result = self.__fetch_realtime(data_type, since, datetime_index, compact)
+        return merge_frames([result[0]]) if result is not None else pd.DataFrame()
+
+    def sync(self, data_type="stdmet", datetime_index=None, compact=False):
+        """
+        Add the observations recorded since the latest timestamp held for a
+        data package, read from the station's realtime file (the last 45 days).
+        Only the top of the file holding the new rows is downloaded where the
+        server supports HTTP Range requests, and only those rows are parsed.
+        Packages with no data held are filled with the whole realtime file.
+        :param data_type: Data package, see NDBC.realtime.REALTIME_EXTENSIONS
+        :param datetime_index: Use datetime as index (True) or column (False).
+        Defaults to the layout of the data held, or a column if there is none.
+        :param compact: Use the compact data types of NDBC.schema
+        :return: Number of new rows added
+        """
+        since = self.last_time(data_type)
+        if datetime_index is None:
+            datetime_index = data_type in self.data.keys() and isinstance(
+                self.read(data_type, columns=[]).index, pd.DatetimeIndex
+            )
+        result = self.__fetch_realtime(data_type, since, datetime_index, compact)
+        if result is None:
+            return 0
+        self.__store_data([result], data_type)
+        return len(result[0])
+
     # -------------------- STATION SEARCH METHODS ------------------------------
     # https: // www.ndbc.noaa.gov / radial_search.php?lat1 = 36.79 & lon1 = \
     #  -122.4 & uom = M & dist = 50 & ot = B & time = -1
@@ -720,15 +1316,21 @@ class DataBuoy(object):
         Make request using URL provided and parse the response for a list of
         unique station IDs.
         """
-        response = requests.get(url)
+        response = get_session().get(url)
         # Checking the validity of our response
         if response.status_code != 200:
             raise ValueError(
                 f"The url generated \n {url} \n returned a "
                 f"status code of {response.status_code}"
             )
-        # Parsing the HTML returned
-        soup = BeautifulSoup(response.content, "html.parser")
+        return self._parse_station_ids(response.content)
+
+    def _parse_station_ids(self, content):
+        """
+        Return the unique station IDs, other than this station, listed in the
+        HTML returned by a station search.
+        """
+        soup = BeautifulSoup(content, "html.parser")
         # The station IDs returned by this search are all contained within
         # <a> elements that include links to the station pages.  We can use
         # this to find them.
@@ -749,6 +1351,7 @@ class DataBuoy(object):
         time=1,
         obs_type="buoy",
         distance=False,
+        catalog=None,
     ):
         """
         Station search function.  Defaults to radial search.  Uses lat/lon
@@ -759,12 +1362,25 @@ class DataBuoy(object):
         included.  Obs_type determines the type of stations to be included (
         buoy: moored buoy, ship: Ships and drifters, all: All station types).
         Distance determines how wide an area to include (only applies to
-        radial search).
+        radial search).  If a NDBC.catalog.StationCatalog is given the search
+        is answered from the catalog without a request to the NDBC server.
         """
         # CHECKING ARGS BEFORE WE START DOING ANYTHING FANCY
         lat1, lon1 = self._ss_args_check(
             search_type, lat1, lat2, lon1, lon2, uom, time, obs_type, distance
         )
+        if catalog is not None:
+            return catalog.search(
+                search_type,
+                lat1,
+                lat2,
+                lon1,
+                lon2,
+                uom,
+                obs_type,
+                distance,
+                exclude=getattr(self, "station_id", None),
+            )
         # OKAY, LET'S BEGIN
         url = self._ss_build_url(
             search_type, lat1, lat2, lon1, lon2, uom, time, obs_type, distance
@@ -808,18 +1424,39 @@ class DataBuoy(object):
         except:
             return "JSON data export failed"
 
-    def save(self, filename=False, orient="records", date_format="iso"):
+    def save(self, filename=False, orient="records", date_format="iso", backend="json"):
+        """
+        Save station information and data packages to disk
+        :param filename: JSON file (or archive directory for binary backends)
+        :param orient: DataFrame orientation used by the JSON format
+        :param date_format: Format of datetime values used by the JSON format
+        :param backend: "json", or a binary columnar backend from
+        NDBC.repository.storage ("parquet", "feather", "hdf5")
+        :return: None
+        """
+        if backend != "json":
+            from NDBC.repository.orm import BuoyORM
+
+            return BuoyORM(backend).save_to_file(self, filename)
         file_name = filename if filename else f"data_buoy_" f"{self.station_id}.json"
-        # Converting stdmet data attribute to JSON for object serialization
-        for dtype in self.DATA_PACKAGES.keys():
-            if self.data.get(dtype):
-                self.data[dtype]["meta"]["orient"] = orient
-                self.data[dtype]["meta"]["date_format"] = date_format
-                self.data[dtype]["data"] = self.data[dtype]["data"].to_json(
-                    orient=orient, date_format=date_format
-                )
         # converting object attributes to a dictionary
-        obj_vals = self.__dict__
+        obj_vals = {
+            k: v for k, v in self.__dict__.items() if k not in self.RUNTIME_ATTRS
+        }
+        # Converting data package DataFrames to JSON for object serialization,
+        # leaving the DataFrames held by this object untouched
+        obj_vals["data"] = {}
+        for dtype, pkg in self.data.items():
+            if dtype in self.DATA_PACKAGES.keys():
+                meta = {**pkg.get("meta", {}), "orient": orient}
+                meta["date_format"] = date_format
+                obj_vals["data"][dtype] = {
+                    **pkg,
+                    "meta": meta,
+                    "data": self.__get_dataframe(dtype).to_json(
+                        orient=orient, date_format=date_format
+                    ),
+                }
         # Converting our dictionary to a valid JSON string
         obj_str = json.dumps(obj_vals)
         # Writing our data to the filename specified
@@ -827,16 +1464,27 @@ class DataBuoy(object):
             f.write(obj_str)
 
     @classmethod
-    def load(cls, filename):
-        file_str = open(filename, "r").read()
-        obj = json.loads(file_str)
+    def load(cls, filename, lazy=False):
+        """
+        Instantiate a DataBuoy from a file written by save
+        :param filename: JSON file or archive directory
+        :param lazy: For archive directories, only read each data package from
+        disk when it is first accessed
+        :return: DataBuoy instance
+        """
+        if os.path.isdir(filename):
+            from NDBC.repository.orm import BuoyORM
+
+            return BuoyORM().load_from_file(filename, lazy=lazy)
+        with open(filename, "r") as f:
+            obj = json.load(f)
         for dtype in cls.DATA_PACKAGES.keys():
             if obj["data"].get(dtype, False):
                 orient = obj["data"][dtype]["meta"]["orient"]
                 obj["data"][dtype]["data"] = pd.read_json(
-                    obj["data"][dtype]["data"], orient=orient
+                    io.StringIO(obj["data"][dtype]["data"]), orient=orient
                 )
-            inst = cls()
-            for k, v in obj.items():
-                inst.__setattr__(k, v)
+        inst = cls()
+        for k, v in obj.items():
+            inst.__setattr__(k, v)
         return inst
@@ -0,0 +1,305 @@
+"""Asyncio client for NDBC data
+
+`AsyncDataBuoy` wraps a DataBuoy and provides coroutine versions of its network
+methods, built on an aiohttp session with connection pooling, so many stations
+can be fetched concurrently from one event loop without a thread per request.
+Parsing is CPU bound and runs in an executor: the event loop's default thread
+pool unless a `concurrent.futures` thread or process pool is given.
+
+Data is stored in the wrapped DataBuoy, `AsyncDataBuoy.buoy`, exactly as the
+blocking methods store it, so its package properties, `read`, `save` and the
+analysis methods are available once data is loaded.  The aiohttp session is
+kept apart from the `requests` session of the DataBuoy.  `realtime` and `sync`,
+which rely on HTTP Range requests, and downloads through an `HTTPCache`, which
+revalidates with `requests`, run the DataBuoy code in a thread.
+aiohttp is an optional dependency.
+"""
+
+import asyncio
+
+from datetime import datetime as dt
+from functools import partial
+from logging import getLogger
+from typing import List, Optional, Tuple, Union
+
+from NDBC.NDBC import DataBuoy
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+logger = getLogger(__name__)
+
+# Maximum number of simultaneous connections of a session created by the client
+CONNECTION_LIMIT = 100
+
+
+class AsyncDataBuoy:
+    """Coroutine versions of the DataBuoy methods that use the network
+
+    Use as an async context manager, or call `close` when done, to release the
+    session created by the client.  A session passed in is left open.
+
+    Args:
+        station_id (str, optional): Station identifier
+        cache (HTTPCache, optional): Cache of downloaded files
+        frame_cache (FrameCache, optional): Cache of parsed data
+        session (aiohttp.ClientSession, optional): Session to use for requests.
+            Defaults to a new session limited to CONNECTION_LIMIT connections.
+        executor (Executor, optional): Pool used to parse files. Defaults to
+            the event loop's default thread pool.
+        buoy (DataBuoy, optional): DataBuoy to load data into, in place of one
+            built from station_id, cache and frame_cache.
+    """
+
+    def __init__(
+        self,
+        station_id=False,
+        cache=None,
+        frame_cache=None,
+        session=None,
+        executor=None,
+        buoy=None,
+    ) -> None:
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncDataBuoy requires aiohttp, install it with `pip install NDBC[async]`"
+            )
+        self.buoy = (
+            buoy
+            if buoy is not None
+            else DataBuoy(station_id, cache=cache, frame_cache=frame_cache)
+        )
+        self.executor = executor
+        self._session = session
+        self._owns_session = session is None
+
+    def __repr__(self) -> str:
+        return f"AsyncDataBuoy({self.buoy!r})"
+
+    async def __aenter__(self) -> "AsyncDataBuoy":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def __client(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session if it was created by this client"""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def realtime(
+        self, data_type="stdmet", since=None, datetime_index=False, compact=False
+    ):
+        """
+        Fetch the rows of a station's realtime file in a thread, see
+        DataBuoy.realtime
+        :return: pandas DataFrame in time order, empty if there are no new rows
+        """
+        return await self.__run(
+            self.buoy.realtime, data_type, since, datetime_index, compact
+        )
+
+    async def sync(self, data_type="stdmet", datetime_index=None, compact=False):
+        """
+        Add the observations recorded since the latest timestamp held, read in a
+        thread, see DataBuoy.sync
+        :return: Number of new rows added
+        """
+        return await self.__run(self.buoy.sync, data_type, datetime_index, compact)
+
+    async def __get(self, url) -> Tuple[int, bytes]:
+        async with self.__client().get(url) as response:
+            return response.status, await response.read()
+
+    async def __fetch_first(
+        self, urls: List[str]
+    ) -> Tuple[Union[str, bool], Optional[str]]:
+        """Download the first of a list of candidate URLs that exists"""
+        for url in urls:
+            status, body = await self.__get(url)
+            if status == 200:
+                return url, body.decode("utf-8", errors="replace")
+        return False, None
+
+    async def __run(self, func, *args, executor=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(func, *args))
+
+    async def _afetch_period(
+        self, period, datetime_index=False, compact=False, columns=None
+    ):
+        """
+        Download and parse the file for a single period
+        :param period: Period description from _year_period or _month_period
+        :param datetime_index: Use datetime value as index (True) or column (False)
+        :param compact: Use the compact data types of NDBC.schema
+        :param columns: Columns to return, defaults to all columns
+        :return: Tuple of DataFrame and units, or None if no file is available
+        """
+        buoy = self.buoy
+        if buoy.cache is not None:
+            # HTTPCache revalidates with requests, so the whole period is
+            # fetched by the DataBuoy in a thread
+            return await self.__run(
+                buoy._fetch_period, period, datetime_index, compact, columns
+            )
+        if buoy.frame_cache is not None:
+            result = await self.__run(
+                buoy._cached_period, period, datetime_index, compact, columns
+            )
+            if result is not None:
+                return result
+        my_url, text = await self.__fetch_first(period["urls"])
+        if not my_url:
+            return None
+        if buoy.frame_cache is not None:
+            # The frame cache is shared state, so it stays in this process
+            return await self.__run(
+                buoy._parse_period, period, text, datetime_index, compact, columns
+            )
+        return await self.__run(
+            DataBuoy._parse_text,
+            text,
+            datetime_index,
+            period["data_type"],
+            compact,
+            columns,
+            executor=self.executor,
+        )
+
+    async def get_data(
+        self,
+        years=[],
+        months=[],
+        datetime_index=False,
+        data_type="stdmet",
+        max_workers=None,
+        defer_merge=False,
+        compact=False,
+        start=None,
+        end=None,
+        columns=None,
+    ):
+        """
+        Fetch data paylod for a given NDBC data station, see DataBuoy.get_data.
+        Requested periods are downloaded concurrently.  Files are parsed in the
+        executor of the client, so there is no parse_workers option: pass a
+        process pool as executor to parse in other processes.
+        :param years: List of years
+        :param months: List of months
+        :param datetime_index: Whether to use datetime as DataFrame index or column
+        :param data_type: Data payload type
+        :param max_workers: Maximum number of periods downloaded at once.
+        Defaults to all of them.
+        :param defer_merge: Keep each period as a separate chunk until first access
+        :param compact: Use the compact data types of NDBC.schema
+        :param start: Earliest timestamp to fetch, instead of years and months,
+        see DataBuoy.get_data
+        :param end: Latest timestamp to fetch, defaults to now when start is given
+        :param columns: Columns to fetch, defaults to all columns
+        :return: None, data stored in the wrapped DataBuoy
+        """
+        buoy = self.buoy
+        if data_type not in buoy.DATA_PACKAGES.keys():
+            raise ValueError(
+                f"Data type {data_type} not understood.  Please use one of the "
+                f'following: {", ".join(buoy.DATA_PACKAGES.keys())}'
+            )
+        window = start is not None or end is not None
+        if window and (years or months):
+            raise ValueError("Use either years and months or a start and end time")
+        times_unavailable = ""
+        if not years and not months and not window:
+            # Most recent available month within the last year
+            month_num, year_num = dt.today().month, dt.today().year
+            result = None
+            while result is None:
+                period = buoy._month_period(data_type, year_num, month_num)
+                result = await self._afetch_period(
+                    period, datetime_index, compact, columns
+                )
+                if result is None:
+                    month_abbrv = dt(year_num, month_num, 1).strftime("%b")
+                    times_unavailable += f"{month_abbrv} {year_num} not available.\n "
+                month_num -= 1
+                if month_num == 0:
+                    year_num, month_num = year_num - 1, 12
+                    if year_num < dt.today().year - 1:
+                        return (
+                            f"Recent data could not be accessed for over 1 year.  "
+                            f"Please review station {buoy.station_id} and data "
+                            f"package {data_type}"
+                        )
+            buoy._store_periods([period], [result], data_type, defer_merge)
+        else:
+            periods = (
+                buoy._window_periods(data_type, start, end)
+                if window
+                else buoy._periods(data_type, years, months)
+            )
+            limit = asyncio.Semaphore(max_workers or max(len(periods), 1))
+
+            async def fetch(period):
+                async with limit:
+                    return await self._afetch_period(
+                        period, datetime_index, compact, columns
+                    )
+
+            results = await asyncio.gather(*[fetch(p) for p in periods])
+            if window:
+                results = [buoy._window(r, start, end) for r in results]
+            times_unavailable += buoy._store_periods(
+                periods, results, data_type, defer_merge
+            )
+        if times_unavailable:
+            logger.warning(times_unavailable)
+
+    async def get_station_metadata(self) -> None:
+        """
+        Capture and store station metadata, see DataBuoy.get_station_metadata
+        :return: None
+        """
+        if not hasattr(self.buoy, "station_id"):
+            raise LookupError("No station ID provided")
+        _, content = await self.__get(
+            self.buoy.STATION_URL.format(self.buoy.station_id)
+        )
+        await self.__run(self.buoy._parse_station_page, content)
+
+    async def station_search(
+        self,
+        search_type="radial",
+        lat1=False,
+        lat2=False,
+        lon1=False,
+        lon2=False,
+        uom="metric",
+        time=1,
+        obs_type="buoy",
+        distance=False,
+    ):
+        """
+        Station search, see DataBuoy.station_search
+        :return: Set of station IDs
+        """
+        lat1, lon1 = self.buoy._ss_args_check(
+            search_type, lat1, lat2, lon1, lon2, uom, time, obs_type, distance
+        )
+        url = self.buoy._ss_build_url(
+            search_type, lat1, lat2, lon1, lon2, uom, time, obs_type, distance
+        )
+        status, content = await self.__get(url)
+        if status != 200:
+            raise ValueError(
+                f"The url generated \n {url} \n returned a " f"status code of {status}"
+            )
+        return await self.__run(self.buoy._parse_station_ids, content)
@@ -0,0 +1,247 @@
+"""Joining data packages on a shared time axis
+
+Each data package is recorded on its own timestamps, e.g. stdmet hourly or
+every 10 minutes, cwind every 10 minutes and the spectral packages hourly.
+`align_frames` places any number of packages on one sorted DatetimeIndex in a
+single pass: the shared index is built once, each package is matched against
+it with one binary search (`numpy.searchsorted`), and the values of each
+package are gathered straight into the output with `take`.  No intermediate frame is built per pair
+of packages, as chained `merge_asof` calls would.
+
+The columns of the result are labelled (package, column), as packages share
+column names (e.g. WDIR in stdmet and cwind).
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from NDBC.frames import frame_times
+
+DIRECTIONS = ["nearest", "backward", "forward"]
+
+
+def package_times(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Return a package indexed by sorted, unique timestamps
+
+    Args:
+        dataframe (DataFrame): Package with a datetime index or column
+
+    Returns:
+        DataFrame: The package with a DatetimeIndex.  The datetime column is
+        dropped.  Rows are only reordered if they are not already sorted.
+    """
+    times = frame_times(dataframe)
+    if times is None:
+        raise ValueError("Data has no datetime index or column")
+    if not isinstance(dataframe.index, pd.DatetimeIndex):
+        dataframe = dataframe.drop(columns="datetime")
+        dataframe.index = pd.DatetimeIndex(times)
+    if not dataframe.index.is_monotonic_increasing:
+        dataframe = dataframe.sort_index(kind="stable")
+    if dataframe.index.has_duplicates:
+        dataframe = dataframe[~dataframe.index.duplicated(keep="last")]
+    return dataframe
+
+
+def match_times(
+    times: pd.DatetimeIndex,
+    target: pd.DatetimeIndex,
+    tolerance: Optional[pd.Timedelta] = None,
+    direction: str = "nearest",
+) -> np.ndarray:
+    """Return the position in times matching each target timestamp
+
+    Args:
+        times (DatetimeIndex): Sorted, unique observation times
+        target (DatetimeIndex): Sorted timestamps to match
+        tolerance (Timedelta, optional): Largest time difference matched.
+            Defaults to exact matches only.
+        direction (str, optional): "nearest", "backward" or "forward"
+
+    Returns:
+        ndarray: Positions in times, -1 where a timestamp has no match
+    """
+    t = times.asi8
+    x = target.asi8
+    if times.equals(target):
+        return np.arange(len(t))
+    if not len(t):
+        return np.full(len(x), -1, dtype=np.intp)
+    # The first observation at or after each target, and the one before it,
+    # clipped to the array.  Gaps are negative where there is no such row.
+    after = np.searchsorted(t, x, side="left")
+    right = np.minimum(after, len(t) - 1)
+    right_gap = t[right] - x
+    exact = right_gap == 0
+    if tolerance is None:
+        return np.where(exact, right, -1)
+    left = np.maximum(after - 1, 0)
+    left_gap = x - t[left]
+    if direction == "forward":
+        positions = np.where(right_gap >= 0, right, -1)
+        gap = right_gap
+    elif direction == "backward":
+        positions = np.where(exact, right, np.where(after > 0, left, -1))
+        gap = np.where(exact, 0, left_gap)
+    else:
+        # Ties go to the earlier observation, as with merge_asof
+        use_right = (right_gap >= 0) & ((after == 0) | (right_gap < left_gap))
+        positions = np.where(use_right, right, left)
+        gap = np.where(use_right, right_gap, left_gap)
+    positions[gap > tolerance.value] = -1
+    return positions
+
+
+def take_floats(
+    frames: Dict[str, pd.DataFrame], indexers: Dict[str, np.ndarray], length: int
+) -> np.ndarray:
+    """Gather packages of float columns into one (column, time) array
+
+    The values of each package are taken straight into their rows of the
+    output, so the result is a single block needing no further copies.
+    """
+    dtype = np.result_type(*(dt for df in frames.values() for dt in df.dtypes))
+    values = np.empty((sum(df.shape[1] for df in frames.values()), length), dtype)
+    start = 0
+    for pkg, df in frames.items():
+        block = values[start : start + df.shape[1]]
+        start += df.shape[1]
+        source = df.to_numpy().T
+        # Unmatched positions (-1) are clipped, their values replaced below
+        if source.dtype == dtype and source.flags["C_CONTIGUOUS"]:
+            np.take(source, indexers[pkg], axis=1, out=block, mode="clip")
+        else:
+            block.T[:] = source.T.take(indexers[pkg], axis=0, mode="clip")
+        block[:, indexers[pkg] == -1] = np.nan
+    return values
+
+
+def take_rows(
+    dataframe: pd.DataFrame, indexer: np.ndarray, index: pd.Index
+) -> pd.DataFrame:
+    """Return the rows of a DataFrame at positions, missing where -1"""
+    allow_fill = (indexer == -1).any()
+    return pd.DataFrame(
+        {
+            col: pd.api.extensions.take(
+                dataframe[col].array, indexer, allow_fill=allow_fill
+            )
+            for col in dataframe.columns
+        },
+        index=index,
+    )
+
+
+def shared_index(
+    frames: Dict[str, pd.DataFrame],
+    on: Union[str, pd.DatetimeIndex, None] = None,
+    rule: Optional[str] = None,
+) -> pd.DatetimeIndex:
+    """Return the sorted time axis packages are aligned on
+
+    Args:
+        frames (Dict[str, DataFrame]): Packages with a sorted DatetimeIndex
+        on (Union[str, DatetimeIndex], optional): A package whose timestamps
+            are used, or the timestamps themselves. Defaults to the timestamps
+            of all packages.
+        rule (str, optional): Pandas offset alias (e.g. "1H").  The axis is a
+            regular range at this frequency covering the timestamps of `on`.
+
+    Returns:
+        DatetimeIndex: The shared time axis
+    """
+    if isinstance(on, str):
+        if on not in frames:
+            raise ValueError(
+                f"Unknown package {on}.  Please use one of the following: "
+                f'{", ".join(frames)}'
+            )
+        times = frames[on].index
+    elif on is not None:
+        times = pd.DatetimeIndex(on)
+    else:
+        indexes = [df.index for df in frames.values() if len(df)]
+        if not indexes:
+            return pd.DatetimeIndex([], name="datetime")
+        # Every package is sorted, so one unique over all timestamps suffices
+        times = pd.DatetimeIndex(np.unique(np.concatenate([i.values for i in indexes])))
+    if rule is not None and len(times):
+        times = pd.date_range(times.min().floor(rule), times.max(), freq=rule)
+    return pd.DatetimeIndex(times, name="datetime")
+
+
+def align_frames(
+    frames: Dict[str, pd.DataFrame],
+    on: Union[str, pd.DatetimeIndex, None] = None,
+    rule: Optional[str] = None,
+    tolerance: Union[str, pd.Timedelta, None] = None,
+    direction: str = "nearest",
+    agg: Optional[str] = None,
+) -> pd.DataFrame:
+    """Join data packages on one sorted DatetimeIndex
+
+    Each package is matched to the shared index in one sorted search.  Without
+    a tolerance only identical timestamps are matched; with one, the
+    observation nearest each timestamp in `direction` and within `tolerance`
+    is used.  Timestamps without a match are missing.
+
+    Args:
+        frames (Dict[str, DataFrame]): Data keyed by package name, with a
+            datetime index or column
+        on (Union[str, DatetimeIndex], optional): Package or timestamps to
+            align on. Defaults to the timestamps of all packages.
+        rule (str, optional): Pandas offset alias of a regular time axis to
+            align on, e.g. "1H".
+        tolerance (Union[str, Timedelta], optional): Largest time difference
+            matched, e.g. "10min".
+        direction (str, optional): "nearest", "backward" (latest observation
+            at or before) or "forward" (earliest at or after). Defaults to
+            "nearest".
+        agg (str, optional): Aggregation (e.g. "mean") applied to each
+            package over the periods of `rule` rather than matching single
+            observations.
+
+    Returns:
+        DataFrame: The packages on the shared index, with (package, column)
+        column labels
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(
+            f"Unknown direction {direction}.  Please use one of the following: "
+            f'{", ".join(DIRECTIONS)}'
+        )
+    if agg is not None and rule is None:
+        raise ValueError("agg requires a resampling rule")
+    frames = {pkg: package_times(df) for pkg, df in frames.items()}
+    if agg is not None:
+        frames = {pkg: df.resample(rule).agg(agg) for pkg, df in frames.items()}
+    index = shared_index(frames, on=on, rule=rule)
+    if tolerance is not None:
+        tolerance = pd.Timedelta(tolerance)
+    indexers = {
+        pkg: match_times(df.index, index, tolerance, direction)
+        for pkg, df in frames.items()
+    }
+    labels = pd.MultiIndex.from_arrays(
+        [
+            [pkg for pkg, df in frames.items() for _ in df.columns],
+            [col for df in frames.values() for col in df.columns],
+        ],
+        names=["package", "column"],
+    )
+    floats = all(
+        pd.api.types.is_float_dtype(dt) and isinstance(dt, np.dtype)
+        for df in frames.values()
+        for dt in df.dtypes
+    )
+    if floats and len(labels):
+        values = take_floats(frames, indexers, len(index))
+        return pd.DataFrame(values.T, index=index, columns=labels, copy=False)
+    taken = [take_rows(df, indexers[pkg], index) for pkg, df in frames.items()]
+    if not taken:
+        return pd.DataFrame(index=index, columns=labels)
+    aligned = pd.concat(taken, axis=1, copy=False)
+    aligned.columns = labels
+    return aligned
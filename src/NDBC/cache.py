@@ -0,0 +1,522 @@
+"""Persistent on-disk caches for NDBC data
+
+Downloaded files are stored under a cache directory keyed by station, data
+package and period.  Historical (yearly) files never change once published and
+are served from disk without contacting the server.  Files that may still be
+updated, such as the monthly files for the current year, are reused for `ttl`
+seconds and then revalidated with a conditional request using the ETag and
+Last-Modified headers of the stored copy.
+
+The cache is bounded by `max_bytes`; when a new file would exceed the limit the
+least recently used files are removed first.  The index is shared safely
+between threads, but not between processes.  Access times are recorded in
+memory on each hit and written with the index when files are stored or
+removed, or when the cache is flushed or closed.
+
+A second tier, `FrameCache`, stores the DataFrame parsed from each file in the
+Arrow Feather format so cached periods can be loaded without parsing.  It is
+bounded by `max_bytes` in the same way, using the file modification time,
+updated on each hit, as the access time.  This requires the optional pyarrow
+dependency.
+
+`MetadataCache` keeps the attributes parsed from station pages for a week by
+default, so repeated runs over the same stations do not fetch their pages.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from typing import List, Optional, Tuple, Union
+
+import pandas as pd
+import requests
+
+from NDBC.fetch import get_first, get_session
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pragma: no cover
+    feather = None
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "NDBC")
+INDEX_FILE = "index.json"
+# Schema metadata key of the units and source digest stored with each frame
+FRAME_META_KEY = b"ndbc"
+
+
+class HTTPCache:
+    """Size bounded, least recently used cache of NDBC text files
+
+    Args:
+        directory (str, optional): Location of the cache. Defaults to ~/.cache/NDBC/http.
+        max_bytes (int, optional): Maximum total size of cached files. Defaults to 1 GB.
+        ttl (float, optional): Seconds a mutable file is used before revalidation. Defaults to one hour.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_bytes: int = 1024**3,
+        ttl: float = 3600,
+    ) -> None:
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "http")
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        # Whether access times changed since the index was written
+        self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = self.__read_index()
+
+    def __enter__(self) -> "HTTPCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---------------------------- INDEX HANDLING -----------------------------
+    def __index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_FILE)
+
+    def __read_index(self) -> dict:
+        try:
+            with open(self.__index_path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def __write_index(self) -> None:
+        tmp_path = self.__index_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.__index_path())
+        self._dirty = False
+
+    def flush(self) -> None:
+        """Write access times recorded since the index was last written"""
+        with self._lock:
+            if self._dirty:
+                self.__write_index()
+
+    def close(self) -> None:
+        """Write any pending index changes, see `flush`"""
+        self.flush()
+
+    def __file_path(self, key: str) -> str:
+        return os.path.join(self.directory, *key.split("/")) + ".txt"
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached files"""
+        with self._lock:
+            return sum(entry["size"] for entry in self._index.values())
+
+    def stats(self) -> dict:
+        """Return hit/miss counters along with the number and size of entries"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self.size,
+            }
+
+    # ---------------------------- ENTRY HANDLING -----------------------------
+    def __read(self, key: str) -> Optional[str]:
+        try:
+            with open(self.__file_path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def __remove(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            os.remove(self.__file_path(key))
+        except FileNotFoundError:
+            pass
+
+    def __evict(self, required: int) -> None:
+        """Remove least recently used entries until `required` bytes fit"""
+        by_access = sorted(self._index.items(), key=lambda kv: kv[1]["accessed"])
+        total = self.size
+        for key, entry in by_access:
+            if total + required <= self.max_bytes:
+                break
+            total -= entry["size"]
+            self.__remove(key)
+
+    def store(
+        self, key: str, url: str, response: requests.Response, immutable: bool = False
+    ) -> None:
+        """Add a downloaded file to the cache
+
+        Args:
+            key (str): Cache key, see `DataBuoy._year_period`
+            url (str): URL the file was downloaded from
+            response (requests.Response): Successful response holding the file
+            immutable (bool, optional): Whether the file can never change. Defaults to False.
+        """
+        body = response.text.encode("utf-8")
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self.__remove(key)
+            self.__evict(len(body))
+            path = self.__file_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(body)
+            now = time.time()
+            self._index[key] = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "immutable": immutable,
+                "fetched": now,
+                "accessed": now,
+                "size": len(body),
+            }
+            self.__write_index()
+
+    def __hit(self, key: str, url: str, text: str) -> Tuple[str, str]:
+        with self._lock:
+            self.hits += 1
+            entry = self._index.get(key)
+            if entry is not None:
+                entry["accessed"] = time.time()
+                self._dirty = True
+        return url, text
+
+    def __revalidate(
+        self, key: str, entry: dict, text: str, session: requests.Session
+    ) -> Optional[Tuple[str, str]]:
+        """Confirm a stored file is current with a conditional request"""
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return None
+        response = session.get(entry["url"], headers=headers)
+        if response.status_code == 304:
+            with self._lock:
+                if key in self._index:
+                    self._index[key]["fetched"] = time.time()
+            return self.__hit(key, entry["url"], text)
+        if response.status_code == 200:
+            with self._lock:
+                self.misses += 1
+            self.store(key, entry["url"], response, entry["immutable"])
+            return entry["url"], response.text
+        return None
+
+    def fetch(
+        self,
+        key: str,
+        urls: List[str],
+        immutable: bool = False,
+        session: Optional[requests.Session] = None,
+    ) -> Tuple[Union[str, bool], Optional[str]]:
+        """Return a file from the cache, downloading it if necessary
+
+        Args:
+            key (str): Cache key identifying station, data package and period
+            urls (List[str]): Candidate URLs in order of preference
+            immutable (bool, optional): Whether the file can never change. Defaults to False.
+            session (requests.Session, optional): Session to use. Defaults to the shared session.
+
+        Returns:
+            Tuple[Union[str, bool], Optional[str]]: The URL and body of the file,
+            or (False, None) if it is not available.
+        """
+        session = session if session is not None else get_session()
+        with self._lock:
+            entry = self._index.get(key)
+            # A copy, as other threads may update the entry
+            entry = dict(entry) if entry is not None else None
+        text = self.__read(key) if entry else None
+        if text is not None:
+            fresh = time.time() - entry["fetched"] < self.ttl
+            if entry["immutable"] or fresh:
+                return self.__hit(key, entry["url"], text)
+            result = self.__revalidate(key, entry, text, session)
+            if result is not None:
+                return result
+        with self._lock:
+            self.misses += 1
+        url, response = get_first(urls, session)
+        if not url:
+            if entry:
+                with self._lock:
+                    self.__remove(key)
+                    self.__write_index()
+            return False, None
+        self.store(key, url, response, immutable)
+        return url, response.text
+
+    def clear(self) -> None:
+        """Remove every cached file"""
+        with self._lock:
+            for key in list(self._index.keys()):
+                self.__remove(key)
+            self.__write_index()
+
+
+def text_digest(text: str) -> str:
+    """Return a digest identifying the contents of a downloaded file"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class FrameCache:
+    """Cache of parsed data in the Arrow Feather format
+
+    Stores the DataFrame produced for a station/package/period together with its
+    units, so repeated loads are a memory-mapped read rather than a parse.
+    Frames are stored with the datetime as a column and written uncompressed by
+    default so reads can map the file directly.  The units and the digest of
+    the source file are kept in the schema metadata, so each entry is a single
+    file replaced in one step.
+
+    Args:
+        directory (str, optional): Location of the cache. Defaults to ~/.cache/NDBC/frames.
+        compression (str, optional): Feather compression. Defaults to "uncompressed".
+        max_bytes (int, optional): Maximum total size of cached frames. Defaults to 1 GB.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        compression: str = "uncompressed",
+        max_bytes: int = 1024**3,
+    ) -> None:
+        if feather is None:
+            raise ImportError(
+                "FrameCache requires pyarrow, install it with `pip install NDBC[arrow]`"
+            )
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "frames")
+        self.compression = compression
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = self.__scan()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, *key.split("/")) + ".feather"
+
+    def __scan(self) -> dict:
+        """Index the size and last access time of the frames on disk"""
+        index = {}
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".feather"):
+                    continue
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.directory)[: -len(".feather")]
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                index["/".join(rel.split(os.sep))] = {
+                    "size": stat.st_size,
+                    "accessed": stat.st_mtime,
+                }
+        return index
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the cached frames"""
+        with self._lock:
+            return sum(entry["size"] for entry in self._index.values())
+
+    def __remove(self, key: str) -> None:
+        self._index.pop(key, None)
+        try:
+            os.remove(self.__path(key))
+        except FileNotFoundError:
+            pass
+
+    def __evict(self, required: int) -> None:
+        """Remove least recently used frames until `required` bytes fit"""
+        by_access = sorted(self._index.items(), key=lambda kv: kv[1]["accessed"])
+        total = sum(entry["size"] for entry in self._index.values())
+        for key, entry in by_access:
+            if total + required <= self.max_bytes:
+                break
+            total -= entry["size"]
+            self.__remove(key)
+
+    def __hit(self, key: str, path: str) -> None:
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            entry = self._index.get(key)
+            if entry is not None:
+                entry["accessed"] = now
+        try:
+            # The modification time keeps the access order across sessions
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+
+    def get(
+        self, key: str, digest: Optional[str] = None
+    ) -> Optional[Tuple[pd.DataFrame, Union[dict, bool]]]:
+        """Return the cached frame and units for a period
+
+        Args:
+            key (str): Cache key identifying station, data package and period
+            digest (str, optional): Digest of the source file. When given the
+                cached frame is only returned if it was parsed from the same file.
+
+        Returns:
+            Optional[Tuple[DataFrame, Union[dict, bool]]]: The parsed data and
+            units, or None if there is no matching entry.
+        """
+        path = self.__path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+            meta = json.loads((table.schema.metadata or {})[FRAME_META_KEY])
+            if digest is not None and meta["digest"] != digest:
+                raise LookupError(key)
+        except (FileNotFoundError, ValueError, LookupError):
+            with self._lock:
+                self.misses += 1
+            return None
+        self.__hit(key, path)
+        return table.to_pandas(), meta["units"]
+
+    def put(
+        self,
+        key: str,
+        data: pd.DataFrame,
+        units: Union[dict, bool],
+        digest: Optional[str] = None,
+    ) -> None:
+        """Store the parsed frame and units for a period
+
+        Args:
+            key (str): Cache key identifying station, data package and period
+            data (DataFrame): Parsed data with the datetime stored as a column
+            units (Union[dict, bool]): Units dictionary, or False if not available
+            digest (str, optional): Digest of the source file
+        """
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(data.reset_index(drop=True))
+        meta = json.dumps({"units": units, "digest": digest}).encode("utf-8")
+        table = table.replace_schema_metadata(
+            {**(table.schema.metadata or {}), FRAME_META_KEY: meta}
+        )
+        # A temporary file of its own, so concurrent writers of one key, in
+        # threads or processes, never share a partly written file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".feather.tmp"
+        )
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_path, compression=self.compression)
+            size = os.path.getsize(tmp_path)
+            if size > self.max_bytes:
+                os.remove(tmp_path)
+                return
+            with self._lock:
+                self._index.pop(key, None)
+                self.__evict(size)
+                os.replace(tmp_path, path)
+                self._index[key] = {"size": size, "accessed": time.time()}
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def stats(self) -> dict:
+        """Return hit/miss counters along with the number and size of entries"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": sum(entry["size"] for entry in self._index.values()),
+            }
+
+    def clear(self) -> None:
+        """Remove every cached frame"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+            self._index = {}
+
+
+class MetadataCache:
+    """Cache of parsed station metadata, kept for `ttl` seconds
+
+    Station metadata changes rarely, so the parsed attributes of each station
+    are stored in a single JSON file and reused until they are `ttl` seconds old.
+
+    Args:
+        directory (str, optional): Location of the cache. Defaults to ~/.cache/NDBC/metadata.
+        ttl (float, optional): Seconds an entry is used before it is fetched again. Defaults to one week.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 7 * 86400) -> None:
+        self.directory = directory or os.path.join(DEFAULT_CACHE_DIR, "metadata")
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._entries = self.__read()
+
+    def __path(self) -> str:
+        return os.path.join(self.directory, "metadata.json")
+
+    def __read(self) -> dict:
+        try:
+            with open(self.__path(), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def __write(self) -> None:
+        tmp_path = self.__path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._entries, f)
+        os.replace(tmp_path, self.__path())
+
+    def get(self, station_id: str) -> Optional[dict]:
+        """Return the stored metadata of a station, or None if missing or expired"""
+        entry = self._entries.get(station_id)
+        with self._lock:
+            if entry is None or time.time() - entry["fetched"] >= self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return dict(entry["info"])
+
+    def put(self, station_id: str, info: dict) -> None:
+        """Store the metadata of a station"""
+        with self._lock:
+            self._entries[station_id] = {"fetched": time.time(), "info": info}
+            self.__write()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of entries"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        with self._lock:
+            self._entries = {}
+            self.__write()
@@ -0,0 +1,391 @@
+"""Local catalog of NDBC stations for offline station searches
+
+`StationCatalog` holds the location and description of every station, read
+once from the NDBC station table (or from DataBuoy station metadata), with a
+spatial index over the station positions.  Radial, box and nearest neighbour
+searches, for one point or many, are answered locally without a request to the
+NDBC search pages.
+
+Positions are indexed as points on the unit sphere, so straight line (chord)
+distances between them order stations exactly as great circle distances do.
+The index is a KD-tree when scipy is installed; otherwise searches compute the
+distance to every station with numpy, which is still fast for the few thousand
+stations NDBC lists.
+"""
+
+import re
+
+from typing import Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from NDBC.fetch import get_session
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover
+    cKDTree = None
+
+STATION_TABLE_URL = "https://www.ndbc.noaa.gov/data/stations/station_table.txt"
+
+# Columns of the station table, in file order
+TABLE_COLUMNS = [
+    "station_id",
+    "owner",
+    "type",
+    "hull",
+    "name",
+    "payload",
+    "location",
+    "timezone",
+    "forecast",
+    "note",
+]
+
+# Mean radius of the Earth in each unit of measure of the station search
+EARTH_RADIUS = {"metric": 6371.0088, "english": 3958.7613}
+
+SEARCH_TYPES = ["radial", "box"]
+UOMS = ["metric", "english"]
+# Station types included by each observation type of the station search
+OBS_TYPES = {"buoy": r"buoy", "ship": r"ship|drift", "all": r""}
+
+LOCATION_PAT = re.compile(r"(\d+(?:\.\d+)?)\s*([NS])\s+(\d+(?:\.\d+)?)\s*([EW])")
+COORDINATE_PAT = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*([NSEW]?)\s*$")
+
+Coordinate = Union[float, str]
+
+
+def parse_coordinate(value: Coordinate) -> float:
+    """Return a latitude or longitude in signed decimal degrees
+
+    Args:
+        value (Union[float, str]): Decimal degrees, or a string such as
+            "36.785 N" or "122.398 W" as found in station metadata
+
+    Returns:
+        float: Degrees, negative to the south and west
+    """
+    if isinstance(value, str):
+        match = COORDINATE_PAT.match(value)
+        if match is None:
+            raise ValueError(f"Coordinate {value} not understood")
+        degrees, hemisphere = match.groups()
+        sign = -1 if hemisphere in ("S", "W") else 1
+        return sign * float(degrees)
+    return float(value)
+
+
+def parse_location(location: str) -> Tuple[float, float]:
+    """Return the latitude and longitude of a station table location
+
+    Args:
+        location (str): Location such as "36.785 N 122.398 W (36&#176;47'6" N ...)"
+
+    Returns:
+        Tuple[float, float]: Latitude and longitude, NaN if not understood
+    """
+    match = LOCATION_PAT.search(location or "")
+    if match is None:
+        return np.nan, np.nan
+    lat, ns, lon, ew = match.groups()
+    return (
+        float(lat) * (-1 if ns == "S" else 1),
+        float(lon) * (-1 if ew == "W" else 1),
+    )
+
+
+def unit_vectors(lat, lon) -> np.ndarray:
+    """Return positions as points on the unit sphere, one row per position"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_length(distance, uom: str = "metric"):
+    """Return the chord on the unit sphere spanning a great circle distance"""
+    angle = np.minimum(np.asarray(distance, dtype=float) / EARTH_RADIUS[uom], np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def great_circle(chord, uom: str = "metric"):
+    """Return the great circle distance spanned by a chord on the unit sphere"""
+    return 2 * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1)) * EARTH_RADIUS[uom]
+
+
+class StationCatalog:
+    """Station positions and descriptions with a spatial index
+
+    Args:
+        stations (DataFrame): One row per station indexed by station ID, with
+            "lat" and "lon" columns in decimal degrees (negative to the south
+            and west) and optionally a "type" column describing the station.
+    """
+
+    def __init__(self, stations: pd.DataFrame) -> None:
+        stations = stations.dropna(subset=["lat", "lon"])
+        stations.index = stations.index.astype(str).str.lower()
+        self.stations = stations
+        self.points = unit_vectors(stations["lat"].values, stations["lon"].values)
+        self.tree = cKDTree(self.points) if cKDTree is not None else None
+
+    def __repr__(self) -> str:
+        return f"<StationCatalog: {len(self)} stations>"
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    # -------------------------- BUILDING ----------------------------------
+    @classmethod
+    def from_table(cls, text: str) -> "StationCatalog":
+        """Build a catalog from the text of the NDBC station table
+
+        Args:
+            text (str): Contents of station_table.txt
+
+        Returns:
+            StationCatalog: The catalog
+        """
+        width = len(TABLE_COLUMNS)
+        rows = [
+            ([field.strip() for field in line.split("|")] + [""] * width)[:width]
+            for line in text.splitlines()
+            if line.strip() and not line.startswith("#")
+        ]
+        stations = pd.DataFrame(rows, columns=TABLE_COLUMNS).set_index("station_id")
+        coordinates = [parse_location(loc) for loc in stations["location"]]
+        stations["lat"] = [lat for lat, _ in coordinates]
+        stations["lon"] = [lon for _, lon in coordinates]
+        return cls(stations.drop(columns="location"))
+
+    @classmethod
+    def fetch(cls, url: str = STATION_TABLE_URL, session=None) -> "StationCatalog":
+        """Build a catalog from the station table on the NDBC server
+
+        Args:
+            url (str, optional): Location of the station table. Defaults to STATION_TABLE_URL.
+            session (requests.Session, optional): Session to use. Defaults to the shared session.
+
+        Returns:
+            StationCatalog: The catalog
+        """
+        response = (session if session is not None else get_session()).get(url)
+        response.raise_for_status()
+        return cls.from_table(response.text)
+
+    @classmethod
+    def from_buoys(cls, buoys: Iterable) -> "StationCatalog":
+        """Build a catalog from DataBuoy objects with station metadata
+
+        Args:
+            buoys (Iterable[DataBuoy]): Buoys after `get_station_metadata`
+
+        Returns:
+            StationCatalog: The catalog
+        """
+        records = {}
+        for db in buoys:
+            info = dict(getattr(db, "station_info", {}))
+            if "lat" not in info or "lon" not in info:
+                continue
+            info["lat"], info["lon"] = (
+                parse_coordinate(info["lat"]),
+                parse_coordinate(info["lon"]),
+            )
+            records[db.station_id] = info
+        return cls(pd.DataFrame.from_dict(records, orient="index"))
+
+    def save(self, path: str) -> None:
+        """Write the catalog to a CSV file"""
+        self.stations.to_csv(path, index_label="station_id")
+
+    @classmethod
+    def load(cls, path: str) -> "StationCatalog":
+        """Read a catalog written by `save`"""
+        return cls(pd.read_csv(path, index_col="station_id", dtype={"station_id": str}))
+
+    # -------------------------- SEARCHING ---------------------------------
+    def __type_mask(self, obs_type: str) -> np.ndarray:
+        if obs_type not in OBS_TYPES:
+            raise ValueError(
+                f"Invalid observation type.  Please use one of the "
+                f'following: {", ".join(OBS_TYPES.keys())}'
+            )
+        if not OBS_TYPES[obs_type] or "type" not in self.stations.columns:
+            return np.ones(len(self), dtype=bool)
+        types = self.stations["type"].fillna("").astype(str)
+        return types.str.contains(OBS_TYPES[obs_type], case=False).values
+
+    @staticmethod
+    def __check_uom(uom: str) -> None:
+        if uom not in UOMS:
+            raise ValueError(
+                f"Invalid UOM. Please use one of the following: {', '.join(UOMS)}"
+            )
+
+    def __ids(self, positions, mask, exclude=None) -> Set[str]:
+        positions = np.asarray(positions, dtype=int)
+        ids = self.stations.index.values[positions[mask[positions]]]
+        return set(ids) - {str(exclude).lower()} if exclude else set(ids)
+
+    def __within(self, points: np.ndarray, chords: np.ndarray) -> List[List[int]]:
+        """Positions of the stations within a chord of each point"""
+        if self.tree is not None:
+            return [
+                self.tree.query_ball_point(point, chord)
+                for point, chord in zip(points, chords)
+            ]
+        return [
+            np.flatnonzero(np.linalg.norm(self.points - point, axis=1) <= chord)
+            for point, chord in zip(points, chords)
+        ]
+
+    def radial_many(
+        self,
+        points: Sequence[Tuple[Coordinate, Coordinate]],
+        distance: Union[float, Sequence[float]],
+        uom: str = "metric",
+        obs_type: str = "buoy",
+    ) -> List[Set[str]]:
+        """Find the stations within a distance of each of many points
+
+        Args:
+            points (Sequence[Tuple]): (lat, lon) pairs
+            distance (Union[float, Sequence[float]]): Search radius, or one radius per point
+            uom (str, optional): "metric" (km) or "english" (miles). Defaults to "metric".
+            obs_type (str, optional): "buoy", "ship" or "all". Defaults to "buoy".
+
+        Returns:
+            List[Set[str]]: Station IDs found for each point
+        """
+        self.__check_uom(uom)
+        mask = self.__type_mask(obs_type)
+        lat = [parse_coordinate(lat) for lat, _ in points]
+        lon = [parse_coordinate(lon) for _, lon in points]
+        chords = np.broadcast_to(chord_length(distance, uom), (len(lat),))
+        found = self.__within(unit_vectors(lat, lon), chords)
+        return [self.__ids(positions, mask) for positions in found]
+
+    def radial(
+        self,
+        lat: Coordinate,
+        lon: Coordinate,
+        distance: float,
+        uom: str = "metric",
+        obs_type: str = "buoy",
+        exclude: Optional[str] = None,
+    ) -> Set[str]:
+        """Find the stations within a distance of a point
+
+        Args:
+            lat (Union[float, str]): Latitude of the point
+            lon (Union[float, str]): Longitude of the point
+            distance (float): Search radius
+            uom (str, optional): "metric" (km) or "english" (miles). Defaults to "metric".
+            obs_type (str, optional): "buoy", "ship" or "all". Defaults to "buoy".
+            exclude (str, optional): Station ID left out of the results
+
+        Returns:
+            Set[str]: Station IDs
+        """
+        found = self.radial_many([(lat, lon)], distance, uom, obs_type)[0]
+        return found - {str(exclude).lower()} if exclude else found
+
+    def box(
+        self,
+        lat1: Coordinate,
+        lat2: Coordinate,
+        lon1: Coordinate,
+        lon2: Coordinate,
+        obs_type: str = "buoy",
+        exclude: Optional[str] = None,
+    ) -> Set[str]:
+        """Find the stations within a latitude and longitude box
+
+        Args:
+            lat1, lat2 (Union[float, str]): Latitudes of opposite corners
+            lon1, lon2 (Union[float, str]): Longitudes of opposite corners
+            obs_type (str, optional): "buoy", "ship" or "all". Defaults to "buoy".
+            exclude (str, optional): Station ID left out of the results
+
+        Returns:
+            Set[str]: Station IDs
+        """
+        lats = sorted([parse_coordinate(lat1), parse_coordinate(lat2)])
+        lons = sorted([parse_coordinate(lon1), parse_coordinate(lon2)])
+        lat, lon = self.stations["lat"].values, self.stations["lon"].values
+        inside = (
+            (lat >= lats[0]) & (lat <= lats[1]) & (lon >= lons[0]) & (lon <= lons[1])
+        )
+        return self.__ids(np.flatnonzero(inside), self.__type_mask(obs_type), exclude)
+
+    def nearest(
+        self,
+        lat: Coordinate,
+        lon: Coordinate,
+        k: int = 1,
+        uom: str = "metric",
+        obs_type: str = "buoy",
+    ) -> pd.DataFrame:
+        """Find the stations nearest a point
+
+        Args:
+            lat (Union[float, str]): Latitude of the point
+            lon (Union[float, str]): Longitude of the point
+            k (int, optional): Number of stations. Defaults to 1.
+            uom (str, optional): "metric" (km) or "english" (miles). Defaults to "metric".
+            obs_type (str, optional): "buoy", "ship" or "all". Defaults to "buoy".
+
+        Returns:
+            DataFrame: Catalog rows of the nearest stations, closest first, with
+            their "distance" from the point
+        """
+        self.__check_uom(uom)
+        mask = self.__type_mask(obs_type)
+        point = unit_vectors([parse_coordinate(lat)], [parse_coordinate(lon)])[0]
+        if self.tree is not None and mask.all():
+            chords, positions = self.tree.query(point, k=min(k, len(self)))
+            chords, positions = np.atleast_1d(chords), np.atleast_1d(positions)
+        else:
+            candidates = np.flatnonzero(mask)
+            distances = np.linalg.norm(self.points[candidates] - point, axis=1)
+            order = np.argsort(distances, kind="stable")[:k]
+            chords, positions = distances[order], candidates[order]
+        result = self.stations.iloc[positions].copy()
+        result["distance"] = great_circle(chords, uom)
+        return result
+
+    def search(
+        self,
+        search_type: str = "radial",
+        lat1: Coordinate = False,
+        lat2: Coordinate = False,
+        lon1: Coordinate = False,
+        lon2: Coordinate = False,
+        uom: str = "metric",
+        obs_type: str = "buoy",
+        distance: float = False,
+        exclude: Optional[str] = None,
+    ) -> Set[str]:
+        """Station search with the arguments of `DataBuoy.station_search`
+
+        The catalog does not record when stations last reported, so there is
+        no equivalent of the `time` argument.
+
+        Returns:
+            Set[str]: Station IDs
+        """
+        if search_type not in SEARCH_TYPES:
+            raise ValueError(
+                f"Invalid search type. Please use one of the "
+                f'following: {", ".join(SEARCH_TYPES)}'
+            )
+        if search_type == "radial":
+            return self.radial(lat1, lon1, distance, uom, obs_type, exclude)
+        return self.box(lat1, lat2, lon1, lon2, obs_type, exclude)
+
+    def info(self, station_ids: Iterable[str]) -> pd.DataFrame:
+        """Return the catalog rows of a set of stations"""
+        ids = [str(s).lower() for s in station_ids]
+        return self.stations.loc[[s for s in ids if s in self.stations.index]]
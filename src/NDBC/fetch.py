@@ -0,0 +1,139 @@
+"""HTTP access to the NDBC web server
+
+All requests share a single pooled `requests.Session` so connections are kept
+alive and reused across periods, packages and stations.  Candidate data URLs
+are tried in order with a GET and the body of the first successful response is
+returned, rather than probing each URL with HEAD and downloading it again.
+
+Sessions created with a `RateLimiter` space out the requests sent to each host,
+which keeps large batch downloads within the limits of the NDBC servers.
+"""
+
+import threading
+import time
+
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+# Maximum number of connections kept open per host.  This should be at least
+# the number of worker threads sharing the session.
+POOL_SIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class RateLimiter:
+    """Limit the number of requests started per second for each host
+
+    Args:
+        rate (float): Maximum requests per second sent to a single host
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("Rate must be greater than zero")
+        self.interval = 1.0 / rate
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Block until a request to the host of `url` may be sent"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Connection pooling adapter that waits for a `RateLimiter` before sending"""
+
+    def __init__(self, limiter: RateLimiter, **kwargs) -> None:
+        self.limiter = limiter
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.limiter.wait(request.url)
+        return super().send(request, **kwargs)
+
+
+def make_session(
+    pool_size: int = POOL_SIZE, limiter: Optional[RateLimiter] = None
+) -> requests.Session:
+    """Create a session with keep-alive connection pooling
+
+    Args:
+        pool_size (int, optional): Connections kept open per host. Defaults to POOL_SIZE.
+        limiter (RateLimiter, optional): Per host request rate limit. Defaults to None.
+
+    Returns:
+        requests.Session: The new session
+    """
+    session = requests.Session()
+    pool_kws = {"pool_connections": pool_size, "pool_maxsize": pool_size}
+    adapter = (
+        RateLimitedAdapter(limiter, **pool_kws)
+        if limiter is not None
+        else HTTPAdapter(**pool_kws)
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the shared, pooled HTTP session
+
+    Returns:
+        requests.Session: Session with keep-alive connection pooling
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+    return _session
+
+
+def get_first(
+    urls: List[str], session: Optional[requests.Session] = None
+) -> Tuple[Union[str, bool], Optional[requests.Response]]:
+    """Request each candidate URL in turn until one succeeds
+
+    Args:
+        urls (List[str]): Candidate URLs in order of preference
+        session (requests.Session, optional): Session to use. Defaults to the shared session.
+
+    Returns:
+        Tuple[Union[str, bool], Optional[requests.Response]]: The URL and response
+        of the first request with a 200 status code, or (False, None) if there were none.
+    """
+    session = session if session is not None else get_session()
+    for url in urls:
+        response = session.get(url)
+        if response.status_code == 200:
+            return url, response
+    return False, None
+
+
+def fetch_first(
+    urls: List[str], session: Optional[requests.Session] = None
+) -> Tuple[Union[str, bool], Optional[str]]:
+    """Download the first of a list of candidate URLs that exists
+
+    Args:
+        urls (List[str]): Candidate URLs in order of preference
+        session (requests.Session, optional): Session to use. Defaults to the shared session.
+
+    Returns:
+        Tuple[Union[str, bool], Optional[str]]: The URL and body of the first
+        response with a 200 status code, or (False, None) if there were none.
+    """
+    url, response = get_first(urls, session)
+    return url, response.text if response is not None else None
@@ -0,0 +1,229 @@
+"""Fetching data for many stations at once
+
+`BuoyFleet` manages one DataBuoy per station and downloads every
+(station, data package, period) combination as a separate job on a single
+bounded thread pool.  All stations share one HTTP session, so connections are
+pooled across stations and requests to each host are rate limited, as well as
+any HTTP or frame cache.
+
+Each job is recorded with its outcome, so missing periods and failures are
+reported per station, package and period rather than aborting the batch.
+"""
+
+import time
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from NDBC.NDBC import DataBuoy
+from NDBC.fetch import RateLimiter, make_session
+from NDBC.metadata import STATION_URL, StationMetadata, metadata_frame
+
+logger = getLogger(__name__)
+
+# Job states
+PENDING = "pending"
+DONE = "done"
+UNAVAILABLE = "unavailable"
+FAILED = "failed"
+
+
+@dataclass
+class FleetJob:
+    """A single station, data package and period to download
+
+    Attributes:
+        station_id (str): Station identifier
+        data_type (str): Data package
+        period (dict): Period description from `DataBuoy._year_period` or `_month_period`
+        status (str): One of pending, done, unavailable or failed
+        error (str): Description of the failure, if any
+        elapsed (float): Seconds spent on the job
+    """
+
+    station_id: str
+    data_type: str
+    period: dict
+    status: str = PENDING
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def key(self) -> str:
+        """Station, data package and period of the job"""
+        return self.period["key"]
+
+
+class BuoyFleet:
+    """Download data packages for a set of stations on a shared worker pool
+
+    Args:
+        station_ids (Iterable[str]): Stations to include, e.g. from `DataBuoy.station_search`
+        max_workers (int, optional): Jobs run at once. Defaults to 8.
+        rate (float, optional): Maximum requests per second to each host. Defaults to 10.
+        cache (HTTPCache, optional): Cache of downloaded files shared by all stations
+        frame_cache (FrameCache, optional): Cache of parsed data shared by all stations
+        progress (Callable, optional): Called as `progress(job, completed, total)`
+            as each job finishes
+    """
+
+    def __init__(
+        self,
+        station_ids: Iterable[str],
+        max_workers: int = 8,
+        rate: float = 10.0,
+        cache=None,
+        frame_cache=None,
+        progress: Optional[Callable[[FleetJob, int, int], None]] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.progress = progress
+        self.session = make_session(
+            pool_size=max_workers, limiter=RateLimiter(rate) if rate else None
+        )
+        self.buoys: Dict[str, DataBuoy] = {}
+        for station_id in station_ids:
+            db = DataBuoy(
+                station_id, cache=cache, frame_cache=frame_cache, session=self.session
+            )
+            self.buoys[db.station_id] = db
+        self.jobs: List[FleetJob] = []
+
+    def __repr__(self) -> str:
+        return f"<BuoyFleet: {len(self.buoys)} stations>"
+
+    @property
+    def failures(self) -> List[FleetJob]:
+        """Jobs of the last `get_data` call that raised an error"""
+        return [job for job in self.jobs if job.status == FAILED]
+
+    @property
+    def unavailable(self) -> List[FleetJob]:
+        """Jobs of the last `get_data` call with no data file on the server"""
+        return [job for job in self.jobs if job.status == UNAVAILABLE]
+
+    def __run(self, job: FleetJob, datetime_index: bool, compact: bool):
+        start = time.perf_counter()
+        try:
+            result = self.buoys[job.station_id]._fetch_period(
+                job.period, datetime_index=datetime_index, compact=compact
+            )
+            job.status = DONE if result is not None else UNAVAILABLE
+        except Exception as e:
+            result = None
+            job.status = FAILED
+            job.error = f"{type(e).__name__}: {e}"
+        job.elapsed = time.perf_counter() - start
+        return result
+
+    def get_data(
+        self,
+        years=[],
+        months=[],
+        data_types=["stdmet"],
+        datetime_index=True,
+        compact=False,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch data packages for every station in the fleet
+
+        Args:
+            years (list, optional): Years to fetch
+            months (list, optional): Months to fetch, taken from the last 12 months
+            data_types (list, optional): Data packages to fetch. Defaults to ["stdmet"].
+            datetime_index (bool, optional): Use datetime as index (True) or column (False)
+            compact (bool, optional): Use the compact data types of NDBC.schema
+
+        Returns:
+            Dict[str, DataFrame]: For each data package, the data of all
+            stations keyed by station, see `frame`.
+
+        Raises:
+            ValueError: If neither years nor months are given
+        """
+        if not years and not months:
+            raise ValueError("Please provide the years or months to fetch")
+        for data_type in data_types:
+            if data_type not in DataBuoy.DATA_PACKAGES:
+                raise ValueError(
+                    f"Data type {data_type} not understood.  Please use one of the "
+                    f'following: {", ".join(DataBuoy.DATA_PACKAGES.keys())}'
+                )
+        self.jobs = [
+            FleetJob(station_id, data_type, period)
+            for station_id, db in self.buoys.items()
+            for data_type in data_types
+            for period in db._periods(data_type, years, months)
+        ]
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {
+                pool.submit(self.__run, job, datetime_index, compact): i
+                for i, job in enumerate(self.jobs)
+            }
+            for completed, future in enumerate(as_completed(futures), start=1):
+                i = futures[future]
+                results[i] = future.result()
+                if self.progress is not None:
+                    self.progress(self.jobs[i], completed, len(self.jobs))
+        for job in self.failures:
+            logger.warning(f"{job.key} failed: {job.error}")
+        # Storing each station's periods with a single merge per package
+        groups: Dict[tuple, List[int]] = {}
+        for i, job in enumerate(self.jobs):
+            groups.setdefault((job.station_id, job.data_type), []).append(i)
+        for (station_id, data_type), indexes in groups.items():
+            times_unavailable = self.buoys[station_id]._store_periods(
+                [self.jobs[i].period for i in indexes],
+                [results[i] for i in indexes],
+                data_type,
+            )
+            if times_unavailable:
+                logger.warning(
+                    f"{station_id}/{data_type}: " + " ".join(times_unavailable.split())
+                )
+        return {data_type: self.frame(data_type) for data_type in data_types}
+
+    def station_metadata(self, cache=None, url=STATION_URL) -> pd.DataFrame:
+        """
+        Fetch the metadata of every station, storing it on each DataBuoy
+
+        Args:
+            cache (MetadataCache, optional): Persistent cache of parsed metadata
+            url (str, optional): Station page URL template. Defaults to NDBC.metadata.STATION_URL.
+
+        Returns:
+            DataFrame: One row of station attributes per station, see
+            `NDBC.metadata.metadata_frame`
+        """
+        service = StationMetadata(
+            cache=cache, session=self.session, max_workers=self.max_workers, url=url
+        )
+        metadata = service.get_many(self.buoys.keys())
+        for station_id, info in metadata.items():
+            self.buoys[station_id].station_info = info
+        return metadata_frame(metadata)
+
+    def frame(self, data_type: str = "stdmet") -> pd.DataFrame:
+        """
+        Return the data of all stations for a data package in one DataFrame
+
+        Args:
+            data_type (str, optional): Data package. Defaults to "stdmet".
+
+        Returns:
+            DataFrame: Data indexed by station followed by the original index.
+            Stations without data are left out.
+        """
+        frames = {
+            station_id: db.read(data_type)
+            for station_id, db in self.buoys.items()
+            if data_type in db.data.keys()
+        }
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, names=["station", None])
@@ -0,0 +1,97 @@
+"""Combining the DataFrames parsed from individual NDBC files
+
+Each downloaded file (a year or a month of data) is parsed into its own
+DataFrame, or chunk.  Chunks are collected and combined with a single
+`pandas.concat`, sorted on their timestamps and de-duplicated, so loading N
+periods copies the data once rather than once per period.
+
+`ChunkedFrame` holds chunks without combining them, deferring the concat until
+the data is first accessed.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def frame_times(dataframe: pd.DataFrame) -> Optional[pd.Index]:
+    """Return the timestamps of a DataFrame from its datetime index or column"""
+    if isinstance(dataframe.index, pd.DatetimeIndex):
+        return dataframe.index
+    if "datetime" in dataframe.columns:
+        return pd.Index(dataframe["datetime"])
+    return None
+
+
+def merge_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Combine chunks into one DataFrame ordered by time
+
+    Chunks are concatenated once, sorted by timestamp and rows with a repeated
+    timestamp are dropped, keeping the row from the latest chunk.  Frames with
+    the datetime stored as a column are given a new RangeIndex.
+
+    Args:
+        frames (List[DataFrame]): Chunks in the order they were loaded
+
+    Returns:
+        DataFrame: The combined data
+    """
+    if not frames:
+        return pd.DataFrame()
+    datetime_index = isinstance(frames[0].index, pd.DatetimeIndex)
+    data = (
+        pd.concat(objs=frames, ignore_index=not datetime_index)
+        if len(frames) > 1
+        else frames[0]
+    )
+    times = frame_times(data)
+    if times is None:
+        return data
+    changed = False
+    if not times.is_monotonic_increasing:
+        # A stable sort keeps rows with equal timestamps in chunk order
+        order = np.argsort(times.values, kind="stable")
+        data, times = data.iloc[order], times[order]
+        changed = True
+    duplicated = times.duplicated(keep="last")
+    if duplicated.any():
+        data = data[~duplicated]
+        changed = True
+    if changed and not datetime_index:
+        data = data.reset_index(drop=True)
+    return data
+
+
+def project(dataframe: pd.DataFrame, columns: Optional[List[str]]) -> pd.DataFrame:
+    """Select columns of a DataFrame, keeping a datetime column if present"""
+    if columns is None:
+        return dataframe
+    keep = list(columns) + ["datetime"]
+    return dataframe[[c for c in dataframe.columns if c in keep]]
+
+
+class ChunkedFrame:
+    """Chunks of a data package that are combined when first needed
+
+    Args:
+        chunks (List[DataFrame], optional): Initial chunks in load order
+    """
+
+    def __init__(self, chunks: Optional[List[pd.DataFrame]] = None) -> None:
+        self.chunks = list(chunks) if chunks else []
+
+    def __repr__(self) -> str:
+        rows = sum(len(c) for c in self.chunks)
+        return f"ChunkedFrame({len(self.chunks)} chunks, {rows} rows)"
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    def extend(self, chunks: List[pd.DataFrame]) -> None:
+        """Add chunks after those already held"""
+        self.chunks.extend(chunks)
+
+    def load(self) -> pd.DataFrame:
+        """Return the chunks combined with `merge_frames`"""
+        return merge_frames(self.chunks)
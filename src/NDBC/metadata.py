@@ -0,0 +1,182 @@
+"""Station metadata from the NDBC station pages
+
+The metadata block of a station page holds its position followed by a line for
+each attribute, e.g. "<b>Water depth:</b> 1645 m<br/>".  `parse_station_page`
+reads the block in a single pass, matching each line once against
+precompiled patterns.
+
+`StationMetadata` fetches the pages of many stations concurrently on a shared
+session, optionally through a `MetadataCache`, and returns the attributes of
+all stations as one DataFrame.
+"""
+
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from logging import getLogger
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+from NDBC.fetch import get_session
+
+logger = getLogger(__name__)
+
+STATION_URL = "https://www.ndbc.noaa.gov/station_page.php?station={}"
+
+LAT_PAT = re.compile(r"\d+\.\d+\s+N")
+LON_PAT = re.compile(r"\d+\.\d+\s+W")
+ATTR_PAT = re.compile(r"<b>(.*):</b>\s*(.*)<br/>")
+
+# Only the metadata block of a station page is parsed into elements
+METADATA_BLOCK = SoupStrainer("div", id="stn_metadata")
+
+
+def parse_metadata_lines(lines: Iterable[str]) -> dict:
+    """Collect the position and attributes found in lines of a station page
+
+    Args:
+        lines (Iterable[str]): Lines of HTML
+
+    Returns:
+        dict: "lat" and "lon" (e.g. "36.785 N") and the attributes found
+    """
+    metadata = {}
+    for line in lines:
+        lat = LAT_PAT.search(line)
+        if lat:
+            metadata["lat"] = lat.group()
+        lon = LON_PAT.search(line)
+        if lon:
+            metadata["lon"] = lon.group()
+        attr = ATTR_PAT.search(line)
+        if attr:
+            k, v = attr.groups()
+            metadata[k] = v
+    return metadata
+
+
+def parse_station_page(content) -> dict:
+    """Return the station metadata found in the HTML of a station page
+
+    Args:
+        content (Union[str, bytes]): HTML of the station page
+
+    Returns:
+        dict: Position and attributes of the station
+    """
+    soup = BeautifulSoup(content, "html.parser", parse_only=METADATA_BLOCK)
+    meta_div = soup.find("div", id="stn_metadata")
+    if not meta_div:
+        raise ValueError("Station metadata not found")
+    station_metadata = None
+    # The paragraph holding the position and attributes is the one used
+    for el in meta_div.find_all("p"):
+        metadata = parse_metadata_lines(str(el).split("\n"))
+        if "lat" in metadata and "lon" in metadata and len(metadata) > 2:
+            station_metadata = metadata
+    return station_metadata if station_metadata is not None else {}
+
+
+def metadata_frame(metadata: Dict[str, dict]) -> pd.DataFrame:
+    """Return the metadata of many stations as one DataFrame
+
+    Args:
+        metadata (Dict[str, dict]): Metadata of each station
+
+    Returns:
+        DataFrame: One row per station indexed by station ID, with a column
+        per attribute.  Attributes a station does not report are missing.
+    """
+    frame = pd.DataFrame.from_dict(metadata, orient="index")
+    frame.index.name = "station_id"
+    return frame
+
+
+class StationMetadata:
+    """Fetch, cache and tabulate the metadata of many stations
+
+    Args:
+        cache (MetadataCache, optional): Persistent cache of parsed metadata
+        session (requests.Session, optional): Session to use. Defaults to the shared session.
+        max_workers (int, optional): Pages downloaded at once. Defaults to 8.
+        url (str, optional): Station page URL template. Defaults to STATION_URL.
+    """
+
+    def __init__(
+        self,
+        cache=None,
+        session=None,
+        max_workers: int = 8,
+        url: str = STATION_URL,
+    ) -> None:
+        self.cache = cache
+        self.session = session
+        self.max_workers = max_workers
+        self.url = url
+        self.errors: Dict[str, str] = {}
+
+    def get(self, station_id: str) -> dict:
+        """
+        Return the metadata of a station, from the cache if it is fresh
+
+        Args:
+            station_id (str): Station identifier
+
+        Returns:
+            dict: Position and attributes of the station
+        """
+        station_id = str(station_id).lower()
+        if self.cache is not None:
+            info = self.cache.get(station_id)
+            if info is not None:
+                return info
+        session = self.session if self.session is not None else get_session()
+        response = session.get(self.url.format(station_id))
+        response.raise_for_status()
+        info = parse_station_page(response.content)
+        if self.cache is not None:
+            self.cache.put(station_id, info)
+        return info
+
+    def __get(self, station_id: str) -> Optional[dict]:
+        try:
+            return self.get(station_id)
+        except Exception as e:
+            self.errors[station_id] = f"{type(e).__name__}: {e}"
+            return None
+
+    def get_many(self, station_ids: Iterable[str]) -> Dict[str, dict]:
+        """
+        Return the metadata of many stations, fetching pages concurrently
+
+        Stations whose page could not be fetched or parsed are left out and
+        recorded in `errors`.
+
+        Args:
+            station_ids (Iterable[str]): Station identifiers
+
+        Returns:
+            Dict[str, dict]: Metadata of each station
+        """
+        station_ids = list(dict.fromkeys(str(s).lower() for s in station_ids))
+        self.errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(self.__get, station_ids))
+        for station_id, error in self.errors.items():
+            logger.warning(f"Metadata for station {station_id} failed: {error}")
+        return {s: info for s, info in zip(station_ids, results) if info is not None}
+
+    def frame(self, station_ids: Iterable[str]) -> pd.DataFrame:
+        """
+        Return the metadata of many stations as one DataFrame
+
+        Args:
+            station_ids (Iterable[str]): Station identifiers
+
+        Returns:
+            DataFrame: One row of station attributes per station, see `metadata_frame`
+        """
+        return metadata_frame(self.get_many(station_ids))
@@ -0,0 +1,128 @@
+"""Vectorized detection and replacement of NDBC missing-data flags
+
+NDBC text files mark missing measurements by filling a field with nines at the
+full width of the field (e.g. 99.0, 999, 9999.0), or with the literal string
+"MM" in the realtime feeds.  The sentinel for a given column of a historical
+file is determined once from the column maximum and then masked with a single
+NumPy comparison.
+
+Realtime files mark most missing values with "MM", so a column may hold no
+flag at all and its maximum is a valid reading (e.g. a wind speed of 9.6).
+Their flags are instead looked up by column in `FIXED_SENTINELS`.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from NDBC.spectral import SPECTRAL_PACKAGES
+
+# String tokens NDBC uses for missing values.  These are best handled at
+# parse time by passing them to `pandas.read_csv` as `na_values`.
+MISSING_TOKENS = ["MM"]
+
+# Bad data flag of each column, used where flags cannot be inferred from the
+# data (realtime files)
+FIXED_SENTINELS = {
+    "WDIR": 999,
+    "WD": 999,
+    "WSPD": 99,
+    "GST": 99,
+    "GDR": 999,
+    "GTIME": 9999,
+    "WVHT": 99,
+    "DPD": 99,
+    "APD": 99,
+    "MWD": 999,
+    "PRES": 9999,
+    "BAR": 9999,
+    "ATMP": 999,
+    "WTMP": 999,
+    "DEWP": 999,
+    "VIS": 99,
+    "TIDE": 99,
+}
+# Flag of every frequency column of the spectral packages
+SPECTRAL_SENTINEL = 999
+
+
+def sentinel_values(
+    df: pd.DataFrame, columns: Optional[Iterable[str]] = None
+) -> Dict[str, int]:
+    """Find the bad data flag for each column
+
+    The flag is the number made up entirely of nines with as many digits as the
+    integer part of the column maximum, so a column with a maximum of 999.0
+    uses 999 as its flag while a column with a maximum of 1021.3 uses 9999.
+
+    Args:
+        df (DataFrame): Parsed NDBC data
+        columns (Iterable[str], optional): Columns to inspect. Defaults to all numeric columns.
+
+    Returns:
+        Dict[str, int]: Mapping of column name to flag value.  Columns without any
+        valid values are omitted.
+    """
+    columns = (
+        list(columns)
+        if columns is not None
+        else df.select_dtypes(include="number").columns.to_list()
+    )
+    sentinels = {}
+    for col, col_max in df[columns].max().items():
+        if pd.isna(col_max):
+            continue
+        n = len(str(int(col_max)))
+        sentinels[col] = 10**n - 1
+    return sentinels
+
+
+def fixed_sentinels(df: pd.DataFrame, data_type: str = "stdmet") -> Dict[str, int]:
+    """Look up the bad data flag of each column of a data package
+
+    Args:
+        df (DataFrame): Parsed NDBC data
+        data_type (str, optional): Data package of the data. Defaults to "stdmet".
+
+    Returns:
+        Dict[str, int]: Mapping of column name to flag value.  Columns without a
+        known flag are omitted.
+    """
+    numeric = df.select_dtypes(include="number").columns
+    if data_type in SPECTRAL_PACKAGES:
+        return {col: SPECTRAL_SENTINEL for col in numeric if col != "datetime"}
+    return {col: FIXED_SENTINELS[col] for col in numeric if col in FIXED_SENTINELS}
+
+
+def mask_sentinels(
+    df: pd.DataFrame,
+    columns: Optional[Iterable[str]] = None,
+    sentinels: Optional[Dict[str, int]] = None,
+) -> pd.DataFrame:
+    """Replace NDBC bad data flags with NaN
+
+    A value is flagged when its integer part equals the column sentinel, which
+    matches the element-wise rule previously applied to each cell.
+
+    Args:
+        df (DataFrame): Parsed NDBC data
+        columns (Iterable[str], optional): Columns to check. Defaults to all numeric columns.
+        sentinels (Dict[str, int], optional): Precomputed flags, see `sentinel_values`.
+
+    Returns:
+        DataFrame: The data with flagged values replaced by NaN.
+    """
+    if sentinels is None:
+        sentinels = sentinel_values(df, columns)
+    cols = list(sentinels.keys())
+    if not cols:
+        return df
+    values = df[cols].to_numpy(dtype="float64", na_value=np.nan)
+    flags = np.fromiter(sentinels.values(), dtype="float64", count=len(cols))
+    mask = np.trunc(values) == flags
+    flagged = mask.any(axis=0)
+    if flagged.any():
+        cols = [c for c, f in zip(cols, flagged) if f]
+        df[cols] = df[cols].mask(mask[:, flagged])
+    return df
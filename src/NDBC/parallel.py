@@ -0,0 +1,192 @@
+"""Parsing NDBC files in worker processes
+
+Parsing a file (read_csv, units, dtypes, timestamps and bad data flags) is CPU
+bound, so parsing many files on threads is limited by the GIL.
+`ProcessParser` runs `DataBuoy._parse_text` in a process pool instead.  Parsed
+frames are returned to the calling process by one of the TRANSPORTS.  The
+default, "shm", writes the frame to shared memory (see NDBC.shm) and sends
+only a small handle through the pool's pipe; the calling process maps the
+columns without copying.  "ipc" (an Arrow IPC stream, which needs the optional
+pyarrow dependency) and "pickle" send the whole frame through the pipe, so it
+is copied on both sides; they are kept for comparison, see
+benchmarks/bench_parse_workers.py.
+
+A `ProcessParser` has the signature of `DataBuoy._parse_text`, so it can be
+given to `DataBuoy._fetch_period` in place of the in-process parser.
+Downloads, caches and storage stay in the calling process.
+"""
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Tuple, Union
+
+import pandas as pd
+
+if TYPE_CHECKING:  # pragma: no cover
+    from NDBC.shm import SharedFrame
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+# Ways parsed frames are returned from worker processes
+TRANSPORTS = ["ipc", "shm", "pickle"]
+
+
+def to_ipc(dataframe: pd.DataFrame) -> bytes:
+    """Return a DataFrame, with its index and dtypes, as an Arrow IPC stream"""
+    table = pa.Table.from_pandas(dataframe, preserve_index=True)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def from_ipc(payload: bytes) -> pd.DataFrame:
+    """Return the DataFrame written to an Arrow IPC stream by `to_ipc`"""
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+
+def parse_text(
+    text: str,
+    datetime_index: bool = False,
+    data_type: str = "stdmet",
+    compact: bool = False,
+    columns=None,
+    transport: str = "shm",
+) -> Tuple[Union[bytes, "SharedFrame", pd.DataFrame], Union[dict, bool]]:
+    """Parse a file in a worker process, see DataBuoy._parse_text
+
+    Returns:
+        Tuple: The parsed data as an Arrow IPC stream, a SharedFrame or a
+        DataFrame, following `transport`, and the units of the file
+    """
+    from NDBC.NDBC import DataBuoy
+
+    data_df, units = DataBuoy._parse_text(
+        text, datetime_index, data_type, compact, columns
+    )
+    if transport == "ipc":
+        return to_ipc(data_df), units
+    if transport == "shm":
+        from NDBC.shm import SharedFrame
+
+        return SharedFrame.publish(data_df), units
+    return data_df, units
+
+
+def receive(data: Union[bytes, "SharedFrame", pd.DataFrame]) -> pd.DataFrame:
+    """Return the DataFrame sent by `parse_text` with any transport"""
+    if isinstance(data, bytes):
+        return from_ipc(data)
+    if not isinstance(data, pd.DataFrame):
+        return data.open()
+    return data
+
+
+def release(data: Union[bytes, "SharedFrame", pd.DataFrame]) -> None:
+    """Free the shared memory of data sent by `parse_text` that is not received"""
+    if isinstance(data, (bytes, pd.DataFrame)):
+        return
+    try:
+        data.unlink()
+    except FileNotFoundError:
+        # Already released by open
+        pass
+
+
+def discard(future: Future) -> None:
+    """Release the result of a `parse_text` future that will not be received
+
+    Frames published to shared memory by a worker are only freed when opened,
+    so a result nobody waits for anymore would otherwise stay in /dev/shm.
+    """
+    if future.cancelled() or future.exception() is not None:
+        return
+    release(future.result()[0])
+
+
+class ProcessParser:
+    """Parse NDBC files in a process pool
+
+    Use as a context manager, or call `close` when done, to shut down a pool
+    created by the parser.  A pool passed in is left running.
+
+    Args:
+        executor (Union[int, Executor], optional): Number of worker processes,
+            or a pool to use. Defaults to one process per CPU.
+        transport (str, optional): One of TRANSPORTS. Defaults to "shm".
+    """
+
+    def __init__(
+        self,
+        executor: Union[int, Executor, None] = None,
+        transport: str = "shm",
+    ) -> None:
+        if transport not in TRANSPORTS:
+            raise ValueError(
+                f"Unknown transport {transport}.  Please use one of the following: "
+                f'{", ".join(TRANSPORTS)}'
+            )
+        if transport == "ipc" and pa is None:
+            raise ImportError(
+                "Arrow IPC requires pyarrow, install it with `pip install NDBC[arrow]`"
+            )
+        self.transport = transport
+        self._owns_executor = not isinstance(executor, Executor)
+        self.executor = (
+            ProcessPoolExecutor(max_workers=executor)
+            if self._owns_executor
+            else executor
+        )
+
+    def __enter__(self) -> "ProcessParser":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def max_workers(self) -> int:
+        """Number of files parsed at once"""
+        return getattr(self.executor, "_max_workers", 1)
+
+    def close(self) -> None:
+        """Shut down the pool if it was created by this parser"""
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def __call__(
+        self,
+        text: str,
+        datetime_index: bool = False,
+        data_type: str = "stdmet",
+        compact: bool = False,
+        columns=None,
+    ) -> Tuple[pd.DataFrame, Union[dict, bool]]:
+        """
+        Parse a file in the pool, blocking until it is parsed
+
+        Returns:
+            Tuple: The parsed DataFrame and units, as from DataBuoy._parse_text
+        """
+        future = self.executor.submit(
+            parse_text,
+            text,
+            datetime_index,
+            data_type,
+            compact,
+            columns,
+            self.transport,
+        )
+        try:
+            data, units = future.result()
+        except BaseException:
+            # The worker may still finish after the caller stops waiting
+            future.add_done_callback(discard)
+            raise
+        try:
+            return receive(data), units
+        except BaseException:
+            release(data)
+            raise
@@ -0,0 +1,125 @@
+"""Readers for NDBC text data files
+
+NDBC realtime and historical files are whitespace delimited text with a header
+line of column names, optionally followed by a line of units prefixed with "#".
+The header is inspected before parsing so the remaining lines can be read in a
+single pass by the pandas C parser with data types and missing-value tokens
+applied as the values are read.
+"""
+
+import gzip
+import io
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from NDBC.fetch import get_session
+from NDBC.missing import MISSING_TOKENS
+
+# Date parts are always present and read as integers.  Every other column,
+# including whole numbers such as wind direction, may hold missing-value
+# tokens and is read as floating point so it parses in one pass.
+DATE_COLUMNS = ["YY", "YYYY", "MM", "DD", "hh", "mm"]
+
+
+def read_text(source) -> str:
+    """Return the contents of an NDBC text file
+
+    Args:
+        source: URL, local file path (optionally gzipped) or file-like object
+
+    Returns:
+        str: The text content of the file
+    """
+    if hasattr(source, "read"):
+        text = source.read()
+        return text.decode() if isinstance(text, bytes) else text
+    source = str(source)
+    if source.startswith(("http://", "https://")):
+        response = get_session().get(source)
+        response.raise_for_status()
+        return response.text
+    opener = gzip.open if source.endswith(".gz") else open
+    with opener(source, "rt") as f:
+        return f.read()
+
+
+def parse_header(text: str) -> Tuple[List[str], Union[Dict[str, str], bool], int]:
+    """Identify column names and units from the top of an NDBC text file
+
+    Args:
+        text (str): File contents
+
+    Returns:
+        Tuple[List[str], Union[Dict[str, str], bool], int]: Column names, the
+        units for each column (False if the file has no units line) and the
+        number of header lines to skip.
+    """
+    lines = text.split("\n", 2)
+    columns = [c.replace("#", "") for c in lines[0].split()]
+    units = False
+    if len(lines) > 1 and lines[1].startswith("#"):
+        units = dict(zip(columns, lines[1].split()))
+    return columns, units, 2 if units else 1
+
+
+def column_dtypes(columns: List[str]) -> Dict[str, str]:
+    """Return the parse-time data type of each column
+
+    Args:
+        columns (List[str]): Column names from the file header
+
+    Returns:
+        Dict[str, str]: Mapping of column name to dtype
+    """
+    return {c: "int32" if c in DATE_COLUMNS else "float64" for c in columns}
+
+
+def parse_ndbc_text(
+    text: str,
+    dtypes: Optional[Callable[[List[str]], Dict[str, str]]] = None,
+    columns: Optional[List[str]] = None,
+) -> Tuple[pd.DataFrame, Union[Dict[str, str], bool]]:
+    """Parse the contents of an NDBC text file into a DataFrame
+
+    Args:
+        text (str): File contents
+        dtypes (Callable, optional): Returns the dtype of each column given the
+            column names from the header. Defaults to `column_dtypes`.
+        columns (List[str], optional): Measurement columns to read, the date
+            parts are always read. Other columns are skipped by the parser.
+            Defaults to all columns.
+
+    Returns:
+        Tuple[DataFrame, Union[Dict[str, str], bool]]: Parsed data with typed
+        columns and the units dictionary (False if no units line was present).
+    """
+    names, units, skiprows = parse_header(text)
+    dtype_map = (dtypes or column_dtypes)(names)
+    read_kws = {
+        "sep": r"\s+",
+        "header": None,
+        "names": names,
+        "skiprows": skiprows,
+        "na_values": MISSING_TOKENS,
+    }
+    if columns is not None:
+        keep = [c for c in names if c in DATE_COLUMNS or c in columns]
+        dtype_map = {c: dtype_map[c] for c in keep}
+        read_kws["usecols"] = keep
+    data = pd.read_csv(io.StringIO(text), dtype=dtype_map, **read_kws)
+    return data, units
+
+
+def read_ndbc_text(source) -> Tuple[pd.DataFrame, Union[Dict[str, str], bool]]:
+    """Read and parse an NDBC text file into a DataFrame
+
+    Args:
+        source: URL, local file path or file-like object
+
+    Returns:
+        Tuple[DataFrame, Union[Dict[str, str], bool]]: Parsed data with typed
+        columns and the units dictionary (False if no units line was present).
+    """
+    return parse_ndbc_text(read_text(source))
@@ -0,0 +1,207 @@
+"""Access to the NDBC realtime files
+
+NDBC publishes the last 45 days of observations for each station in realtime
+files, listed newest first.  Updating data that is already held only needs the
+rows recorded since its last timestamp, which are at the top of the file, so
+the file is read from the start with HTTP Range requests, growing the range
+until it reaches a row that is already held.  Servers that ignore the Range
+header return the whole file.
+
+Rows are read with a generator that yields them newest first and stops at the
+first row already held, so the cost of polling a station depends on the
+amount of new data rather than the size of the file.  Realtime spectral files
+list each value followed by its frequency in parentheses; these rows are
+rewritten in the layout of the historical files, with one column per
+frequency, so all realtime files are parsed by the usual pipeline.  When rows
+list different frequencies, for example after an instrument change, the
+columns are the union of their frequencies and each row has "MM" for the
+frequencies it does not report.
+"""
+
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import pandas as pd
+import requests
+
+from NDBC.fetch import get_session
+
+REALTIME_URL = "https://www.ndbc.noaa.gov/data/realtime2/{station}{extension}"
+
+# File extension of the realtime file for each data package
+REALTIME_EXTENSIONS = {
+    "stdmet": ".txt",
+    "cwind": ".cwind",
+    "swden": ".data_spec",
+    "swdir": ".swdir",
+    "swdir2": ".swdir2",
+    "swr1": ".swr1",
+    "swr2": ".swr2",
+    "srad": ".srad",
+}
+
+# Packages whose realtime files pair each value with its frequency
+PAIRED_PACKAGES = ["swden", "swdir", "swdir2", "swr1", "swr2"]
+
+# Bytes requested by the first Range request, about 100 rows of stdmet data
+RANGE_CHUNK = 16384
+
+DATE_HEADER = "#YY  MM DD hh mm"
+
+
+def realtime_url(station_id: str, data_type: str = "stdmet", url: str = None) -> str:
+    """Return the location of the realtime file of a station's data package
+
+    Args:
+        station_id (str): Station identifier
+        data_type (str, optional): Data package. Defaults to "stdmet".
+        url (str, optional): URL template. Defaults to REALTIME_URL.
+
+    Returns:
+        str: URL of the realtime file
+    """
+    if data_type not in REALTIME_EXTENSIONS:
+        raise ValueError(
+            f"No realtime file for data type {data_type}.  Please use one of the "
+            f'following: {", ".join(REALTIME_EXTENSIONS.keys())}'
+        )
+    return (url or REALTIME_URL).format(
+        station=station_id.upper(), extension=REALTIME_EXTENSIONS[data_type]
+    )
+
+
+def row_time(fields: List[str]) -> datetime:
+    """Return the timestamp of the fields of a realtime file row"""
+    year, month, day, hour, minute = fields[:5]
+    return datetime(int(year), int(month), int(day), int(hour), int(minute))
+
+
+def iter_rows(lines: Iterable[str], since=None) -> Iterator[Tuple[datetime, List[str]]]:
+    """Yield the rows of a realtime file newest first
+
+    Args:
+        lines (Iterable[str]): Lines of a realtime file, newest rows first
+        since (optional): Timestamp already held. Iteration stops at the first
+            row at or before it. Defaults to None, which yields every row.
+
+    Yields:
+        Tuple[datetime, List[str]]: Timestamp and fields of each row
+    """
+    since = pd.Timestamp(since).to_pydatetime() if since is not None else None
+    for line in lines:
+        if line.startswith("#") or not line.strip():
+            continue
+        fields = line.split()
+        time = row_time(fields)
+        if since is not None and time <= since:
+            return
+        yield time, fields
+
+
+def frequency_label(frequency: str) -> str:
+    """Return the historical file column name of a frequency, e.g. ".0330" """
+    return f"{float(frequency):.4f}".lstrip("0")
+
+
+def paired_values(fields: List[str], data_type: str) -> Tuple[List[str], List[str]]:
+    """Split a realtime spectral row into its values and frequencies
+
+    Args:
+        fields (List[str]): Fields of the row, starting with the date parts
+        data_type (str): Data package of the file
+
+    Returns:
+        Tuple[List[str], List[str]]: Values and the frequency of each value
+    """
+    pairs = fields[5:]
+    if data_type == "swden":
+        # Spectral density rows start with the swell / wind wave separation frequency
+        pairs = pairs[1:]
+    return pairs[::2], [f.strip("()") for f in pairs[1::2]]
+
+
+def to_ndbc_text(lines: List[str], data_type: str = "stdmet", since=None) -> str:
+    """Rewrite the new rows of a realtime file in the layout of historical files
+
+    Args:
+        lines (List[str]): Lines of a realtime file, newest rows first
+        data_type (str, optional): Data package of the file. Defaults to "stdmet".
+        since (optional): Timestamp already held, only later rows are kept
+
+    Returns:
+        str: Header and rows newest first, or an empty string if there are no new rows
+    """
+    rows = iter_rows(lines, since)
+    if data_type not in PAIRED_PACKAGES:
+        body = [" ".join(fields) for _, fields in rows]
+        header = [line for line in lines[:2] if line.startswith("#")]
+    else:
+        paired = []
+        for _, fields in rows:
+            values, frequencies = paired_values(fields, data_type)
+            paired.append((fields[:5], values, tuple(frequencies)))
+        frequency_sets = {frequencies for _, _, frequencies in paired}
+        if len(frequency_sets) <= 1:
+            labels = [frequency_label(f) for f in next(iter(frequency_sets), ())]
+            body = [" ".join(date + values) for date, values, _ in paired]
+        else:
+            labels = sorted(
+                {frequency_label(f) for fs in frequency_sets for f in fs}, key=float
+            )
+            column = {label: i for i, label in enumerate(labels)}
+            body = []
+            for date, values, frequencies in paired:
+                cells = ["MM"] * len(labels)
+                for value, frequency in zip(values, frequencies):
+                    cells[column[frequency_label(frequency)]] = value
+                body.append(" ".join(date + cells))
+        header = [" ".join([DATE_HEADER] + labels)]
+    return "\n".join(header + body) + "\n" if body else ""
+
+
+def _file_size(response: requests.Response) -> Optional[int]:
+    content_range = response.headers.get("Content-Range", "")
+    total = content_range.rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+def fetch_since(
+    url: str,
+    since=None,
+    session: Optional[requests.Session] = None,
+    chunk_size: int = RANGE_CHUNK,
+) -> Optional[List[str]]:
+    """Download the top of a realtime file holding the rows after a timestamp
+
+    Args:
+        url (str): URL of the realtime file
+        since (optional): Last timestamp already held. Defaults to None, which
+            downloads the whole file.
+        session (requests.Session, optional): Session to use. Defaults to the shared session.
+        chunk_size (int, optional): Bytes requested by the first Range request,
+            doubled until the rows reach `since`.
+
+    Returns:
+        Optional[List[str]]: Complete lines downloaded, or None if the file is
+        not available
+    """
+    session = session if session is not None else get_session()
+    since = pd.Timestamp(since).to_pydatetime() if since is not None else None
+    size = chunk_size
+    while True:
+        headers = {"Range": f"bytes=0-{size - 1}"} if since is not None else {}
+        response = session.get(url, headers=headers)
+        if response.status_code not in (200, 206):
+            return None
+        lines = response.text.split("\n")
+        total = _file_size(response)
+        if response.status_code == 200 or (total is not None and size >= total):
+            return lines
+        # The range ends part way through a row
+        lines = lines[:-1]
+        oldest = next(
+            (line for line in reversed(lines) if line.strip() and line[0] != "#"), None
+        )
+        if oldest is not None and row_time(oldest.split()) <= since:
+            return lines
+        size *= 2
@@ -3,10 +3,17 @@
 Defining the mapping between our data storage format(s) and domain models
 """
 
-from ctypes import Union
+import io
 import json
+import os
+
+from typing import Union
+
 import pandas as pd
+
 from NDBC.NDBC import DataBuoy
+from NDBC.repository.storage import LazyFrame, StorageBackend, get_backend
+from NDBC.rollup import Rollup
 
 # the top level property where observation data is stored
 OBSERVATIONS_KEY = "obsv"
@@ -16,15 +23,39 @@ DATA_KEY = "data"
 META_KEY = "meta"
 # The default file string to be written
 DEFAULT_FILE_STRING = "data_buoy_{station_id}.json"
+# The default directory written by the binary storage backends
+DEFAULT_ARCHIVE_STRING = "data_buoy_{station_id}"
+# The file within an archive directory holding station information
+SIDECAR_FILE = "station.json"
+# The key identifying the rollups of each data package in an archive sidecar
+ROLLUPS_KEY = "rollups"
 
 
 class BuoyORM:
     """Mapping of data buoy data to file system data
 
     This ORM abstracts the methods of serializing DataBuoy
-    classes to JSON and writing them to disk.
+    classes and writing them to disk.  The default "json" backend writes a
+    single JSON file.  The binary backends ("parquet", "feather", "hdf5") write
+    an archive directory holding one columnar file per data package and a small
+    JSON sidecar with the station information and package metadata.
+
+    Args:
+        backend (Union[str, StorageBackend], optional): Storage backend. Defaults to "json".
     """
 
+    def __init__(self, backend: Union[str, StorageBackend] = "json") -> None:
+        self.backend = backend if backend == "json" else get_backend(backend)
+
+    @staticmethod
+    def buoy_attributes(db: DataBuoy) -> dict:
+        """Return the DataBuoy attributes other than data and runtime helpers"""
+        return {
+            k: v
+            for k, v in db.__dict__.items()
+            if k != DATA_KEY and k not in db.RUNTIME_ATTRS
+        }
+
     def serialize_dataframe(
         self, dataframe: pd.DataFrame, orient: str, date_format: str
     ) -> dict:
@@ -62,11 +93,13 @@ class BuoyORM:
         """
         buoy_data = {OBSERVATIONS_KEY: {}}
         for k, v in db.data.items():
+            buoy_data[OBSERVATIONS_KEY][k] = {
+                key: val for key, val in v.items() if key != DATA_KEY
+            }
             buoy_data[OBSERVATIONS_KEY][k][DATA_KEY] = self.serialize_dataframe(
-                db=v.pop(DATA_KEY), orient=orient, date_format=date_format
+                dataframe=db.read(k), orient=orient, date_format=date_format
             )
-            buoy_data[OBSERVATIONS_KEY][k].update(v)
-        buoy_data.update({k: v for k, v in db.__dict__.items() if k != DATA_KEY})
+        buoy_data.update(self.buoy_attributes(db))
         return json.dumps(buoy_data)
 
     def save_to_file(
@@ -78,7 +111,8 @@ class BuoyORM:
     ) -> None:
         """Save DataBuoy state to file
 
-        Write DataBuoy to `.json` file.
+        Write DataBuoy to a `.json` file, or to an archive directory when using
+        one of the binary storage backends.
 
         Args:
             db (DataBuoy): DataBuoy object
@@ -86,6 +120,8 @@ class BuoyORM:
             orient (str, optional): pandas DataFrame orientation to be used when converting to JSON. Defaults to "records".
             date_format (str, optional): Format used to convert datetime to strings. Defaults to "iso".
         """
+        if self.backend != "json":
+            return self.save_archive(db, filename)
         file_name = (
             filename
             if filename
@@ -95,27 +131,108 @@ class BuoyORM:
         with open(file_name, "w+") as f:
             f.write(buoy_str)
 
-    def load_from_file(self, filename):
-        """Instantiate a DataBuoy class from a JSON file
+    def save_archive(self, db: DataBuoy, path: Union[str, bool] = False) -> None:
+        """Save DataBuoy state to an archive directory
+
+        Each data package, and the aggregates of each tracked rollup, are
+        written with the storage backend.  Station information, package
+        metadata and the spans rolled up are written to a JSON sidecar.
+
+        Args:
+            db (DataBuoy): DataBuoy object
+            path (Union[str, bool], optional): Directory to write to.
+        """
+        backend = self.backend if self.backend != "json" else get_backend("parquet")
+        path = path if path else DEFAULT_ARCHIVE_STRING.format(station_id=db.station_id)
+        os.makedirs(path, exist_ok=True)
+        packages = {}
+        for k, v in db.data.items():
+            file_name = k + backend.extension
+            backend.write_frame(db.read(k), os.path.join(path, file_name))
+            packages[k] = {key: val for key, val in v.items() if key != DATA_KEY}
+            packages[k]["file"] = file_name
+        rollups = {}
+        for k, rollup in db.rollups.items():
+            rollups[k] = {**rollup.to_dict(), "files": {}}
+            for freq, frame in rollup.frames().items():
+                file_name = f"{k}_{freq}{backend.extension}"
+                backend.write_frame(frame, os.path.join(path, file_name))
+                rollups[k]["files"][freq] = file_name
+        sidecar = {
+            "format": backend.name,
+            "attributes": self.buoy_attributes(db),
+            OBSERVATIONS_KEY: packages,
+            ROLLUPS_KEY: rollups,
+        }
+        with open(os.path.join(path, SIDECAR_FILE), "w") as f:
+            json.dump(sidecar, f)
+
+    def load_archive(self, path: str, lazy: bool = False) -> DataBuoy:
+        """Instantiate a DataBuoy class from an archive directory
+
+        Args:
+            path (str): Directory written by `save_archive`
+            lazy (bool, optional): Defer reading each data package until it is
+                first accessed. Defaults to False.
 
-        Loads a
+        Returns:
+            DataBuoy: DataBuoy with all data packages loaded
+        """
+        with open(os.path.join(path, SIDECAR_FILE), "r") as f:
+            sidecar = json.load(f)
+        backend = (
+            self.backend
+            if self.backend != "json" and self.backend.name == sidecar["format"]
+            else get_backend(sidecar["format"])
+        )
+        db = DataBuoy()
+        for k, v in sidecar["attributes"].items():
+            setattr(db, k, v)
+        for data_type, pkg in sidecar[OBSERVATIONS_KEY].items():
+            entry = {key: val for key, val in pkg.items() if key != "file"}
+            lazy_frame = LazyFrame(backend, os.path.join(path, pkg["file"]))
+            entry[DATA_KEY] = lazy_frame if lazy else lazy_frame.load()
+            db.data[data_type] = entry
+        # Rollups are read when first queried, without reading the package
+        for data_type, info in sidecar.get(ROLLUPS_KEY, {}).items():
+            frames = {
+                freq: LazyFrame(backend, os.path.join(path, file_name))
+                for freq, file_name in info["files"].items()
+            }
+            db.rollups[data_type] = Rollup.from_dict(info, frames)
+        return db
+
+    def load_from_file(self, filename: str, lazy: bool = False) -> DataBuoy:
+        """Instantiate a DataBuoy class from a JSON file or archive directory
 
         Args:
-            filename (str): _description_
+            filename (str): JSON file written by `save_to_file` or archive
+                directory written by `save_archive`
+            lazy (bool, optional): Defer reading data packages from an archive
+                directory until they are first accessed. Defaults to False.
+
+        Returns:
+            DataBuoy: DataBuoy with all data packages loaded
         """
+        if os.path.isdir(filename):
+            return self.load_archive(filename, lazy=lazy)
         if not filename.endswith(".json"):
             raise ValueError(
                 "Incorrect file provided.  DataBuoy class can only be instantiated from JSON files"
             )
 
-        data_str = open(filename, "r").read()
-        data_obj = json.loads(data_str)
-        for data_type in data_obj.get(OBSERVATIONS_KEY, {}).keys():
-            orient = data_obj[OBSERVATIONS_KEY][data_type][META_KEY].get(
-                "orient", "records"
-            )
-            data_obj[OBSERVATIONS_KEY][data_type][DATA_KEY] = pd.read_json(
-                path_or_buf=data_obj[OBSERVATIONS_KEY][data_type][DATA_KEY],
-                orient=orient,
+        with open(filename, "r") as f:
+            data_obj = json.load(f)
+        db = DataBuoy()
+        for k, v in data_obj.items():
+            if k != OBSERVATIONS_KEY:
+                setattr(db, k, v)
+        for data_type, pkg in data_obj.get(OBSERVATIONS_KEY, {}).items():
+            serialized = pkg[DATA_KEY]
+            entry = {key: val for key, val in pkg.items() if key != DATA_KEY}
+            entry[DATA_KEY] = pd.read_json(
+                io.StringIO(serialized["data_json"]),
+                orient=serialized.get("orient", "records"),
             )
-        return data_obj
+            db.data[data_type] = entry
+        return db
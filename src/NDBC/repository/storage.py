@@ -0,0 +1,342 @@
+"""repository/storage.py
+
+Storage backends used by the ORM to write DataBuoy data packages to disk in
+binary columnar formats.  Each backend stores a single DataFrame per file and
+must round trip column dtypes and the index (including a DatetimeIndex) exactly.
+
+Backends can read a subset of columns and a time range from a file, which
+`LazyFrame` uses to defer reading a data package until it is needed.
+"""
+
+import os
+import warnings
+
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather, parquet
+except ImportError:  # pragma: no cover
+    pa = None
+
+try:
+    from tables import NaturalNameWarning
+except ImportError:  # pragma: no cover
+    NaturalNameWarning = Warning
+
+
+class StorageBackend(ABC):
+    """Base class for DataFrame storage backends
+
+    Subclasses define the file extension and how a DataFrame is written and read.
+    """
+
+    name = ""
+    extension = ""
+
+    @abstractmethod
+    def write_frame(self, dataframe: pd.DataFrame, path: str) -> None:
+        """Write a DataFrame, with its index and dtypes, to a file"""
+
+    @abstractmethod
+    def read_frame(
+        self,
+        path: str,
+        columns: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """Read a DataFrame, optionally limited to columns and a time range
+
+        Args:
+            path (str): File written by `write_frame`
+            columns (List[str], optional): Columns to read. Defaults to all columns.
+            start (optional): Earliest timestamp to include
+            end (optional): Latest timestamp to include
+
+        Returns:
+            DataFrame: The stored data
+        """
+
+
+def time_slice(dataframe: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Limit a DataFrame to a time range using its datetime index or column"""
+    if start is None and end is None:
+        return dataframe
+    times = (
+        dataframe.index
+        if isinstance(dataframe.index, pd.DatetimeIndex)
+        else pd.DatetimeIndex(dataframe["datetime"])
+    )
+    mask = np.ones(len(times), dtype=bool)
+    if start is not None:
+        mask &= times >= pd.Timestamp(start)
+    if end is not None:
+        mask &= times <= pd.Timestamp(end)
+    return dataframe[mask]
+
+
+class ArrowBackend(StorageBackend):
+    """Shared behaviour of the backends built on pyarrow"""
+
+    def __init__(self) -> None:
+        if pa is None:
+            raise ImportError(
+                f"The {self.name} backend requires pyarrow, "
+                "install it with `pip install NDBC[arrow]`"
+            )
+
+    @staticmethod
+    def to_table(dataframe: pd.DataFrame) -> "pa.Table":
+        # The pandas schema metadata stored with the table restores the index
+        # and any pandas specific dtypes when read back.
+        return pa.Table.from_pandas(dataframe, preserve_index=True)
+
+    @staticmethod
+    def time_column(schema: "pa.Schema") -> Optional[str]:
+        """Return the name of the stored timestamp index or datetime column"""
+        index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+        for name in [c for c in index_columns if isinstance(c, str)] + ["datetime"]:
+            if name in schema.names and pa.types.is_timestamp(schema.field(name).type):
+                return name
+        return None
+
+    def projection(
+        self, schema: "pa.Schema", columns: Optional[List[str]]
+    ) -> Optional[List[str]]:
+        """Return the stored columns needed to read `columns` with their index"""
+        if columns is None:
+            return None
+        index_columns = (schema.pandas_metadata or {}).get("index_columns", [])
+        keep = [c for c in index_columns if isinstance(c, str)]
+        keep += [c for c in [self.time_column(schema)] if c and c not in keep]
+        # Keep the stored column order so results match an in-memory selection
+        return [c for c in schema.names if c in keep or c in columns]
+
+    def filter_table(self, table: "pa.Table", start=None, end=None) -> "pa.Table":
+        """Limit an Arrow table to a time range, decoding only the time column"""
+        time_col = self.time_column(table.schema)
+        if time_col is None or (start is None and end is None):
+            return table
+        times = table.column(time_col).to_numpy()
+        mask = np.ones(len(times), dtype=bool)
+        if start is not None:
+            mask &= times >= pd.Timestamp(start).to_datetime64()
+        if end is not None:
+            mask &= times <= pd.Timestamp(end).to_datetime64()
+        return table.filter(pa.array(mask))
+
+
+class ParquetBackend(ArrowBackend):
+    """Store DataFrames as compressed Parquet files"""
+
+    name = "parquet"
+    extension = ".parquet"
+
+    def __init__(self, compression: str = "snappy") -> None:
+        super().__init__()
+        self.compression = compression
+
+    def write_frame(self, dataframe: pd.DataFrame, path: str) -> None:
+        parquet.write_table(
+            self.to_table(dataframe), path, compression=self.compression
+        )
+
+    def read_frame(
+        self,
+        path: str,
+        columns: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        schema = parquet.read_schema(path)
+        time_col = self.time_column(schema)
+        # Filters let row groups outside the time range be skipped entirely
+        filters = []
+        if time_col and start is not None:
+            filters.append((time_col, ">=", pd.Timestamp(start).to_pydatetime()))
+        if time_col and end is not None:
+            filters.append((time_col, "<=", pd.Timestamp(end).to_pydatetime()))
+        table = parquet.read_table(
+            path, columns=self.projection(schema, columns), filters=filters or None
+        )
+        return table.to_pandas()
+
+
+class FeatherBackend(ArrowBackend):
+    """Store DataFrames as Arrow Feather (IPC) files"""
+
+    name = "feather"
+    extension = ".feather"
+
+    def __init__(self, compression: str = "uncompressed") -> None:
+        # Uncompressed files are memory mapped and read without decoding
+        super().__init__()
+        self.compression = compression
+
+    def write_frame(self, dataframe: pd.DataFrame, path: str) -> None:
+        feather.write_feather(
+            self.to_table(dataframe), path, compression=self.compression
+        )
+
+    def read_frame(
+        self,
+        path: str,
+        columns: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        table = feather.read_table(path, memory_map=True)
+        if columns is not None:
+            table = table.select(self.projection(table.schema, columns))
+        return self.filter_table(table, start, end).to_pandas()
+
+
+class HDF5Backend(StorageBackend):
+    """Store DataFrames in HDF5 files using PyTables"""
+
+    name = "hdf5"
+    extension = ".h5"
+    key = "data"
+
+    def __init__(self, complevel: int = 5) -> None:
+        try:
+            import tables  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "The hdf5 backend requires PyTables, "
+                "install it with `pip install NDBC[hdf5]`"
+            )
+        self.complevel = complevel
+
+    def write_frame(self, dataframe: pd.DataFrame, path: str) -> None:
+        # Every column is a data column so reads can be queried on the time
+        # column.  Spectral bin names such as ".0200" are not valid PyTables
+        # attribute names, which only matters for attribute access.
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=NaturalNameWarning)
+            dataframe.to_hdf(
+                path,
+                key=self.key,
+                mode="w",
+                format="table",
+                data_columns=True,
+                complevel=self.complevel,
+            )
+
+    def read_frame(
+        self,
+        path: str,
+        columns: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        with pd.HDFStore(path, mode="r") as store:
+            storer = store.get_storer(self.key)
+            stored = storer.non_index_axes[0][1]
+            if "datetime" in stored:
+                time_col = "datetime"
+            elif storer.index_axes[0].kind == "datetime64":
+                time_col = "index"
+            else:
+                time_col = None
+            # Rows outside the time range are skipped by PyTables
+            queryable = time_col == "index" or time_col in (storer.data_columns or [])
+            where = []
+            if queryable and start is not None:
+                where.append(f"{time_col} >= {pd.Timestamp(start)!r}")
+            if queryable and end is not None:
+                where.append(f"{time_col} <= {pd.Timestamp(end)!r}")
+            keep = (
+                None
+                if columns is None
+                else [c for c in stored if c in columns or c == "datetime"]
+            )
+            dataframe = store.select(
+                self.key, where=" & ".join(where) or None, columns=keep
+            )
+        # Files written without data columns are sliced after reading
+        return dataframe if queryable else time_slice(dataframe, start, end)
+
+
+BACKENDS = {
+    backend.name: backend for backend in [ParquetBackend, FeatherBackend, HDF5Backend]
+}
+
+
+def get_backend(backend) -> StorageBackend:
+    """Return a storage backend instance
+
+    Args:
+        backend (Union[str, StorageBackend]): Backend name or instance
+
+    Returns:
+        StorageBackend: The storage backend
+    """
+    if isinstance(backend, StorageBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown storage backend {backend}.  Please use one of the "
+            f'following: {", ".join(BACKENDS.keys())}'
+        )
+    return BACKENDS[backend]()
+
+
+class LazyFrame:
+    """A data package stored on disk that is read when first needed
+
+    Args:
+        backend (StorageBackend): Backend the file was written with
+        path (str): Location of the file
+    """
+
+    def __init__(self, backend: StorageBackend, path: str) -> None:
+        self.backend = backend
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"LazyFrame({self.backend.name}: {self.path})"
+
+    def load(
+        self, columns: Optional[List[str]] = None, start=None, end=None
+    ) -> pd.DataFrame:
+        """Read the data package, optionally limited to columns and a time range"""
+        return self.backend.read_frame(self.path, columns=columns, start=start, end=end)
+
+
+class ChunkSink:
+    """Write each chunk of a streamed download to its own file
+
+    Pass as the `sink` of `DataBuoy.iter_data` to store periods on disk as
+    they are parsed.  Each chunk is written to `<path>/<station>/<data type>/<period>`
+    with the extension of the backend.
+
+    Args:
+        path (str): Directory to write to
+        backend (Union[str, StorageBackend], optional): Storage backend. Defaults to "parquet".
+    """
+
+    def __init__(self, path: str, backend="parquet") -> None:
+        self.path = path
+        self.backend = get_backend(backend)
+        self.files: List[str] = []
+
+    def __repr__(self) -> str:
+        return f"ChunkSink({self.backend.name}: {self.path})"
+
+    def __call__(self, key: str, dataframe: pd.DataFrame) -> str:
+        """Write a chunk, returning the location of the file"""
+        file_path = os.path.join(self.path, *key.split("/")) + self.backend.extension
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self.backend.write_frame(dataframe, file_path)
+        self.files.append(file_path)
+        return file_path
+
+    def frames(self) -> List[LazyFrame]:
+        """Return the chunks written, to be read when needed"""
+        return [LazyFrame(self.backend, file_path) for file_path in self.files]
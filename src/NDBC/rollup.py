@@ -0,0 +1,415 @@
+"""Precomputed hourly, daily and monthly aggregates of a data package
+
+A `Rollup` holds, for each frequency, the sum, count, minimum and maximum of
+every column over each period (bucket), e.g. each day.  These combine across
+chunks of data: sums and counts add, minima and maxima take the extreme.  The
+rollup is therefore updated as each period of raw data is loaded, and means,
+minima, maxima and counts are read from the buckets without touching the raw
+rows.  Bad data flags are masked to NaN when data is parsed, so counts are the
+number of valid observations.
+
+Chunks are first aggregated to the finest frequency, and the coarser
+frequencies are aggregated from those partial results.  The finest aggregates
+of each chunk are kept as a `Part`, with the time span and columns it covers.
+A later chunk covering the whole span of a part replaces the part's columns
+it holds, so a period loaded again, e.g. with corrected values, is not counted
+twice.  Rows of a chunk within the span of a part it does not cover are
+skipped for the part's columns, so columns not rolled up before, e.g. after a
+load of selected columns, are still added.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from NDBC.frames import frame_times
+
+# Frequencies of the stored aggregates, mapped to their pandas offset alias
+FREQUENCIES = {"hour": "H", "day": "D", "month": "MS"}
+# Statistics stored for each bucket, and how partial results combine
+STORED_STATS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+STATS = ["mean", "min", "max", "count", "sum"]
+
+
+def buckets(times: pd.DatetimeIndex, freq: str) -> pd.DatetimeIndex:
+    """Return the start of the bucket holding each timestamp"""
+    if freq == "month":
+        return times.to_period("M").to_timestamp()
+    return times.floor(FREQUENCIES[freq])
+
+
+def aggregate(values: pd.DataFrame, keys: pd.DatetimeIndex) -> Dict[str, pd.DataFrame]:
+    """Return the sum, count, min and max of each column for each key
+
+    Args:
+        values (DataFrame): float64 observations, NaN where missing
+        keys (DatetimeIndex): Bucket of each row
+
+    Returns:
+        Dict[str, DataFrame]: The stored statistics indexed by bucket
+    """
+    grouped = values.groupby(keys.rename("datetime"), sort=True)
+    return {
+        "sum": grouped.sum(min_count=0),
+        "count": grouped.count().astype("float64"),
+        "min": grouped.min(),
+        "max": grouped.max(),
+    }
+
+
+def combine(
+    existing: Dict[str, pd.DataFrame], partial: Dict[str, pd.DataFrame]
+) -> Dict[str, pd.DataFrame]:
+    """Combine the stored statistics of two sets of buckets
+
+    Partial results that start after the existing buckets, as when periods
+    are loaded in time order, are appended.  Otherwise buckets found in both
+    are combined with the rule of each statistic.
+    """
+    last = existing["sum"].index.max()
+    first = partial["sum"].index.min()
+    combined = {}
+    for stat, how in STORED_STATS.items():
+        frames = [existing[stat], partial[stat]]
+        stacked = pd.concat(frames)
+        if pd.isna(last) or first > last:
+            combined[stat] = stacked
+        else:
+            combined[stat] = getattr(stacked.groupby(level=0, sort=True), how)()
+    if combined["count"].isna().any(axis=None):
+        # Columns first seen in later chunks have no earlier observations
+        combined["sum"] = combined["sum"].fillna(0.0)
+        combined["count"] = combined["count"].fillna(0.0)
+    return combined
+
+
+def merge_stats(parts: List[Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    """Combine the stored statistics of any number of sets of buckets"""
+    merged = {}
+    for stat, how in STORED_STATS.items():
+        stacked = pd.concat([part[stat] for part in parts])
+        merged[stat] = getattr(stacked.groupby(level=0, sort=True), how)()
+    merged["sum"] = merged["sum"].fillna(0.0)
+    merged["count"] = merged["count"].fillna(0.0)
+    return merged
+
+
+def coarsen(stats: Dict[str, pd.DataFrame], freq: str) -> Dict[str, pd.DataFrame]:
+    """Aggregate stored statistics to a coarser frequency"""
+    keys = buckets(stats["sum"].index, freq).rename("datetime")
+    return {
+        stat: getattr(stats[stat].groupby(keys, sort=True), how)()
+        for stat, how in STORED_STATS.items()
+    }
+
+
+def merge_spans(
+    spans: List[Tuple[pd.Timestamp, pd.Timestamp]]
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return time spans sorted, with overlapping spans merged"""
+    spans = sorted(spans)
+    merged = spans[:1]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def flatten(stats: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Return stored statistics as one frame with "<column>_<stat>" columns"""
+    frame = pd.concat(stats, axis=1)
+    frame.columns = [f"{col}_{stat}" for stat, col in frame.columns]
+    return frame
+
+
+def unflatten(frame: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Split a frame written by `flatten` into its stored statistics"""
+    stats = {}
+    for stat in STORED_STATS:
+        cols = [c for c in frame.columns if c.rsplit("_", 1)[-1] == stat]
+        stats[stat] = frame[cols].rename(columns=lambda c: c.rsplit("_", 1)[0])
+    return stats
+
+
+@dataclass
+class Part:
+    """Finest aggregates of one chunk of data
+
+    Attributes:
+        start (Timestamp): Earliest timestamp of the chunk
+        end (Timestamp): Latest timestamp of the chunk
+        columns (List[str]): Columns aggregated
+        stats (Dict[str, DataFrame], optional): The stored statistics, None
+            while they are held in an archive not yet read
+    """
+
+    start: pd.Timestamp
+    end: pd.Timestamp
+    columns: List[str]
+    stats: Optional[Dict[str, pd.DataFrame]] = None
+
+    def drop(self, columns: List[str]) -> None:
+        """Remove columns, when a later chunk replaces them"""
+        self.columns = [c for c in self.columns if c not in columns]
+        self.stats = {k: v[self.columns] for k, v in self.stats.items()}
+
+
+class Rollup:
+    """Aggregates of a data package, updated as periods are loaded
+
+    Args:
+        frequencies (Iterable[str], optional): Frequencies to keep, from
+            FREQUENCIES. Defaults to all.
+    """
+
+    def __init__(self, frequencies: Optional[Iterable[str]] = None) -> None:
+        frequencies = list(FREQUENCIES) if frequencies is None else list(frequencies)
+        for freq in frequencies:
+            if freq not in FREQUENCIES:
+                raise ValueError(
+                    f"Unknown frequency {freq}.  Please use one of the following: "
+                    f'{", ".join(FREQUENCIES)}'
+                )
+        # Finest first, so coarser frequencies aggregate its partial results
+        self.frequencies = [f for f in FREQUENCIES if f in frequencies]
+        # Stored statistics of each frequency, or a LazyFrame not yet read
+        self.aggregates: Dict[str, object] = {}
+        self.parts: List[Part] = []
+        # Finest aggregates of the parts as stored by `frames`, a DataFrame or
+        # LazyFrame not yet split into the parts
+        self._stored_parts = None
+
+    def __repr__(self) -> str:
+        return f"Rollup({', '.join(self.frequencies)}; {len(self.parts)} parts)"
+
+    @property
+    def spans(self) -> Dict[str, List[Tuple[pd.Timestamp, pd.Timestamp]]]:
+        """Time spans rolled up for each column"""
+        spans = {}
+        for part in self.parts:
+            for col in part.columns:
+                spans.setdefault(col, []).append((part.start, part.end))
+        return {col: merge_spans(col_spans) for col, col_spans in spans.items()}
+
+    def __held(self, times: pd.DatetimeIndex, columns: List[str]) -> np.ndarray:
+        """Return a (row, column) mask of the values within spans rolled up"""
+        held = np.zeros((len(times), len(columns)), dtype=bool)
+        spans = self.spans
+        for i, col in enumerate(columns):
+            if col not in spans:
+                continue
+            starts = pd.DatetimeIndex([s for s, _ in spans[col]]).asi8
+            ends = pd.DatetimeIndex([e for _, e in spans[col]]).asi8
+            # Spans are sorted and disjoint, so only the last starting at or
+            # before a timestamp can hold it
+            span = np.searchsorted(starts, times.asi8, side="right") - 1
+            held[:, i] = (span >= 0) & (times.asi8 <= ends[np.maximum(span, 0)])
+        return held
+
+    def __load_parts(self) -> None:
+        """Read the finest aggregates of the parts if stored lazily"""
+        if self._stored_parts is None:
+            return
+        frame = self._stored_parts
+        if not isinstance(frame, pd.DataFrame):
+            frame = frame.load()
+        self._stored_parts = None
+        for i, part in enumerate(self.parts):
+            stats = unflatten(frame[frame["part"] == i].drop(columns="part"))
+            part.stats = {k: v[part.columns] for k, v in stats.items()}
+
+    def __stats(self, freq: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Return the stored statistics of a frequency, reading them if stored lazily"""
+        stats = self.aggregates.get(freq)
+        if stats is not None and not isinstance(stats, dict):
+            stats = unflatten(stats.load())
+            self.aggregates[freq] = stats
+        return stats
+
+    def __rebuild(self) -> None:
+        """Recompute the aggregates of every frequency from the parts"""
+        self.aggregates = {}
+        if not self.parts:
+            return
+        partial = None
+        for freq in self.frequencies:
+            if partial is None:
+                partial = merge_stats([part.stats for part in self.parts])
+            else:
+                partial = coarsen(partial, freq)
+            self.aggregates[freq] = partial
+
+    def update(self, dataframe: pd.DataFrame) -> int:
+        """
+        Add a chunk of data to the aggregates
+
+        Parts whose whole span the chunk covers are replaced by it for the
+        columns it holds.  Values within the span of any other part are
+        skipped for that part's columns.
+
+        Args:
+            dataframe (DataFrame): Data with a datetime index or column
+
+        Returns:
+            int: Number of rows added, those with any value not skipped
+        """
+        times = frame_times(dataframe)
+        if times is None:
+            raise ValueError("Data has no datetime index or column")
+        times = pd.DatetimeIndex(times)
+        if not len(times):
+            return 0
+        columns = [
+            c
+            for c in dataframe.select_dtypes(include="number").columns
+            if c != "datetime"
+        ]
+        start, end = times.min(), times.max()
+        self.__load_parts()
+        replaced = False
+        for part in self.parts:
+            covered = [c for c in part.columns if c in columns]
+            if covered and start <= part.start and part.end <= end:
+                part.drop(covered)
+                replaced = True
+        self.parts = [part for part in self.parts if part.columns]
+        held = self.__held(times, columns)
+        new = ~held.all(axis=1)
+        if new.any():
+            values = dataframe[columns].to_numpy(
+                dtype="float64", na_value=np.nan, copy=True
+            )
+            values[held] = np.nan
+            added = [c for c, h in zip(columns, held.all(axis=0)) if not h]
+            values = pd.DataFrame(values[new], columns=columns)[added]
+            finest = aggregate(values, buckets(times[new], self.frequencies[0]))
+            self.parts.append(Part(start, end, added, finest))
+        if replaced:
+            self.__rebuild()
+        elif new.any():
+            partial = None
+            for freq in self.frequencies:
+                partial = finest if partial is None else coarsen(partial, freq)
+                existing = self.__stats(freq)
+                self.aggregates[freq] = (
+                    partial if existing is None else combine(existing, partial)
+                )
+        return int(new.sum())
+
+    def query(
+        self,
+        freq: str = "day",
+        stats: Iterable[str] = ("mean",),
+        columns: Optional[List[str]] = None,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        Return aggregates of the data rolled up
+
+        Args:
+            freq (str, optional): One of the frequencies kept. Defaults to "day".
+            stats (Iterable[str], optional): Statistics from STATS. Defaults to ("mean",).
+            columns (List[str], optional): Columns to return. Defaults to all.
+            start (optional): Earliest bucket to include
+            end (optional): Latest bucket to include
+
+        Returns:
+            DataFrame: One row per bucket with data, indexed by the bucket start,
+            with (column, statistic) column labels as from `DataFrame.agg`
+        """
+        if freq not in self.frequencies:
+            raise ValueError(
+                f"Frequency {freq} is not rolled up.  Please use one of the "
+                f'following: {", ".join(self.frequencies)}'
+            )
+        stats = list(stats)
+        for stat in stats:
+            if stat not in STATS:
+                raise ValueError(
+                    f"Unknown statistic {stat}.  Please use one of the following: "
+                    f'{", ".join(STATS)}'
+                )
+        stored = self.__stats(freq)
+        if stored is None:
+            return pd.DataFrame()
+        columns = stored["sum"].columns if columns is None else columns
+        stored = {k: v.loc[start:end, columns] for k, v in stored.items()}
+        results = {}
+        for stat in stats:
+            if stat == "mean":
+                results[stat] = stored["sum"] / stored["count"].where(
+                    stored["count"] > 0
+                )
+            elif stat == "count":
+                results[stat] = stored["count"].astype("int64")
+            else:
+                results[stat] = stored[stat]
+        frame = pd.concat(results, axis=1).swaplevel(axis=1)
+        return frame[pd.MultiIndex.from_product([columns, stats])]
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """
+        Return the aggregates of each frequency as a frame, see `flatten`, and
+        the finest aggregates of the parts as a frame keyed "parts", with the
+        position of each row's part in a "part" column
+        """
+        frames = {
+            freq: flatten(self.__stats(freq))
+            for freq in self.frequencies
+            if freq in self.aggregates
+        }
+        self.__load_parts()
+        if self.parts:
+            frames["parts"] = pd.concat(
+                [
+                    flatten(part.stats).assign(part=i)
+                    for i, part in enumerate(self.parts)
+                ]
+            )
+        return frames
+
+    def to_dict(self) -> dict:
+        """Return the frequencies and parts rolled up, for a JSON sidecar"""
+        return {
+            "frequencies": self.frequencies,
+            "parts": [
+                {
+                    "start": part.start.isoformat(),
+                    "end": part.end.isoformat(),
+                    "columns": part.columns,
+                }
+                for part in self.parts
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, info: dict, frames: Dict[str, object]) -> "Rollup":
+        """
+        Restore a rollup from `to_dict` and its stored aggregates
+
+        Args:
+            info (dict): Output of `to_dict`
+            frames (Dict[str, object]): DataFrame, or LazyFrame read when
+                first needed, of the aggregates of each frequency and of the
+                parts, see `frames`
+
+        Returns:
+            Rollup: The restored rollup
+        """
+        rollup = cls(info["frequencies"])
+        rollup.parts = [
+            Part(pd.Timestamp(p["start"]), pd.Timestamp(p["end"]), p["columns"])
+            for p in info["parts"]
+        ]
+        frames = dict(frames)
+        rollup._stored_parts = frames.pop("parts", None)
+        for freq, frame in frames.items():
+            rollup.aggregates[freq] = (
+                unflatten(frame) if isinstance(frame, pd.DataFrame) else frame
+            )
+        return rollup
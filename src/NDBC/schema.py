@@ -0,0 +1,104 @@
+"""Compact column data types for NDBC data packages
+
+By default measured values are parsed as float64.  float32 uses half the
+memory but is not exact: it keeps about 7 significant digits, a relative error
+below 6e-8, so 1015.2 is stored as 1015.2000122.  NDBC reports values with at
+most 6 significant digits (e.g. 1015.2 hPa, 0.115 m2/Hz), so a compact value
+is within 1e-4 of the float64 one and rounding it to the decimals printed in
+the file gives back the printed value, which the tests check.  Spectral
+packages, with around 47 frequency bin columns per row, benefit the most.  The registry below lists, for each data
+package in `DataBuoy.DATA_PACKAGES`, the columns holding whole numbers that are
+stored as nullable small integers instead.
+
+Compact data is produced in two steps.  `parse_dtypes` gives the types used
+while reading a file, with date parts as small unsigned integers and every
+other column as float32 so missing-data flags can still be masked with NaN.
+`compact_frame` then converts the integer columns of the cleaned data.
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+# Date parts are dropped once the datetime has been built
+DATE_DTYPES = {
+    "YY": "uint16",
+    "YYYY": "uint16",
+    "MM": "uint8",
+    "DD": "uint8",
+    "hh": "uint8",
+    "mm": "uint8",
+}
+MEASURED_DTYPE = "float32"
+INTEGER_DTYPE = "Int16"
+
+# Whole number columns for each data package, stored as INTEGER_DTYPE
+PACKAGE_SCHEMAS = {
+    "stdmet": {"integers": ["WDIR", "WD", "MWD"]},
+    "cwind": {"integers": ["WDIR", "GDR", "GTIME"]},
+    "swden": {"integers": []},
+    "swdir": {"integers": []},
+    "swdir2": {"integers": []},
+    "swr1": {"integers": []},
+    "swr2": {"integers": []},
+    "srad": {"integers": []},
+}
+
+
+def package_schema(data_type: str) -> dict:
+    """Return the schema registered for a data package
+
+    Args:
+        data_type (str): Data package name, see `DataBuoy.DATA_PACKAGES`
+
+    Returns:
+        dict: The package schema
+    """
+    if data_type not in PACKAGE_SCHEMAS:
+        raise ValueError(
+            f"No schema for data package {data_type}.  Please use one of the "
+            f'following: {", ".join(PACKAGE_SCHEMAS.keys())}'
+        )
+    return PACKAGE_SCHEMAS[data_type]
+
+
+def parse_dtypes(data_type: str, columns: List[str]) -> Dict[str, str]:
+    """Return the compact parse-time data type of each column
+
+    Args:
+        data_type (str): Data package name
+        columns (List[str]): Column names from the file header
+
+    Returns:
+        Dict[str, str]: Mapping of column name to dtype
+    """
+    package_schema(data_type)
+    return {c: DATE_DTYPES.get(c, MEASURED_DTYPE) for c in columns}
+
+
+def compact_frame(dataframe: pd.DataFrame, data_type: str) -> pd.DataFrame:
+    """Convert cleaned data to the compact data types of its package
+
+    Args:
+        dataframe (DataFrame): Data with date parts removed and flags masked
+        data_type (str): Data package name
+
+    Returns:
+        DataFrame: The data with compact column types
+    """
+    integers = package_schema(data_type)["integers"]
+    dtypes = {}
+    for col, dtype in dataframe.dtypes.items():
+        if col in integers:
+            dtypes[col] = INTEGER_DTYPE
+        elif pd.api.types.is_float_dtype(dtype) and dtype != MEASURED_DTYPE:
+            dtypes[col] = MEASURED_DTYPE
+    for col in [c for c, d in dtypes.items() if d == INTEGER_DTYPE]:
+        if pd.api.types.is_float_dtype(dataframe[col].dtype):
+            dataframe[col] = dataframe[col].round()
+    return dataframe.astype(dtypes) if dtypes else dataframe
+
+
+def memory_usage(dataframe: pd.DataFrame) -> int:
+    """Return the bytes held by a DataFrame, including its index"""
+    return int(dataframe.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,251 @@
+"""Handing parsed frames between processes through shared memory
+
+`SharedFrame.publish` copies a DataFrame once into a block of
+`multiprocessing.shared_memory` and returns a small, picklable handle
+describing where each column lies in the block.  Any process on the same
+machine, such as the parent of a pool worker or a sibling, maps the block with
+`SharedFrame.open` and gets a DataFrame whose columns are views of the shared
+memory: nothing is pickled or copied when the frame changes hands.
+
+The columns of each NumPy dtype are stored together, one after another, and
+nullable integer and boolean columns (as made by `compact`) as their values
+and mask.  The mapped frame is built from views of each column with the public
+DataFrame constructor and `copy=False`.  The index must be a DatetimeIndex or
+the default RangeIndex.
+
+The block is owned by the handle once published.  Opening it with
+`unlink=True` (the default) releases the name.  The views hold the block
+open, so it is unmapped, and its memory freed, once no array uses it.  A
+handle that is never opened must be released with `unlink`;
+`NDBC.parallel.ProcessParser` does so for worker results it does not receive.
+"""
+
+import os
+
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Byte alignment of each array within a block
+ALIGNMENT = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class _Mapping:
+    """Array interface of a shared memory block, referencing the block
+
+    NumPy does not keep the buffer of a block exported, so the block could be
+    closed, and its memory unmapped, while arrays still view it.  Arrays
+    built from a mapping have it as their base, so the block stays open until
+    the last of them is collected.
+    """
+
+    def __init__(self, block: shared_memory.SharedMemory) -> None:
+        self.block = block
+        address = np.frombuffer(block.buf, np.uint8).__array_interface__["data"][0]
+        self.__array_interface__ = {
+            "shape": (block.size,),
+            "typestr": "|u1",
+            "data": (address, False),
+            "version": 3,
+        }
+
+
+def _map(block: shared_memory.SharedMemory) -> np.ndarray:
+    """Return the bytes of a block as an array that holds the block open"""
+    return np.asarray(_Mapping(block))
+
+
+def _untrack(block: shared_memory.SharedMemory) -> None:
+    """Stop this process's resource tracker from unlinking a block at exit
+
+    Blocks are registered with the tracker when created or mapped, so a
+    process handing a block on, or mapping one it does not own, unregisters it.
+    """
+    if os.name != "nt":
+        resource_tracker.unregister(
+            getattr(block, "_name", block.name), "shared_memory"
+        )
+
+
+def _is_masked(dtype) -> bool:
+    """Return whether a dtype is a nullable dtype such as Int16 or boolean"""
+    return (
+        isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        and getattr(dtype, "numpy_dtype", None) is not None
+        and dtype.kind in "biuf"
+    )
+
+
+@dataclass
+class SharedFrame:
+    """Handle of a DataFrame held in shared memory
+
+    Attributes:
+        name (str): Name of the shared memory block
+        length (int): Number of rows
+        arrays (List[dict]): Columns, dtype, kind and byte offsets of each
+            stored array
+        index (Optional[dict]): Name and byte offset of a stored DatetimeIndex,
+            None for the default RangeIndex
+        columns (List): Column order of the frame
+    """
+
+    name: str
+    length: int
+    arrays: List[dict] = field(default_factory=list)
+    index: Optional[dict] = None
+    columns: List = field(default_factory=list)
+
+    @classmethod
+    def publish(cls, dataframe: pd.DataFrame) -> "SharedFrame":
+        """
+        Copy a DataFrame into a new shared memory block
+
+        Args:
+            dataframe (DataFrame): Data with a DatetimeIndex or RangeIndex and
+                numeric, boolean, datetime or nullable integer columns
+
+        Returns:
+            SharedFrame: Handle of the block, to be opened in another process
+        """
+        length = len(dataframe)
+        index, offset = None, 0
+        if isinstance(dataframe.index, pd.DatetimeIndex):
+            if dataframe.index.tz is not None:
+                raise ValueError("Timezone aware indexes cannot be shared")
+            index = {"name": dataframe.index.name, "offset": 0}
+            offset = _aligned(length * 8)
+        elif not dataframe.index.equals(pd.RangeIndex(length)):
+            raise ValueError("Only a DatetimeIndex or the default index can be shared")
+        # One array per NumPy dtype holding all its columns, as pandas holds
+        # a consolidated frame, and one per nullable column
+        arrays, blocks = [], {}
+        for position, (col, dtype) in enumerate(dataframe.dtypes.items()):
+            if _is_masked(dtype):
+                arrays.append(
+                    {"dtype": dtype.name, "kind": "masked", "positions": [position]}
+                )
+            elif isinstance(dtype, np.dtype) and dtype.kind in "biufmM":
+                if dtype.str not in blocks:
+                    blocks[dtype.str] = {
+                        "dtype": dtype.str,
+                        "kind": "block",
+                        "positions": [],
+                    }
+                    arrays.append(blocks[dtype.str])
+                blocks[dtype.str]["positions"].append(position)
+            else:
+                raise ValueError(f"Column {col} of dtype {dtype} cannot be shared")
+        for array in arrays:
+            array["offset"] = offset
+            if array["kind"] == "masked":
+                dtype = pd.api.types.pandas_dtype(array["dtype"]).numpy_dtype
+                array["mask_offset"] = _aligned(offset + length * dtype.itemsize)
+                offset = _aligned(array["mask_offset"] + length)
+            else:
+                size = (
+                    len(array["positions"]) * length * np.dtype(array["dtype"]).itemsize
+                )
+                offset = _aligned(offset + size)
+        block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        handle = cls(block.name, length, arrays, index, list(dataframe.columns))
+        try:
+            handle.__write(_map(block), dataframe)
+        except BaseException:
+            block.unlink()
+            raise
+        _untrack(block)
+        return handle
+
+    def __views(self, buffer: np.ndarray) -> dict:
+        """Return NumPy views of the index and arrays stored in a block"""
+        views = {"arrays": []}
+        if self.index is not None:
+            views["index"] = np.ndarray(
+                (self.length,), "datetime64[ns]", buffer, self.index["offset"]
+            )
+        for array in self.arrays:
+            if array["kind"] == "masked":
+                dtype = pd.api.types.pandas_dtype(array["dtype"])
+                values = np.ndarray(
+                    (self.length,), dtype.numpy_dtype, buffer, array["offset"]
+                )
+                mask = np.ndarray(
+                    (self.length,), np.bool_, buffer, array["mask_offset"]
+                )
+                views["arrays"].append((values, mask))
+            else:
+                shape = (len(array["positions"]), self.length)
+                views["arrays"].append(
+                    np.ndarray(shape, array["dtype"], buffer, array["offset"])
+                )
+        return views
+
+    def __write(self, buffer: np.ndarray, dataframe: pd.DataFrame):
+        """Copy the index and columns of a DataFrame into a block"""
+        views = self.__views(buffer)
+        if self.index is not None:
+            views["index"][:] = dataframe.index.values
+        for array, view in zip(self.arrays, views["arrays"]):
+            if array["kind"] == "masked":
+                values, mask = view
+                column = dataframe.iloc[:, array["positions"][0]].array
+                mask[:] = column.isna()
+                values[:] = column.to_numpy(values.dtype, na_value=0)
+            else:
+                view[:] = dataframe.iloc[:, array["positions"]].to_numpy().T
+
+    def open(self, unlink: bool = True) -> pd.DataFrame:
+        """
+        Map the shared frame into this process without copying it
+
+        The columns of the frame are views of the shared memory, so changes
+        to them are seen by every process that maps the block.
+
+        Args:
+            unlink (bool, optional): Release the block's name, so it is freed
+                once the frame is no longer referenced. Defaults to True.  Use
+                False to map the block in several processes, then call `unlink`.
+
+        Returns:
+            DataFrame: The shared data
+        """
+        block = shared_memory.SharedMemory(self.name)
+        views = self.__views(_map(block))
+        columns = {}
+        for array, view in zip(self.arrays, views["arrays"]):
+            if array["kind"] == "masked":
+                dtype = pd.api.types.pandas_dtype(array["dtype"])
+                columns[array["positions"][0]] = dtype.construct_array_type()(
+                    *view, copy=False
+                )
+            else:
+                columns.update(zip(array["positions"], view))
+        index = (
+            pd.DatetimeIndex(views["index"], name=self.index["name"])
+            if self.index is not None
+            else pd.RangeIndex(self.length)
+        )
+        # Columns are keyed by position, as column names may repeat
+        frame = pd.DataFrame(
+            {p: columns[p] for p in range(len(self.columns))}, index=index, copy=False
+        )
+        frame.columns = pd.Index(self.columns)
+        if unlink:
+            block.unlink()
+        else:
+            _untrack(block)
+        return frame
+
+    def unlink(self) -> None:
+        """Release a block that was not opened with unlink=True"""
+        block = shared_memory.SharedMemory(self.name)
+        block.unlink()
+        block.close()
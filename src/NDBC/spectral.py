@@ -0,0 +1,180 @@
+"""Spectral wave data as (time, frequency) arrays
+
+The spectral wave packages (`swden`, `swdir`, `swdir2`, `swr1`, `swr2`) are
+stored by DataBuoy as wide DataFrames with one column per frequency bin, named
+by the frequency (e.g. ".0200").  `SpectralData` holds the same values as a
+contiguous float32 array of shape (time, frequency) with the frequencies parsed
+once into a float axis, so spectra can be combined with NumPy operations.
+
+`align_spectra` puts several packages on shared time and frequency axes, and
+`to_dataset` returns them as an xarray Dataset.  xarray is an optional
+dependency.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xarray as xr
+except ImportError:  # pragma: no cover
+    xr = None
+
+SPECTRAL_PACKAGES = ["swden", "swdir", "swdir2", "swr1", "swr2"]
+SPECTRAL_DTYPE = np.float32
+
+
+def frequency_columns(columns: Iterable[str]) -> Dict[str, float]:
+    """Return the columns named by a frequency, mapped to the frequency in Hz"""
+    frequencies = {}
+    for col in columns:
+        try:
+            frequencies[col] = float(col)
+        except (TypeError, ValueError):
+            continue
+    return frequencies
+
+
+@dataclass
+class SpectralData:
+    """Spectral wave data for one data package
+
+    Attributes:
+        data_type (str): Data package the values belong to
+        times (DatetimeIndex): Observation times, one per row of values
+        frequencies (ndarray): Frequency bins in Hz, one per column of values
+        values (ndarray): float32 array of shape (time, frequency)
+        units (Union[dict, bool]): Units of the package, False if not known
+    """
+
+    data_type: str
+    times: pd.DatetimeIndex
+    frequencies: np.ndarray
+    values: np.ndarray
+    units: Union[dict, bool] = False
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @classmethod
+    def from_frame(
+        cls, dataframe: pd.DataFrame, data_type: str, units: Union[dict, bool] = False
+    ) -> "SpectralData":
+        """Build spectral data from a wide DataFrame held by DataBuoy
+
+        Args:
+            dataframe (DataFrame): Package data with the datetime as index or column
+            data_type (str): Data package name
+            units (Union[dict, bool], optional): Package units. Defaults to False.
+
+        Returns:
+            SpectralData: The values as a (time, frequency) array
+        """
+        if isinstance(dataframe.index, pd.DatetimeIndex):
+            times = dataframe.index
+        else:
+            times = pd.DatetimeIndex(dataframe["datetime"])
+        bins = frequency_columns(dataframe.columns)
+        order = sorted(bins, key=bins.get)
+        values = dataframe[order].to_numpy(dtype=SPECTRAL_DTYPE, na_value=np.nan)
+        return cls(
+            data_type=data_type,
+            times=pd.DatetimeIndex(times, name=None),
+            frequencies=np.array([bins[c] for c in order], dtype=SPECTRAL_DTYPE),
+            values=np.ascontiguousarray(values),
+            units=units,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """Return the values as a DataFrame indexed by time with frequency columns"""
+        return pd.DataFrame(self.values, index=self.times, columns=self.frequencies)
+
+    def reindex(
+        self, times: pd.DatetimeIndex, frequencies: np.ndarray
+    ) -> "SpectralData":
+        """Return the values placed on new time and frequency axes
+
+        Times and frequencies not present in this package are filled with NaN.
+
+        Args:
+            times (DatetimeIndex): Target observation times
+            frequencies (ndarray): Target frequency bins
+
+        Returns:
+            SpectralData: The values on the new axes
+        """
+        rows = self.times.get_indexer(times)
+        cols = pd.Index(self.frequencies).get_indexer(frequencies)
+        values = np.full((len(times), len(frequencies)), np.nan, dtype=SPECTRAL_DTYPE)
+        found_rows, found_cols = rows >= 0, cols >= 0
+        values[np.ix_(found_rows, found_cols)] = self.values[
+            np.ix_(rows[found_rows], cols[found_cols])
+        ]
+        return SpectralData(
+            data_type=self.data_type,
+            times=times,
+            frequencies=np.asarray(frequencies, dtype=SPECTRAL_DTYPE),
+            values=values,
+            units=self.units,
+        )
+
+
+def align_spectra(
+    spectra: Dict[str, SpectralData], join: str = "outer"
+) -> Dict[str, SpectralData]:
+    """Place several spectral packages on shared time and frequency axes
+
+    Args:
+        spectra (Dict[str, SpectralData]): Spectral data keyed by package name
+        join (str, optional): "outer" keeps every time and frequency found in
+            any package, "inner" only those found in all. Defaults to "outer".
+
+    Returns:
+        Dict[str, SpectralData]: The packages on the shared axes
+    """
+    if join not in ["outer", "inner"]:
+        raise ValueError(f"Unknown join {join}.  Please use outer or inner")
+    if not spectra:
+        return {}
+    combine = "union" if join == "outer" else "intersection"
+    times = None
+    frequencies = None
+    for spectrum in spectra.values():
+        spec_times = spectrum.times.drop_duplicates()
+        spec_freqs = pd.Index(spectrum.frequencies)
+        times = spec_times if times is None else getattr(times, combine)(spec_times)
+        frequencies = (
+            spec_freqs
+            if frequencies is None
+            else getattr(frequencies, combine)(spec_freqs)
+        )
+    times = times.sort_values()
+    frequencies = np.sort(frequencies.to_numpy(dtype=SPECTRAL_DTYPE))
+    return {k: v.reindex(times, frequencies) for k, v in spectra.items()}
+
+
+def to_dataset(spectra: Dict[str, SpectralData], join: str = "outer") -> "xr.Dataset":
+    """Return spectral packages as an xarray Dataset on shared coordinates
+
+    Args:
+        spectra (Dict[str, SpectralData]): Spectral data keyed by package name
+        join (str, optional): How the axes are combined, see `align_spectra`.
+
+    Returns:
+        xr.Dataset: One (time, frequency) variable per package
+    """
+    if xr is None:
+        raise ImportError(
+            "Spectral datasets require xarray, install it with `pip install NDBC[xarray]`"
+        )
+    aligned = align_spectra(spectra, join=join)
+    first: Optional[SpectralData] = next(iter(aligned.values()), None)
+    coords = (
+        {"time": first.times, "frequency": first.frequencies}
+        if first is not None
+        else {}
+    )
+    data_vars = {k: (("time", "frequency"), v.values) for k, v in aligned.items()}
+    return xr.Dataset(data_vars=data_vars, coords=coords)
@@ -0,0 +1,120 @@
+"""Integrated wave parameters from spectral wave data
+
+Computes the standard bulk wave parameters for every observation time from the
+spectral packages, using NumPy reductions over the frequency axis:
+
+- Hm0: significant wave height, 4 * sqrt(m0)
+- Tp: peak period, the inverse of the frequency with the most energy
+- Tm01: mean period, m0 / m1
+- Tm02: zero-crossing period, sqrt(m0 / m2)
+- MeanDir: energy weighted mean direction the waves come from (requires swdir and swr1)
+- Spread: circular directional spread (requires swdir and swr1)
+
+where mn is the n-th spectral moment, the sum over frequency bins of
+S(f) * f**n * df.  The rows are processed in chunks, with the directional
+packages placed on the axes of each chunk as it is processed, so the temporary
+arrays are bounded by `chunk_size` rows regardless of the length of the record.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from NDBC.spectral import SpectralData
+
+PARAMETERS = ["Hm0", "Tp", "Tm01", "Tm02", "MeanDir", "Spread"]
+DEFAULT_CHUNK_SIZE = 8192
+
+
+def bandwidths(frequencies: np.ndarray) -> np.ndarray:
+    """Return the width of each frequency bin
+
+    Bin edges are placed halfway between neighbouring frequencies, with the
+    first and last bins as wide as their only neighbour gap.
+
+    Args:
+        frequencies (ndarray): Increasing bin centre frequencies in Hz
+
+    Returns:
+        ndarray: Bin widths in Hz
+    """
+    frequencies = np.asarray(frequencies, dtype="float64")
+    if len(frequencies) < 2:
+        return np.ones_like(frequencies)
+    edges = np.empty(len(frequencies) + 1)
+    edges[1:-1] = (frequencies[1:] + frequencies[:-1]) / 2
+    edges[0] = frequencies[0] - (edges[1] - frequencies[0])
+    edges[-1] = frequencies[-1] + (frequencies[-1] - edges[-2])
+    return np.diff(edges)
+
+
+def _chunk_parameters(
+    density: np.ndarray,
+    frequencies: np.ndarray,
+    df: np.ndarray,
+    alpha1: Optional[np.ndarray],
+    r1: Optional[np.ndarray],
+) -> np.ndarray:
+    """Compute the parameters for a block of rows, one column per parameter"""
+    density = density.astype("float64")
+    valid = ~np.isnan(density).all(axis=1)
+    energy = np.nan_to_num(density) * df
+    m0 = energy.sum(axis=1)
+    m1 = energy @ frequencies
+    m2 = energy @ frequencies**2
+    out = np.full((len(density), len(PARAMETERS)), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[:, 0] = 4 * np.sqrt(m0)
+        peak = np.argmax(np.nan_to_num(density, nan=-np.inf), axis=1)
+        out[:, 1] = 1 / frequencies[peak]
+        out[:, 2] = m0 / m1
+        out[:, 3] = np.sqrt(m0 / m2)
+        if alpha1 is not None and r1 is not None:
+            theta = np.deg2rad(alpha1.astype("float64"))
+            r1 = r1.astype("float64")
+            # Energy weighted first order Fourier coefficients
+            weight = np.where(np.isnan(theta) | np.isnan(r1), 0.0, energy)
+            a1 = np.nansum(weight * r1 * np.cos(theta), axis=1)
+            b1 = np.nansum(weight * r1 * np.sin(theta), axis=1)
+            total = weight.sum(axis=1)
+            a1, b1 = a1 / total, b1 / total
+            out[:, 4] = np.rad2deg(np.arctan2(b1, a1)) % 360
+            out[:, 5] = np.rad2deg(np.sqrt(2 * (1 - np.sqrt(a1**2 + b1**2))))
+    out[~valid] = np.nan
+    return out
+
+
+def wave_parameters(
+    density: SpectralData,
+    alpha1: Optional[SpectralData] = None,
+    r1: Optional[SpectralData] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Compute integrated wave parameters for every observation time
+
+    Args:
+        density (SpectralData): Spectral wave density (swden)
+        alpha1 (SpectralData, optional): Mean wave direction per frequency (swdir)
+        r1 (SpectralData, optional): First normalized polar coordinate (swr1)
+        chunk_size (int, optional): Rows processed at a time. Defaults to 8192.
+
+    Returns:
+        DataFrame: One row per observation time of density with the columns
+        in PARAMETERS.  MeanDir and Spread are NaN unless alpha1 and r1 are given.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    times, frequencies = density.times, density.frequencies
+    freqs = frequencies.astype("float64")
+    df = bandwidths(freqs)
+    result = np.empty((len(times), len(PARAMETERS)))
+    for start in range(0, len(times), chunk_size):
+        rows = slice(start, start + chunk_size)
+        # Directional packages are read on the axes of the density spectra
+        directional = [
+            None if s is None else s.reindex(times[rows], frequencies).values
+            for s in [alpha1, r1]
+        ]
+        result[rows] = _chunk_parameters(density.values[rows], freqs, df, *directional)
+    return pd.DataFrame(result, index=times, columns=PARAMETERS)
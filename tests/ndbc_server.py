@@ -0,0 +1,138 @@
+"""Local HTTP stand-in for the NDBC data server
+
+Serves NDBC formatted text files from memory with an optional per-request
+delay so fetching behaviour can be tested without network access.
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from NDBC.NDBC import DataBuoy
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def stdmet_year(year: int) -> str:
+    """Return the stdmet sample file re-dated to the given year"""
+    with open(os.path.join(DATA_DIR, "46042h2020.txt")) as f:
+        lines = f.read().splitlines(keepends=True)
+    return "".join(lines[:2] + [str(year) + line[4:] for line in lines[2:]])
+
+
+class NDBCStandIn:
+    """Threaded HTTP server serving a dictionary of paths to file contents
+
+    Args:
+        files (dict): Mapping of URL path to text content
+        delay (float, optional): Seconds to wait before answering each request.
+        ranges (bool, optional): Answer Range requests with partial content.
+    """
+
+    def __init__(self, files: dict, delay: float = 0.0, ranges: bool = True) -> None:
+        self.files = files
+        self.delay = delay
+        self.ranges = ranges
+        self.sent = 0
+        self.requests = []
+        self.connections = set()
+        # Requests being answered, and the most answered at the same time
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, send_body):
+                with stand_in.lock:
+                    stand_in.requests.append((self.command, self.path))
+                    stand_in.connections.add(self.client_address)
+                    stand_in.in_flight += 1
+                    stand_in.max_in_flight = max(
+                        stand_in.max_in_flight, stand_in.in_flight
+                    )
+                try:
+                    time.sleep(stand_in.delay)
+                finally:
+                    with stand_in.lock:
+                        stand_in.in_flight -= 1
+                body = stand_in.files.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                payload = body.encode()
+                etag = '"%s"' % hashlib.md5(payload).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                status, total = 200, len(payload)
+                byte_range = re.match(
+                    r"bytes=(\d+)-(\d*)", self.headers.get("Range", "")
+                )
+                if byte_range and stand_in.ranges:
+                    first = int(byte_range.group(1))
+                    last = int(byte_range.group(2) or total - 1)
+                    payload = payload[first : last + 1]
+                    status = 206
+                with stand_in.lock:
+                    stand_in.sent += len(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("ETag", etag)
+                if status == 206:
+                    self.send_header(
+                        "Content-Range",
+                        f"bytes {first}-{first + len(payload) - 1}/{total}",
+                    )
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(payload)
+
+            def do_HEAD(self):
+                self._respond(send_body=False)
+
+            def do_GET(self):
+                self._respond(send_body=True)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def redirect(self, db: DataBuoy) -> DataBuoy:
+        """Point the downloads of a buoy at the stand-in"""
+        db.data_yearurls = [
+            self.url + "/historical/{dtype}/{station}{url_char}{year}.txt"
+        ]
+        db.data_monthurls = [self.url + "/{dtype}/{month_abbrv}/{station}.txt"]
+        db.data_realtimeurl = self.url + "/data/realtime2/{station}{extension}"
+        db.STATION_URL = self.url + "/station_page.php?station={}"
+        db.BASE_URL = self.url + "/"
+        return db
+
+    def buoy(self, station_id: str = "46042", **kwargs) -> DataBuoy:
+        """Return a DataBuoy downloading from the stand-in"""
+        return self.redirect(DataBuoy(station_id, **kwargs))
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
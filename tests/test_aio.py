@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio client tests
+
+Verifying AsyncDataBuoy against a local stand-in for the NDBC server.
+"""
+import asyncio
+import shutil
+import tempfile
+import unittest
+
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from NDBC.aio import AsyncDataBuoy, aiohttp
+from NDBC.cache import HTTPCache
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+YEARS = [2016, 2017, 2018]
+DELAY = 0.2
+START, END = "2017-01-01 06:00", "2018-01-01 12:00"
+
+STATION_PAGE = """<html><body><div id="stn_metadata">
+<p><b>Owned and maintained by National Data Buoy Center</b><br/>
+<b>3-meter foam buoy</b><br/>
+36.785 N 122.398 W (36&#176;47'6" N 122&#176;23'53" W)<br/>
+<br/>
+<b>Site elevation:</b> sea level<br/>
+<b>Air temp height:</b> 3.7 m above site elevation<br/>
+<b>Water depth:</b> 1645 m<br/>
+</p></div></body></html>
+"""
+
+SEARCH_PAGE = """<html><body><pre>
+<a href="station_page.php?station=46042">46042</a> 36.785N 122.398W
+<a href="station_page.php?station=46114">46114</a> 36.700N 122.343W
+<a href="station_page.php?station=46239">46239</a> 36.335N 122.104W
+</pre></body></html>
+"""
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class AsyncDataBuoyTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year) for year in YEARS
+        }
+        files["/station_page.php?station=46042"] = STATION_PAGE
+        search = (
+            "/radial_search.php?lat1=36.785&lon1=-122.398&uom=M&dist=50&ot=B&time=1"
+        )
+        files[search] = SEARCH_PAGE
+        self.server = NDBCStandIn(files, delay=DELAY).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def client(self, session=None, executor=None, **kwargs) -> AsyncDataBuoy:
+        return AsyncDataBuoy(
+            buoy=self.server.buoy(**kwargs), session=session, executor=executor
+        )
+
+    async def test_get_data_concurrent(self):
+        async with self.client() as db:
+            with self.assertLogs("NDBC.aio", level="WARNING") as logs:
+                await db.get_data(years=YEARS + [2019], datetime_index=True)
+        # Requests for different years were answered at the same time
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertIn("Year 2019 not available.", logs.output[0])
+        self.assertEqual(len(db.buoy.stdmet), 3 * 48)
+        self.assertTrue(db.buoy.stdmet.index.is_monotonic_increasing)
+        self.assertIsNone(db._session)
+        self.assertIsNone(db.buoy.session)
+
+    async def test_matches_sync(self):
+        async with self.client() as db:
+            await db.get_data(years=YEARS, compact=True)
+        sync = self.server.buoy()
+        sync.get_data(years=YEARS, compact=True)
+        pd.testing.assert_frame_equal(db.buoy.stdmet, sync.stdmet)
+        self.assertEqual(db.buoy.data["stdmet"]["meta"], sync.data["stdmet"]["meta"])
+
+    async def test_process_pool_parsing(self):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            async with self.client(executor=pool) as db:
+                await db.get_data(years=YEARS, datetime_index=True)
+        self.assertEqual(len(db.buoy.stdmet), 3 * 48)
+
+    async def test_many_buoys_one_session(self):
+        async with aiohttp.ClientSession() as session:
+            buoys = [self.client(session=session) for _ in range(10)]
+            await asyncio.gather(*[db.get_data(years=YEARS) for db in buoys])
+            self.assertFalse(session.closed)
+        self.assertTrue(all(len(db.buoy.stdmet) == 3 * 48 for db in buoys))
+
+    async def test_station_metadata(self):
+        async with self.client() as db:
+            await db.get_station_metadata()
+        self.assertEqual(db.buoy.station_info["lat"], "36.785 N")
+        self.assertEqual(db.buoy.station_info["Water depth"], "1645 m")
+
+    async def test_station_search(self):
+        async with self.client() as db:
+            ids = await db.station_search(lat1=36.785, lon1=-122.398, distance=50)
+        self.assertEqual(ids, {"46114", "46239"})
+
+    async def test_window_and_columns(self):
+        async with self.client() as db:
+            await db.get_data(
+                start=START, end=END, columns=["WVHT", "DPD"], datetime_index=True
+            )
+        sync = self.server.buoy()
+        sync.get_data(
+            start=START, end=END, columns=["WVHT", "DPD"], datetime_index=True
+        )
+        self.assertEqual(db.buoy.stdmet.index[0], pd.Timestamp(START))
+        pd.testing.assert_frame_equal(db.buoy.stdmet, sync.stdmet)
+        with self.assertRaises(ValueError):
+            await db.get_data(years=YEARS, start=START)
+
+    async def test_max_workers(self):
+        async with self.client() as db:
+            await db.get_data(years=YEARS, max_workers=1)
+        self.assertEqual(self.server.max_in_flight, 1)
+        self.assertEqual(len(db.buoy.stdmet), 3 * 48)
+
+    async def test_http_cache(self):
+        cache = HTTPCache(self.tmp_dir)
+        for _ in range(2):
+            async with self.client(cache=cache) as db:
+                await db.get_data(years=YEARS, datetime_index=True)
+            self.assertEqual(len(db.buoy.stdmet), 3 * 48)
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(len(self.server.requests), 3)
+
+    async def test_realtime(self):
+        lines = stdmet_year(2020).splitlines(keepends=True)
+        # Realtime files list rows newest first
+        realtime = "".join(lines[:2] + lines[:1:-1])
+        self.server.files["/data/realtime2/46042.txt"] = realtime
+        async with self.client() as db:
+            await db.get_data(years=YEARS[:1], datetime_index=True)
+            self.assertEqual(len(await db.realtime(since="2020-01-01 23:00")), 1)
+
+    async def test_unknown_package(self):
+        async with self.client() as db:
+            with self.assertRaises(ValueError):
+                await db.get_data(years=YEARS, data_type="waves")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Alignment tests
+
+Verifying data packages recorded on different timestamps are joined on one
+time axis.
+"""
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.align import align_frames
+
+
+def package(start, periods, freq, columns, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq=freq, name="datetime")
+    return pd.DataFrame(
+        rng.uniform(0, 10, (periods, len(columns))), index=index, columns=columns
+    )
+
+
+class AlignFramesTests(TestCase):
+    def setUp(self) -> None:
+        # stdmet hourly at 50 past the hour, cwind every 10 minutes, srad hourly
+        self.frames = {
+            "stdmet": package("2020-01-01 00:50", 24, "H", ["WDIR", "WVHT"], 1),
+            "cwind": package("2020-01-01 00:00", 144, "10min", ["WDIR", "WSPD"], 2),
+            "srad": package("2020-01-01 00:00", 24, "H", ["SRAD1"], 3),
+        }
+
+    def test_exact(self):
+        aligned = align_frames(self.frames)
+        self.assertTrue(aligned.index.is_monotonic_increasing)
+        self.assertEqual(aligned.index.name, "datetime")
+        self.assertEqual(len(aligned), 144)
+        self.assertEqual(
+            aligned.columns.to_list(),
+            [
+                ("stdmet", "WDIR"),
+                ("stdmet", "WVHT"),
+                ("cwind", "WDIR"),
+                ("cwind", "WSPD"),
+                ("srad", "SRAD1"),
+            ],
+        )
+        for pkg, df in self.frames.items():
+            expected = df.reindex(aligned.index)
+            expected.columns = aligned[pkg].columns
+            pd.testing.assert_frame_equal(aligned[pkg], expected, check_names=False)
+
+    def test_tolerance_matches_merge_asof(self):
+        stdmet = self.frames["stdmet"]
+        for direction in ["nearest", "backward", "forward"]:
+            aligned = align_frames(
+                self.frames, on="srad", tolerance="15min", direction=direction
+            )
+            for pkg, col in [("stdmet", "WVHT"), ("cwind", "WSPD")]:
+                expected = pd.merge_asof(
+                    self.frames["srad"],
+                    self.frames[pkg],
+                    left_index=True,
+                    right_index=True,
+                    tolerance=pd.Timedelta("15min"),
+                    direction=direction,
+                )
+                np.testing.assert_array_equal(
+                    aligned[(pkg, col)].to_numpy(), expected[col].to_numpy()
+                )
+        nearest = align_frames(self.frames, on="srad", tolerance="15min")
+        self.assertTrue(np.isnan(nearest[("stdmet", "WVHT")].iloc[0]))
+        self.assertEqual(nearest[("stdmet", "WVHT")].iloc[1], stdmet["WVHT"].iloc[0])
+
+    def test_rule(self):
+        aligned = align_frames(self.frames, rule="H", tolerance="10min")
+        self.assertEqual(len(aligned), 24)
+        self.assertEqual(aligned.index.freq, "H")
+        self.assertEqual(aligned.index[0], pd.Timestamp("2020-01-01 00:00"))
+        np.testing.assert_array_equal(
+            aligned[("cwind", "WSPD")].to_numpy(),
+            self.frames["cwind"]["WSPD"].to_numpy()[::6],
+        )
+
+    def test_agg(self):
+        aligned = align_frames(self.frames, rule="H", agg="mean")
+        expected = self.frames["cwind"]["WSPD"].resample("H").mean()
+        np.testing.assert_allclose(
+            aligned[("cwind", "WSPD")].to_numpy(), expected.to_numpy()
+        )
+
+    def test_datetime_column_and_integers(self):
+        stdmet = self.frames["stdmet"].reset_index()
+        stdmet["WDIR"] = stdmet["WDIR"].round().astype("Int16")
+        aligned = align_frames({"stdmet": stdmet, "srad": self.frames["srad"]})
+        self.assertEqual(aligned[("stdmet", "WDIR")].dtype, "Int16")
+        self.assertTrue(aligned[("stdmet", "WDIR")].isna().iloc[0])
+        self.assertEqual(len(aligned), 48)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            align_frames(self.frames, direction="sideways")
+        with self.assertRaises(ValueError):
+            align_frames(self.frames, agg="mean")
+        with self.assertRaises(ValueError):
+            align_frames(self.frames, on="swden")
+
+    def test_databuoy(self):
+        db = DataBuoy("46042")
+        db.data = {pkg: {"data": df} for pkg, df in self.frames.items()}
+        aligned = db.align(["stdmet", "cwind"], on="stdmet", tolerance="10min")
+        self.assertEqual(aligned.index.to_list(), self.frames["stdmet"].index.to_list())
+        self.assertEqual(set(aligned.columns.get_level_values(0)), {"stdmet", "cwind"})
+        with self.assertRaises(LookupError):
+            db.align(["swden"])
+        with self.assertRaises(ValueError):
+            db.align(["waves"])
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP cache tests
+
+Verifying downloaded NDBC files are reused across runs, revalidated when they
+may have changed and evicted when the cache is full.
+"""
+import json
+import os
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from NDBC.cache import INDEX_FILE, HTTPCache
+from NDBC.NDBC import DataBuoy
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+
+class HTTPCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2016, 2017, 2018]
+        }
+        self.files["/stdmet/Jan/46042.txt"] = stdmet_year(2021)
+        self.server = NDBCStandIn(self.files).__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.cache_dir)
+
+    def test_historical_files_reused_across_runs(self):
+        first = self.server.buoy(cache=HTTPCache(self.cache_dir))
+        first.get_data(years=[2016, 2017, 2018])
+        self.assertEqual(len(self.server.requests), 3)
+        # A new cache instance reads the persisted index
+        cache = HTTPCache(self.cache_dir)
+        second = self.server.buoy(cache=cache)
+        second.get_data(years=[2016, 2017, 2018])
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(cache.stats()["hits"], 3)
+        self.assertEqual(cache.stats()["misses"], 0)
+        self.assertEqual(len(second.stdmet), len(first.stdmet))
+
+    def test_mutable_files_revalidated(self):
+        cache = HTTPCache(self.cache_dir, ttl=0)
+        db = self.server.buoy(cache=cache)
+        db.get_data(months=[1])
+        db.get_data(months=[1])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 1)
+        # The second request was conditional and answered with 304
+        self.assertEqual(len(self.server.requests), 2)
+        # Changed files are downloaded again
+        self.files["/stdmet/Jan/46042.txt"] = stdmet_year(2022)
+        db.get_data(months=[1])
+        self.assertEqual(cache.misses, 2)
+        self.assertIn(2022, set(db.stdmet["datetime"].dt.year))
+
+    def test_fresh_mutable_files_not_revalidated(self):
+        cache = HTTPCache(self.cache_dir, ttl=3600)
+        db = self.server.buoy(cache=cache)
+        db.get_data(months=[1])
+        db.get_data(months=[1])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_lru_eviction(self):
+        size = len(stdmet_year(2016))
+        cache = HTTPCache(self.cache_dir, max_bytes=2 * size)
+        db = self.server.buoy(cache=cache)
+        db.get_data(years=[2016])
+        db.get_data(years=[2017])
+        # Touch 2016 so 2017 becomes the least recently used entry
+        db.get_data(years=[2016])
+        db.get_data(years=[2018])
+        self.assertLessEqual(cache.size, 2 * size)
+        self.assertEqual(cache.stats()["entries"], 2)
+        requests_before = len(self.server.requests)
+        db.get_data(years=[2016])
+        self.assertEqual(len(self.server.requests), requests_before)
+        db.get_data(years=[2017])
+        self.assertEqual(len(self.server.requests), requests_before + 1)
+
+    def test_hits_flush_index_on_close(self):
+        with HTTPCache(self.cache_dir) as cache:
+            db = self.server.buoy(cache=cache)
+            db.get_data(years=[2016])
+            index = os.path.join(self.cache_dir, INDEX_FILE)
+            written = os.stat(index).st_mtime_ns
+            with open(index) as f:
+                accessed = json.load(f)["46042/stdmet/2016"]["accessed"]
+            db.get_data(years=[2016])
+            # Hits record access times in memory only
+            self.assertEqual(os.stat(index).st_mtime_ns, written)
+        with open(index) as f:
+            self.assertGreater(json.load(f)["46042/stdmet/2016"]["accessed"], accessed)
+
+    def test_save_excludes_cache(self):
+        db = DataBuoy("46042", cache=HTTPCache(self.cache_dir))
+        path = self.cache_dir + "/buoy.json"
+        db.save(path)
+        self.assertIsNone(DataBuoy.load(path).cache)
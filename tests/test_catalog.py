@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Station catalog tests
+
+Verifying offline station searches against a sample of the NDBC station table.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.catalog import EARTH_RADIUS, StationCatalog, parse_coordinate
+
+STATION_TABLE = """# STATION_ID | OWNER | TTYPE | HULL | NAME | PAYLOAD | LOCATION | TIMEZONE | FORECAST | NOTE
+# | | | | | | | | |
+46026|NDBC|Weather Buoy|3D|SAN FRANCISCO - 18NM West of San Francisco, CA|AMPS|37.755 N 122.839 W (37&#176;45'18" N 122&#176;50'20" W)| P|FZPN40|
+46042|NDBC|Weather Buoy|3D|MONTEREY - 27NM West of Monterey Bay, CA|AMPS|36.785 N 122.398 W (36&#176;47'6" N 122&#176;23'53" W)| P||
+46114|SC|Waverider Buoy||West Monterey Bay, CA||36.700 N 122.343 W (36&#176;42'0" N 122&#176;20'35" W)| P||
+46239|SC|Waverider Buoy||Point Sur, CA||36.335 N 122.104 W (36&#176;20'6" N 122&#176;6'14" W)| P||
+mlrf1|NDBC|C-MAN Station||Molasses Reef, FL|C-MAN|25.012 N 80.376 W (25&#176;0'43" N 80&#176;22'34" W)| E||
+55012|AU|Waverider Buoy||Coffs Harbour, Australia||30.360 S 153.270 E (30&#176;21'36" S 153&#176;16'12" E)| ||
+nobody|XX|Weather Buoy||Unknown location||||
+"""
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS["metric"]
+
+
+class StationCatalogTests(TestCase):
+    def setUp(self) -> None:
+        self.catalog = StationCatalog.from_table(STATION_TABLE)
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def test_from_table(self):
+        self.assertEqual(len(self.catalog), 6)
+        self.assertEqual(self.catalog.stations.loc["46042", "lat"], 36.785)
+        self.assertEqual(self.catalog.stations.loc["46042", "lon"], -122.398)
+        self.assertEqual(self.catalog.stations.loc["55012", "lat"], -30.36)
+        self.assertEqual(self.catalog.stations.loc["55012", "lon"], 153.27)
+
+    def test_parse_coordinate(self):
+        self.assertEqual(parse_coordinate("36.785 N"), 36.785)
+        self.assertEqual(parse_coordinate("122.398 W"), -122.398)
+        self.assertEqual(parse_coordinate(-122.398), -122.398)
+        with self.assertRaises(ValueError):
+            parse_coordinate("north")
+
+    def test_radial(self):
+        self.assertEqual(self.catalog.radial(36.785, -122.398, 50), {"46042", "46114"})
+        self.assertEqual(
+            self.catalog.radial("36.785 N", "122.398 W", 50, exclude="46042"),
+            {"46114"},
+        )
+        # 50 miles reaches Point Sur, 50 km does not
+        self.assertIn("46239", self.catalog.radial(36.785, -122.398, 50, "english"))
+
+    def test_box(self):
+        self.assertEqual(
+            self.catalog.box(36, 37, -122, -123), {"46042", "46114", "46239"}
+        )
+        self.assertEqual(self.catalog.box(20, 30, -90, -70), set())
+        self.assertEqual(self.catalog.box(20, 30, -90, -70, obs_type="all"), {"mlrf1"})
+
+    def test_nearest(self):
+        nearest = self.catalog.nearest(36.785, -122.398, k=3)
+        self.assertEqual(nearest.index.to_list(), ["46042", "46114", "46239"])
+        self.assertAlmostEqual(nearest["distance"].iloc[0], 0.0)
+        expected = haversine(36.785, -122.398, 36.700, -122.343)
+        self.assertAlmostEqual(nearest["distance"].iloc[1], expected, places=6)
+        self.assertEqual(
+            self.catalog.nearest(25, -80, obs_type="all").index.to_list(), ["mlrf1"]
+        )
+
+    def test_radial_many(self):
+        points = [(36.785, -122.398), (37.7, -122.8), (-30.0, 153.0), (0.0, 0.0)]
+        found = self.catalog.radial_many(points, 60)
+        self.assertEqual(
+            found, [self.catalog.radial(lat, lon, 60) for lat, lon in points]
+        )
+        self.assertEqual(found[2], {"55012"})
+        self.assertEqual(found[3], set())
+
+    def test_matches_great_circle(self):
+        rng = np.random.default_rng(1)
+        stations = self.catalog.stations
+        for lat, lon, distance in zip(
+            rng.uniform(-60, 60, 50),
+            rng.uniform(-180, 180, 50),
+            rng.uniform(1, 9000, 50),
+        ):
+            expected = {
+                s
+                for s, row in stations.iterrows()
+                if haversine(lat, lon, row["lat"], row["lon"]) <= distance
+            }
+            self.assertEqual(
+                self.catalog.radial(lat, lon, distance, obs_type="all"), expected
+            )
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.catalog.radial(36.785, -122.398, 50, uom="nautical")
+        with self.assertRaises(ValueError):
+            self.catalog.radial(36.785, -122.398, 50, obs_type="glider")
+        with self.assertRaises(ValueError):
+            self.catalog.search("polygon", 36.785, lon1=-122.398, distance=50)
+
+    def test_station_search(self):
+        db = DataBuoy("46042")
+        ids = db.station_search(
+            lat1=36.785, lon1=-122.398, distance=50, catalog=self.catalog
+        )
+        self.assertEqual(ids, {"46114"})
+        ids = db.station_search(
+            search_type="box",
+            lat1=36,
+            lat2=37,
+            lon1=-123,
+            lon2=-122,
+            catalog=self.catalog,
+        )
+        self.assertEqual(ids, {"46114", "46239"})
+        with self.assertRaises(ValueError):
+            db.station_search(lat1=36.785, lon1=-122.398, catalog=self.catalog)
+
+    def test_save_load(self):
+        path = os.path.join(self.tmp_dir, "stations.csv")
+        self.catalog.save(path)
+        loaded = StationCatalog.load(path)
+        self.assertEqual(
+            loaded.radial(36.785, -122.398, 50),
+            self.catalog.radial(36.785, -122.398, 50),
+        )
+        self.assertIn("mlrf1", loaded.stations.index)
+
+    def test_from_buoys(self):
+        buoys = []
+        for station_id, lat, lon in [
+            ("46042", "36.785 N", "122.398 W"),
+            ("46114", "36.700 N", "122.343 W"),
+        ]:
+            db = DataBuoy(station_id)
+            db.station_info = {"lat": lat, "lon": lon, "Water depth": "1645 m"}
+            buoys.append(db)
+        catalog = StationCatalog.from_buoys(buoys + [DataBuoy("46239")])
+        self.assertEqual(len(catalog), 2)
+        self.assertEqual(catalog.nearest(36.7, -122.34).index[0], "46114")
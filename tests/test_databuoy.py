@@ -15,6 +15,7 @@ from unittest import TestCase
 from NDBC.NDBC import DataBuoy
 
 FILE_NAME = "test_buoy.json"
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
 
 class DataBuoyTests(TestCase):
@@ -45,6 +46,33 @@ class DataBuoyTests(TestCase):
         dt = self.DB.data["stdmet"]["data"].iloc[1]["datetime"]
         self.assertIsInstance(dt, datetime)
 
+    def test_load_local_file(self):
+        self.DB._DataBuoy__load_data(os.path.join(DATA_DIR, "46042h2020.txt"))
+        df = self.DB.stdmet
+        self.assertEqual(len(df), 48)
+        self.assertEqual(self.DB.data["stdmet"]["meta"]["units"]["WSPD"], "m/s")
+        # Bad data flags replaced with NaN
+        self.assertTrue(df["DEWP"].isna().all())
+        self.assertTrue(df["WVHT"].iloc[1::2].isna().all())
+        self.assertEqual(df["WDIR"].isna().sum(), 7)
+
+    def test_build_datetime_vectorized(self):
+        self.DB._DataBuoy__load_data(
+            os.path.join(DATA_DIR, "46042h2020.txt"), datetime_index=True
+        )
+        index = self.DB.stdmet.index
+        self.assertIsInstance(index, pandas.DatetimeIndex)
+        self.assertEqual(index[0], datetime(2020, 1, 1, 0, 0))
+        self.assertEqual(index[-1], datetime(2020, 1, 1, 23, 30))
+        for col in ["YY", "MM", "DD", "hh", "mm"]:
+            self.assertNotIn(col, self.DB.stdmet.columns)
+
+    def test_two_digit_years(self):
+        self.DB._DataBuoy__load_data(os.path.join(DATA_DIR, "46042h1995.txt"))
+        dt = self.DB.stdmet["datetime"]
+        self.assertEqual(dt.iloc[0], datetime(1995, 1, 1, 0))
+        self.assertEqual(dt.iloc[-1], datetime(1995, 1, 2, 11))
+
     def test_station_metadata(self):
         self.DB.get_station_metadata()
         self.assertTrue(self.DB.station_info)
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Data fetching tests
+
+Verifying DataBuoy download behaviour against a local stand-in for the NDBC
+server that injects latency into every request.
+"""
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+YEARS = [2019, 2017, 2018, 2016]
+DELAY = 0.2
+
+
+class ConcurrentFetchTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2016, 2017, 2018]
+        }
+        self.server = NDBCStandIn(files, delay=DELAY).__enter__()
+        self.DB = self.server.buoy()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+
+    def test_concurrent_fetch(self):
+        with self.assertLogs("NDBC.NDBC", level="WARNING") as logs:
+            self.DB.get_data(years=YEARS, datetime_index=True, max_workers=4)
+        # Requests for different years were answered at the same time
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertIn("Year 2019 not available.", logs.output[0])
+        df = self.DB.stdmet
+        self.assertEqual(len(df), 3 * 48)
+        self.assertTrue(df.index.is_monotonic_increasing)
+        self.assertEqual(sorted(set(df.index.year)), [2016, 2017, 2018])
+
+    def test_matches_sequential(self):
+        self.DB.get_data(years=YEARS, datetime_index=True, max_workers=4)
+        sequential = self.server.buoy()
+        sequential.get_data(years=YEARS, datetime_index=True)
+        pd.testing.assert_frame_equal(self.DB.stdmet, sequential.stdmet)
+        self.assertEqual(
+            self.DB.data["stdmet"]["meta"], sequential.data["stdmet"]["meta"]
+        )
+
+    def test_appends_to_existing(self):
+        self.DB.get_data(years=[2016], datetime_index=True)
+        self.DB.get_data(years=[2017, 2018], datetime_index=True, max_workers=2)
+        self.assertEqual(len(self.DB.stdmet), 3 * 48)
+
+
+class SingleRequestTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2016, 2017, 2018]
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.DB = DataBuoy("46042")
+        self.DB.data_yearurls = [
+            self.server.url + "/missing/{station}{url_char}{year}.txt",
+            self.server.url + "/historical/{dtype}/{station}{url_char}{year}.txt",
+        ]
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+
+    def test_no_head_requests(self):
+        self.DB.get_data(years=[2016, 2017, 2018])
+        methods = {method for method, _ in self.server.requests}
+        self.assertEqual(methods, {"GET"})
+        # One miss and one hit per year, each body downloaded once
+        self.assertEqual(len(self.server.requests), 6)
+        self.assertEqual(len(self.DB.stdmet), 3 * 48)
+
+    def test_get_stdmet_single_request(self):
+        self.DB.get_stdmet(years=[2016, 2017], datetime_index=True)
+        methods = {method for method, _ in self.server.requests}
+        self.assertEqual(methods, {"GET"})
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(len(self.DB.stdmet), 2 * 48)
+
+    def test_connection_reused(self):
+        self.DB.get_data(years=[2016, 2017, 2018])
+        self.assertEqual(len(self.server.connections), 1)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-station fetching tests
+
+Verifying BuoyFleet scheduling, rate limiting and per job reporting against a
+local stand-in for the NDBC server.
+"""
+import time
+
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.fetch import RateLimiter
+from NDBC.fleet import DONE, FAILED, UNAVAILABLE, BuoyFleet
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+STATIONS = ["46042", "46011", "46026"]
+
+
+class FleetTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/{station}h{year}.txt": stdmet_year(year)
+            for station in STATIONS
+            for year in [2017, 2018]
+        }
+        # A file that cannot be parsed
+        files["/historical/stdmet/46011h2018.txt"] = "not an NDBC file\n"
+        self.server = NDBCStandIn(files).__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+
+    def fleet(self, **kwargs) -> BuoyFleet:
+        fleet = BuoyFleet(STATIONS, **kwargs)
+        for db in fleet.buoys.values():
+            self.server.redirect(db)
+        return fleet
+
+    def test_combined_frame(self):
+        progress = []
+        fleet = self.fleet(progress=lambda job, n, total: progress.append((n, total)))
+        with self.assertLogs("NDBC.fleet", level="WARNING"):
+            frames = fleet.get_data(years=[2016, 2017, 2018])
+        df = frames["stdmet"]
+        self.assertEqual(df.index.names, ["station", None])
+        self.assertEqual(sorted(df.index.unique("station")), sorted(STATIONS))
+        self.assertEqual(len(df.loc["46042"]), 2 * 48)
+        self.assertEqual(len(df.loc["46011"]), 48)
+        pd.testing.assert_frame_equal(df.loc["46026"], fleet.buoys["46026"].stdmet)
+        self.assertEqual(progress[-1], (9, 9))
+
+    def test_job_reporting(self):
+        fleet = self.fleet()
+        with self.assertLogs("NDBC.fleet", level="WARNING") as logs:
+            fleet.get_data(years=[2016, 2017, 2018])
+        status = {job.key: job.status for job in fleet.jobs}
+        self.assertEqual(status["46042/stdmet/2017"], DONE)
+        self.assertEqual(status["46042/stdmet/2016"], UNAVAILABLE)
+        self.assertEqual(status["46011/stdmet/2018"], FAILED)
+        self.assertEqual([j.key for j in fleet.failures], ["46011/stdmet/2018"])
+        self.assertEqual(len(fleet.unavailable), 3)
+        self.assertIn("46011/stdmet/2018 failed", logs.output[0])
+
+    def test_shared_session(self):
+        fleet = self.fleet(max_workers=4)
+        with self.assertLogs("NDBC.fleet", level="WARNING"):
+            fleet.get_data(years=[2017, 2018])
+        self.assertTrue(all(db.session is fleet.session for db in fleet.buoys.values()))
+        self.assertLessEqual(len(self.server.connections), 4)
+
+    def test_rate_limit(self):
+        fleet = self.fleet(max_workers=6, rate=10)
+        start = time.perf_counter()
+        with self.assertLogs("NDBC.fleet", level="WARNING"):
+            fleet.get_data(years=[2017, 2018])
+        # Six requests to one host at ten per second
+        self.assertGreaterEqual(time.perf_counter() - start, 0.5)
+
+    def test_unknown_package(self):
+        with self.assertRaises(ValueError):
+            self.fleet().get_data(years=[2017], data_types=["waves"])
+
+    def test_no_periods(self):
+        with self.assertRaises(ValueError):
+            self.fleet().get_data()
+
+    def test_unavailable_messages(self):
+        fleet = self.fleet()
+        with self.assertLogs("NDBC.fleet", level="WARNING") as logs:
+            fleet.get_data(years=[2016, 2017])
+        self.assertEqual(len(fleet.unavailable), 3)
+        unavailable = [line for line in logs.output if "not available" in line]
+        self.assertEqual(len(unavailable), 3)
+        self.assertTrue(
+            any("46042/stdmet: Year 2016 not available" in line for line in unavailable)
+        )
+
+
+class RateLimiterTests(TestCase):
+    def test_spacing_per_host(self):
+        limiter = RateLimiter(20)
+        start = time.perf_counter()
+        for _ in range(5):
+            limiter.wait("http://a.example/file.txt")
+            limiter.wait("http://b.example/file.txt")
+        elapsed = time.perf_counter() - start
+        self.assertGreaterEqual(elapsed, 4 / 20)
+        self.assertLess(elapsed, 8 / 20)
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
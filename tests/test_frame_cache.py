@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Parsed data cache tests
+
+Verifying parsed periods are stored in the Feather cache and reused without
+downloading or parsing the source file again.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.cache import FrameCache, feather
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+
+@unittest.skipIf(feather is None, "pyarrow is not installed")
+class FrameCacheTests(TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.mkdtemp()
+        self.files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2016, 2017]
+        }
+        self.files["/stdmet/Jan/46042.txt"] = stdmet_year(2021)
+        self.server = NDBCStandIn(self.files).__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.cache_dir)
+
+    def test_matches_parsed_data(self):
+        for datetime_index in [True, False]:
+            expected = self.server.buoy()
+            expected.get_data(years=[2016, 2017], datetime_index=datetime_index)
+            for _ in range(2):
+                cached = self.server.buoy(frame_cache=FrameCache(self.cache_dir))
+                cached.get_data(years=[2016, 2017], datetime_index=datetime_index)
+                pd.testing.assert_frame_equal(cached.stdmet, expected.stdmet)
+                self.assertEqual(
+                    cached.data["stdmet"]["meta"], expected.data["stdmet"]["meta"]
+                )
+
+    def test_historical_periods_skip_download(self):
+        cache = FrameCache(self.cache_dir)
+        self.server.buoy(frame_cache=cache).get_data(years=[2016, 2017])
+        requests_before = len(self.server.requests)
+        self.server.buoy(frame_cache=cache).get_data(years=[2016, 2017])
+        self.assertEqual(len(self.server.requests), requests_before)
+        self.assertEqual(cache.stats()["hits"], 2)
+
+    def test_mutable_periods_checked_against_source(self):
+        cache = FrameCache(self.cache_dir)
+        self.server.buoy(frame_cache=cache).get_data(months=[1])
+        db = self.server.buoy(frame_cache=cache)
+        db.get_data(months=[1])
+        self.assertEqual(cache.hits, 1)
+        self.files["/stdmet/Jan/46042.txt"] = stdmet_year(2022)
+        db = self.server.buoy(frame_cache=cache)
+        db.get_data(months=[1])
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(set(db.stdmet["datetime"].dt.year), {2022})
+
+    def test_bounded_size(self):
+        data, units = self.server.buoy()._parse_text(stdmet_year(2016))
+        cache = FrameCache(self.cache_dir)
+        cache.put("46042/stdmet/2016", data, units)
+        entry = cache.size
+        cache = FrameCache(self.cache_dir, max_bytes=2 * entry)
+        self.assertEqual(cache.stats()["entries"], 1)
+        cache.put("46042/stdmet/2017", data, units)
+        # The oldest entry is evicted, unless it was read more recently
+        self.assertIsNotNone(cache.get("46042/stdmet/2016"))
+        cache.put("46042/stdmet/2018", data, units)
+        self.assertLessEqual(cache.size, 2 * entry)
+        self.assertIsNone(cache.get("46042/stdmet/2017"))
+        self.assertIsNotNone(cache.get("46042/stdmet/2016"))
+        self.assertIsNotNone(cache.get("46042/stdmet/2018"))
+
+    def test_concurrent_writers(self):
+        data, units = self.server.buoy()._parse_text(stdmet_year(2016))
+        caches = [FrameCache(self.cache_dir) for _ in range(4)]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(
+                pool.map(
+                    lambda i: caches[i % 4].put(
+                        "46042/stdmet/2016", data, units, digest=str(i % 4)
+                    ),
+                    range(40),
+                )
+            )
+        cached, cached_units = caches[0].get("46042/stdmet/2016")
+        pd.testing.assert_frame_equal(cached, data)
+        self.assertEqual(cached_units, units)
+        files = os.listdir(os.path.join(self.cache_dir, "46042", "stdmet"))
+        self.assertEqual(files, ["2016.feather"])
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Chunk merging tests
+
+Verifying that parsed periods are combined in one pass, ordered by time and
+de-duplicated, and that merging can be deferred until the data is accessed.
+"""
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.frames import ChunkedFrame, merge_frames
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+
+def chunk(start: str, periods: int, value: float, datetime_index=True):
+    times = pd.date_range(start, periods=periods, freq="H")
+    df = pd.DataFrame({"WSPD": [value] * periods, "datetime": times})
+    return df.set_index("datetime").rename_axis(None) if datetime_index else df
+
+
+class MergeFramesTests(TestCase):
+    def test_sorted_and_deduplicated(self):
+        later = chunk("2020-01-02", 24, 2.0)
+        earlier = chunk("2020-01-01", 30, 1.0)
+        merged = merge_frames([later, earlier])
+        self.assertTrue(merged.index.is_monotonic_increasing)
+        self.assertTrue(merged.index.is_unique)
+        self.assertEqual(len(merged), 48)
+        # The overlapping hours are taken from the chunk loaded last
+        self.assertEqual(merged.loc["2020-01-02 03:00", "WSPD"], 1.0)
+
+    def test_datetime_column(self):
+        merged = merge_frames(
+            [
+                chunk("2020-01-02", 24, 2.0, datetime_index=False),
+                chunk("2020-01-01", 30, 1.0, datetime_index=False),
+            ]
+        )
+        self.assertTrue(merged["datetime"].is_monotonic_increasing)
+        self.assertTrue(merged["datetime"].is_unique)
+        pd.testing.assert_index_equal(merged.index, pd.RangeIndex(48))
+
+    def test_single_ordered_chunk_not_copied(self):
+        df = chunk("2020-01-01", 24, 1.0)
+        self.assertIs(merge_frames([df]), df)
+
+    def test_chunked_frame(self):
+        chunks = [chunk("2020-01-01", 24, 1.0), chunk("2020-01-02", 24, 2.0)]
+        lazy = ChunkedFrame(chunks[:1])
+        lazy.extend(chunks[1:])
+        self.assertEqual(len(lazy), 2)
+        pd.testing.assert_frame_equal(lazy.load(), merge_frames(chunks))
+
+
+class DeferredMergeTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2016, 2017, 2018]
+        }
+        self.server = NDBCStandIn(files).__enter__()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+
+    def test_defer_merge(self):
+        db = self.server.buoy()
+        db.get_data(years=[2018, 2016], datetime_index=True, defer_merge=True)
+        db.get_data(years=[2017], datetime_index=True, defer_merge=True)
+        self.assertIsInstance(db.data["stdmet"]["data"], ChunkedFrame)
+        self.assertEqual(len(db.data["stdmet"]["data"]), 3)
+        eager = self.server.buoy()
+        eager.get_data(years=[2016, 2017, 2018], datetime_index=True)
+        pd.testing.assert_frame_equal(db.stdmet, eager.stdmet)
+        self.assertIsInstance(db.data["stdmet"]["data"], pd.DataFrame)
+
+    def test_reloading_does_not_duplicate(self):
+        db = self.server.buoy()
+        db.get_data(years=[2016, 2017], datetime_index=False)
+        db.get_data(years=[2017], datetime_index=False)
+        self.assertEqual(len(db.stdmet), 2 * 48)
+        self.assertTrue(db.stdmet["datetime"].is_unique)
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Station metadata tests
+
+Verifying station page parsing, the metadata cache and bulk retrieval against
+a local stand-in for the NDBC server.
+"""
+import shutil
+import tempfile
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.cache import MetadataCache
+from NDBC.fleet import BuoyFleet
+from NDBC.metadata import StationMetadata, parse_station_page
+from tests.ndbc_server import NDBCStandIn
+
+STATION_PAGE = """<html><body>
+<div id="nav"><p><b>Search:</b> 36.000 N 122.000 W<br/></p></div>
+<div id="stn_metadata">
+<p>Station {station}</p>
+<p><b>Owned and maintained by National Data Buoy Center</b><br/>
+<b>3-meter foam buoy</b><br/>
+{lat} N 122.398 W (36&#176;47'6" N 122&#176;23'53" W)<br/>
+<br/>
+<b>Site elevation:</b> sea level<br/>
+<b>Air temp height:</b> 3.7 m above site elevation<br/>
+<b>Water depth:</b> {depth} m<br/>
+</p></div></body></html>
+"""
+
+STATIONS = {"46042": ("36.785", "1645"), "46114": ("36.700", "1463")}
+
+
+class ParseTests(TestCase):
+    def test_parse_station_page(self):
+        info = parse_station_page(
+            STATION_PAGE.format(station="46042", lat="36.785", depth="1645")
+        )
+        self.assertEqual(
+            info,
+            {
+                "lat": "36.785 N",
+                "lon": "122.398 W",
+                "Site elevation": "sea level",
+                "Air temp height": "3.7 m above site elevation",
+                "Water depth": "1645 m",
+            },
+        )
+
+    def test_missing_metadata(self):
+        with self.assertRaises(ValueError):
+            parse_station_page("<html><body><p>Station not found</p></body></html>")
+
+
+class StationMetadataTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/station_page.php?station={station}": STATION_PAGE.format(
+                station=station, lat=lat, depth=depth
+            )
+            for station, (lat, depth) in STATIONS.items()
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.url = self.server.url + "/station_page.php?station={}"
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_frame(self):
+        service = StationMetadata(url=self.url)
+        with self.assertLogs("NDBC.metadata", level="WARNING"):
+            frame = service.frame(["46042", "46114", "46011"])
+        self.assertEqual(frame.index.to_list(), ["46042", "46114"])
+        self.assertEqual(frame.loc["46114", "lat"], "36.700 N")
+        self.assertEqual(frame.loc["46042", "Water depth"], "1645 m")
+        self.assertIn("46011", service.errors)
+
+    def test_cache(self):
+        cache = MetadataCache(self.tmp_dir)
+        StationMetadata(cache=cache, url=self.url).get_many(STATIONS)
+        requests = len(self.server.requests)
+        # A new cache over the same directory reads the stored entries
+        cached = StationMetadata(cache=MetadataCache(self.tmp_dir), url=self.url)
+        self.assertEqual(cached.get("46042")["Water depth"], "1645 m")
+        self.assertEqual(len(self.server.requests), requests)
+        expired = StationMetadata(
+            cache=MetadataCache(self.tmp_dir, ttl=0), url=self.url
+        )
+        expired.get("46042")
+        self.assertEqual(len(self.server.requests), requests + 1)
+
+    def test_databuoy_service(self):
+        db = DataBuoy("46114")
+        db.get_station_metadata(service=StationMetadata(url=self.url))
+        self.assertEqual(db.station_info["Water depth"], "1463 m")
+
+    def test_fleet(self):
+        fleet = BuoyFleet(STATIONS, rate=None)
+        frame = fleet.station_metadata(url=self.url)
+        self.assertEqual(sorted(frame.index), sorted(STATIONS))
+        self.assertEqual(fleet.buoys["46114"].station_info["lat"], "36.700 N")
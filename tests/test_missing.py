@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Missing value tests
+
+Verifying the vectorized bad data flag replacement matches the original
+element-wise rule.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.missing import mask_sentinels, sentinel_values
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def legacy_bad_data_check(df):
+    """The original per-cell implementation, kept here as the reference."""
+
+    def bad_data_func(x, n):
+        return (
+            np.NaN
+            if all([d == "9" for d in str(int(x))]) and len(str(int(x))) == n
+            else x
+        )
+
+    for col in df.columns:
+        n = len(str(int(df[col].max())))
+        df[col] = df[col].apply(bad_data_func, n=n)
+    return df
+
+
+class MissingValueTests(TestCase):
+    def setUp(self) -> None:
+        self.df = pd.read_csv(
+            os.path.join(DATA_DIR, "46042h2020.txt"), sep=r"\s+", skiprows=[1]
+        ).drop(columns=["#YY", "MM", "DD", "hh", "mm"])
+
+    def test_sentinel_values(self):
+        sentinels = sentinel_values(self.df)
+        self.assertEqual(sentinels["WDIR"], 999)
+        self.assertEqual(sentinels["WVHT"], 99)
+        self.assertEqual(sentinels["PRES"], 9999)
+        self.assertEqual(sentinels["DEWP"], 999)
+
+    def test_matches_legacy_nan_pattern(self):
+        expected = legacy_bad_data_check(self.df.copy())
+        result = mask_sentinels(self.df.copy())
+        pd.testing.assert_frame_equal(expected.isna(), result.isna(), check_dtype=False)
+        pd.testing.assert_frame_equal(expected, result, check_dtype=False)
+
+    def test_matches_legacy_random(self):
+        rng = np.random.default_rng(0)
+        values = rng.uniform(-5, 60, size=(500, 6)).round(1)
+        values[rng.random(values.shape) < 0.1] = 99.0
+        df = pd.DataFrame(values, columns=list("abcdef"))
+        expected = legacy_bad_data_check(df.copy())
+        result = mask_sentinels(df.copy())
+        pd.testing.assert_frame_equal(expected, result, check_dtype=False)
+
+    def test_all_missing_column_skipped(self):
+        df = pd.DataFrame({"a": [np.nan, np.nan], "b": [1.0, 9.0]})
+        result = mask_sentinels(df)
+        self.assertTrue(result["a"].isna().all())
+        self.assertTrue(np.isnan(result["b"].iloc[1]))
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Process pool parsing tests
+
+Verifying files parsed in worker processes match those parsed in process.
+"""
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.cache import FrameCache
+from NDBC.parallel import ProcessParser, discard, from_ipc, pa, parse_text, to_ipc
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+YEARS = [2016, 2017, 2018, 2019]
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class IPCTests(TestCase):
+    def test_round_trip(self):
+        text = stdmet_year(2020)
+        for datetime_index in [True, False]:
+            for compact in [True, False]:
+                data_df, _ = DataBuoy._parse_text(text, datetime_index, compact=compact)
+                pd.testing.assert_frame_equal(from_ipc(to_ipc(data_df)), data_df)
+
+
+class ProcessParserTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year) for year in YEARS
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parser(self):
+        text = stdmet_year(2020)
+        with ProcessParser(2) as parser:
+            self.assertEqual(parser.max_workers, 2)
+            self.assertEqual(parser.transport, "shm")
+            for transport in ["ipc", "shm", "pickle"] if pa else ["shm", "pickle"]:
+                parser.transport = transport
+                data_df, units = parser(text, True, compact=True, columns=["WVHT"])
+                expected, expected_units = DataBuoy._parse_text(
+                    text, True, compact=True, columns=["WVHT"]
+                )
+                pd.testing.assert_frame_equal(data_df, expected)
+                self.assertEqual(units, expected_units)
+
+    def test_get_data(self):
+        expected = self.server.buoy()
+        expected.get_data(years=YEARS, datetime_index=True)
+        db = self.server.buoy()
+        db.get_data(years=YEARS, datetime_index=True, parse_workers=2)
+        pd.testing.assert_frame_equal(db.stdmet, expected.stdmet)
+        self.assertEqual(db.data["stdmet"]["meta"], expected.data["stdmet"]["meta"])
+
+    def test_shared_pool_and_frame_cache(self):
+        expected = self.server.buoy()
+        expected.get_data(years=YEARS, compact=True)
+        with ProcessPoolExecutor(2) as pool:
+            db = self.server.buoy(frame_cache=FrameCache(self.tmp_dir))
+            db.get_data(years=YEARS, compact=True, parse_workers=pool)
+            # Cached frames are reused by later loads
+            cached = self.server.buoy(frame_cache=FrameCache(self.tmp_dir))
+            cached.get_data(years=YEARS, compact=True, parse_workers=pool)
+        pd.testing.assert_frame_equal(db.stdmet, expected.stdmet)
+        pd.testing.assert_frame_equal(cached.stdmet, expected.stdmet)
+        self.assertEqual(db.frame_cache.stats()["hits"], 0)
+
+    def test_parser_reused_across_loads(self):
+        expected = self.server.buoy()
+        expected.get_data(years=YEARS, datetime_index=True)
+        with ProcessParser(2, transport="shm") as parser:
+            db = self.server.buoy()
+            db.get_data(years=YEARS[:2], datetime_index=True, parse_workers=parser)
+            # The parser is left running for later loads
+            db.get_data(years=YEARS[2:], datetime_index=True, parse_workers=parser)
+        pd.testing.assert_frame_equal(db.stdmet, expected.stdmet)
+
+    def test_unreceived_results_released(self):
+        with ProcessPoolExecutor(1) as pool:
+            # A result whose caller stopped waiting
+            future = pool.submit(parse_text, stdmet_year(2020), True)
+            future.add_done_callback(discard)
+            name = future.result()[0].name
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name)
+
+    def test_unknown_transport(self):
+        with self.assertRaises(ValueError):
+            ProcessParser(1, transport="pipe")
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Text parser tests
+
+Verifying NDBC text files are parsed in a single pass with header, units and
+data types identified correctly.
+"""
+import gzip
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from unittest import TestCase
+
+from NDBC.parsers import parse_header, parse_ndbc_text, read_ndbc_text
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+class ParserTests(TestCase):
+    def test_header_with_units(self):
+        with open(os.path.join(DATA_DIR, "46042h2020.txt")) as f:
+            columns, units, skiprows = parse_header(f.read())
+        self.assertEqual(columns[:5], ["YY", "MM", "DD", "hh", "mm"])
+        self.assertEqual(units["WVHT"], "m")
+        self.assertEqual(skiprows, 2)
+
+    def test_header_without_units(self):
+        with open(os.path.join(DATA_DIR, "46042h1995.txt")) as f:
+            columns, units, skiprows = parse_header(f.read())
+        self.assertEqual(columns[:4], ["YY", "MM", "DD", "hh"])
+        self.assertFalse(units)
+        self.assertEqual(skiprows, 1)
+
+    def test_dtypes_applied_at_parse(self):
+        data, units = read_ndbc_text(os.path.join(DATA_DIR, "46042h2020.txt"))
+        self.assertEqual(len(data), 48)
+        self.assertEqual(data["YY"].dtype, np.int32)
+        self.assertEqual(data["WDIR"].dtype, np.float64)
+        self.assertEqual(data["WSPD"].dtype, np.float64)
+        self.assertEqual(units["PRES"], "hPa")
+
+    def test_gzipped_file(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmp_dir, "46042h2020.txt.gz")
+            with open(os.path.join(DATA_DIR, "46042h2020.txt"), "rb") as src:
+                with gzip.open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+            data, _ = read_ndbc_text(path)
+            self.assertEqual(len(data), 48)
+        finally:
+            shutil.rmtree(tmp_dir)
+
+    def test_missing_tokens(self):
+        text = (
+            "#YY  MM DD hh mm WDIR WSPD\n"
+            "#yr  mo dy hr mn degT m/s\n"
+            "2024 05 01 12 00  MM  5.0\n"
+            "2024 05 01 11 50 270   MM\n"
+        )
+        data, _ = parse_ndbc_text(text)
+        self.assertTrue(np.isnan(data["WDIR"].iloc[0]))
+        self.assertTrue(np.isnan(data["WSPD"].iloc[1]))
+        self.assertEqual(data["MM"].dtype, np.int32)
+        self.assertEqual(data["WDIR"].dtype, np.float64)
+
+    def test_selected_columns(self):
+        with open(os.path.join(DATA_DIR, "46042h2020.txt")) as f:
+            data, units = parse_ndbc_text(f.read(), columns=["WVHT", "DPD", "XXX"])
+        self.assertEqual(
+            data.columns.to_list(), ["YY", "MM", "DD", "hh", "mm", "WVHT", "DPD"]
+        )
+        self.assertEqual(len(data), 48)
+        self.assertEqual(units["WVHT"], "m")
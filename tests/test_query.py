@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Time range and column query tests
+
+Verifying get_data with start, end and columns against a local stand-in for
+the NDBC server.
+"""
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from datetime import datetime as dt
+from unittest import TestCase
+
+from NDBC.cache import FrameCache, feather
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+YEARS = [2016, 2017, 2018]
+START, END = "2017-01-01 06:00", "2018-01-01 12:00"
+
+
+class QueryTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year) for year in YEARS
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def expected(self, datetime_index=True) -> pd.DataFrame:
+        full = self.server.buoy()
+        full.get_data(years=YEARS, datetime_index=datetime_index)
+        return full.read(columns=["WVHT", "DPD"], start=START, end=END)
+
+    def test_window_and_columns(self):
+        db = self.server.buoy()
+        db.get_data(start=START, end=END, columns=["WVHT", "DPD"], datetime_index=True)
+        self.assertEqual(db.stdmet.columns.to_list(), ["WVHT", "DPD"])
+        self.assertEqual(db.stdmet.index[0], pd.Timestamp(START))
+        self.assertEqual(db.stdmet.index[-1], pd.Timestamp(END))
+        # Only the years within the window are requested
+        self.assertEqual(len(self.server.requests), 2)
+        pd.testing.assert_frame_equal(db.stdmet, self.expected())
+
+    def test_datetime_column(self):
+        db = self.server.buoy()
+        db.get_data(start=START, end=END, columns=["WVHT", "DPD"])
+        self.assertEqual(db.stdmet.columns.to_list(), ["WVHT", "DPD", "datetime"])
+        expected = self.expected(datetime_index=False).reset_index(drop=True)
+        pd.testing.assert_frame_equal(db.stdmet, expected)
+
+    @unittest.skipIf(feather is None, "pyarrow is not installed")
+    def test_frame_cache_keeps_all_columns(self):
+        cache = FrameCache(self.tmp_dir)
+        narrow = self.server.buoy(frame_cache=cache)
+        narrow.get_data(
+            start=START, end=END, columns=["WVHT", "DPD"], datetime_index=True
+        )
+        pd.testing.assert_frame_equal(narrow.stdmet, self.expected())
+        full = self.server.buoy(frame_cache=cache)
+        full.get_data(years=[2017], datetime_index=True)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertIn("WSPD", full.stdmet.columns)
+
+    def test_window_periods(self):
+        db = self.server.buoy()
+        this_year = dt.today().year
+        periods = db._window_periods("stdmet", f"{this_year - 2}-06-01")
+        keys = [p["key"] for p in periods]
+        self.assertEqual(
+            keys[:2], [f"46042/stdmet/{this_year - 2}", f"46042/stdmet/{this_year - 1}"]
+        )
+        # The current month is left to realtime
+        self.assertEqual(len(keys), 1 + dt.today().month)
+        self.assertNotIn(f"46042/stdmet/{this_year}-{dt.today().month:02d}", keys)
+        current = pd.Timestamp.today().replace(day=1)
+        self.assertEqual(db._window_periods("stdmet", current), [])
+
+    def test_invalid_window(self):
+        db = self.server.buoy()
+        with self.assertRaises(ValueError):
+            db.get_data(years=[2017], start=START)
+        with self.assertRaises(ValueError):
+            db.get_data(end=END)
+        with self.assertRaises(ValueError):
+            db.get_data(start=END, end=START)
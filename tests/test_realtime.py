@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Realtime file tests
+
+Verifying incremental updates from the newest-first realtime files against a
+local stand-in for the NDBC server.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.realtime import fetch_since, iter_rows, realtime_url, to_ndbc_text
+from NDBC.repository.storage import LazyFrame, pa
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+PATH = "/data/realtime2/46042.txt"
+
+DATA_SPEC = """#YY  MM DD hh mm Sep_Freq  < spec_1 (freq_1) spec_2 (freq_2) spec_3 (freq_3) ... >
+2024 03 01 01 40 0.115 0.000 (0.033) 9.410 (0.038) 1.280 (0.043)
+2024 03 01 00 40 9.999 0.000 (0.033) 9.050 (0.038) 999.00 (0.043)
+"""
+
+SWDIR = """#YY  MM DD hh mm alpha1_1 (freq_1) alpha1_2 (freq_2) alpha1_3 (freq_3) ... >
+2024 03 01 01 40 999.0 (0.033) 264.0 (0.038) 281.0 (0.043)
+2024 03 01 00 40 999.0 (0.033) 260.0 (0.038) 279.0 (0.043)
+"""
+
+# The newest row is from an instrument reporting an extra, lower frequency
+SWDIR_CHANGED = """#YY  MM DD hh mm alpha1_1 (freq_1) alpha1_2 (freq_2) alpha1_3 (freq_3) ... >
+2024 03 01 01 40 250.0 (0.025) 264.0 (0.038) 281.0 (0.043)
+2024 03 01 00 40 999.0 (0.033) 260.0 (0.038) 279.0 (0.043)
+"""
+
+CWIND = """#YY  MM DD hh mm WDIR WSPD GDR GST GTIME
+#yr  mo dy hr mn degT m/s degT m/s hhmm
+2024 03 01 01 50 310  6.1 999 99.0 9999
+2024 03 01 01 40 305  5.8 999 99.0 9999
+2024 03 01 01 30 300  5.7 310  8.2 0118
+"""
+
+# Realtime stdmet rows, where missing values are MM and several columns have
+# a single digit maximum
+REALTIME_STDMET = """#YY  MM DD hh mm WDIR WSPD GST  WVHT   DPD   APD MWD   PRES  ATMP  WTMP  DEWP  VIS PTDY  TIDE
+#yr  mo dy hr mn degT m/s  m/s     m   sec   sec degT   hPa  degC  degC  degC  nmi  hPa    ft
+2024 03 01 01 50 310  9.2 11.0    MM    MM    MM  MM 1015.2  12.1   9.8    MM   MM   MM    MM
+2024 03 01 01 40 305  9.6 11.5   1.3   9.0   6.1 290 1015.1  12.0   9.7    MM   MM -0.4    MM
+"""
+
+
+def realtime_text() -> str:
+    """The stdmet sample listed newest first, as in a realtime file"""
+    lines = stdmet_year(2020).splitlines(keepends=True)
+    return "".join(lines[:2] + lines[:1:-1])
+
+
+def historical_text(rows: int) -> str:
+    """The oldest rows of the stdmet sample"""
+    lines = stdmet_year(2020).splitlines(keepends=True)
+    return "".join(lines[: 2 + rows])
+
+
+class RealtimeTests(TestCase):
+    def test_iter_rows(self):
+        rows = iter_rows(realtime_text().split("\n"), "2020-01-01 22:00")
+        times = [time for time, _ in rows]
+        self.assertEqual(len(times), 3)
+        self.assertEqual(str(times[0]), "2020-01-01 23:30:00")
+        self.assertEqual(len(list(iter_rows(realtime_text().split("\n")))), 48)
+
+    def test_iter_rows_stops_early(self):
+        def lines():
+            yield from realtime_text().split("\n")[:6]
+            raise AssertionError("Read past a row already held")
+
+        self.assertEqual(len(list(iter_rows(lines(), "2020-01-01 22:00"))), 3)
+
+    def test_spectral_layout(self):
+        text = to_ndbc_text(DATA_SPEC.split("\n"), "swden")
+        self.assertEqual(text.split("\n")[0], "#YY  MM DD hh mm .0330 .0380 .0430")
+        self.assertEqual(text.split("\n")[1], "2024 03 01 01 40 0.000 9.410 1.280")
+        text = to_ndbc_text(SWDIR.split("\n"), "swdir", since="2024-03-01 01:00")
+        self.assertEqual(len(text.strip().split("\n")), 2)
+        self.assertEqual(
+            to_ndbc_text(SWDIR.split("\n"), "swdir", "2024-03-01 02:00"), ""
+        )
+
+    def test_frequency_change(self):
+        text = to_ndbc_text(SWDIR_CHANGED.split("\n"), "swdir")
+        lines = text.split("\n")
+        self.assertEqual(lines[0], "#YY  MM DD hh mm .0250 .0330 .0380 .0430")
+        self.assertEqual(lines[1], "2024 03 01 01 40 250.0 MM 264.0 281.0")
+        self.assertEqual(lines[2], "2024 03 01 00 40 MM 999.0 260.0 279.0")
+
+    def test_realtime_url(self):
+        self.assertEqual(
+            realtime_url("sdbc1"),
+            "https://www.ndbc.noaa.gov/data/realtime2/SDBC1.txt",
+        )
+        with self.assertRaises(ValueError):
+            realtime_url("46042", "waves")
+
+
+class SyncTests(TestCase):
+    def setUp(self) -> None:
+        self.server = NDBCStandIn({PATH: realtime_text()}).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def buoy(self, rows=40, datetime_index=True) -> DataBuoy:
+        db = self.server.buoy()
+        if rows:
+            db.data["stdmet"] = {
+                "data": db._parse_text(historical_text(rows), datetime_index)[0]
+            }
+        return db
+
+    def test_range_requests(self):
+        url = self.server.url + PATH
+        lines = fetch_since(url, "2020-01-01 22:00", chunk_size=256)
+        self.assertEqual(len(list(iter_rows(lines, "2020-01-01 22:00"))), 3)
+        self.assertLess(self.server.sent, len(realtime_text()) / 2)
+        self.assertGreater(len(self.server.requests), 1)
+
+    def test_sync_new_rows(self):
+        db = self.buoy()
+        expected = self.buoy(rows=48).stdmet
+        self.assertEqual(db.sync(), 8)
+        pd.testing.assert_frame_equal(db.stdmet, expected, check_freq=False)
+        self.assertEqual(db.sync(), 0)
+        self.assertEqual(len(db.stdmet), 48)
+
+    def test_sync_datetime_column(self):
+        db = self.buoy(datetime_index=False)
+        self.assertEqual(db.sync(), 8)
+        self.assertIn("datetime", db.stdmet.columns)
+        self.assertTrue(db.stdmet["datetime"].is_monotonic_increasing)
+
+    def test_sync_without_ranges(self):
+        self.server.ranges = False
+        db = self.buoy()
+        self.assertEqual(db.sync(), 8)
+        self.assertEqual(len(db.stdmet), 48)
+
+    def test_sync_empty_package(self):
+        db = self.buoy(rows=0)
+        self.assertEqual(db.sync(), 48)
+        self.assertTrue(db.stdmet.index.is_monotonic_increasing)
+
+    def test_realtime_packages(self):
+        self.server.files["/data/realtime2/46042.data_spec"] = DATA_SPEC
+        self.server.files["/data/realtime2/46042.swdir"] = SWDIR
+        self.server.files["/data/realtime2/46042.cwind"] = CWIND
+        db = self.buoy(rows=0)
+        swden = db.realtime("swden", datetime_index=True)
+        self.assertEqual(swden.columns.to_list(), [".0330", ".0380", ".0430"])
+        self.assertTrue(swden.index.is_monotonic_increasing)
+        self.assertTrue(pd.isna(swden.loc["2024-03-01 00:40", ".0430"]))
+        # Values are only masked where flagged, not when they are the maximum
+        np.testing.assert_allclose(swden[".0380"], [9.05, 9.41], rtol=1e-6)
+        self.assertEqual(len(db.realtime("swdir", since="2024-03-01 01:00")), 1)
+        self.assertNotIn("swdir", db.data)
+        self.assertEqual(db.sync("cwind"), 3)
+        self.assertEqual(db.cwind["GTIME"].iloc[0], 118)
+        self.assertEqual(db.data["cwind"]["meta"]["units"]["GTIME"], "hhmm")
+        self.assertEqual(db.sync("swden"), 2)
+        np.testing.assert_allclose(
+            db.spectral("swden").frequencies, [0.033, 0.038, 0.043], rtol=1e-6
+        )
+
+    def test_realtime_missing_values(self):
+        self.server.files[PATH] = REALTIME_STDMET
+        db = self.buoy(rows=0)
+        for compact in [False, True]:
+            data_df = db.realtime(datetime_index=True, compact=compact)
+            np.testing.assert_allclose(data_df["WSPD"], [9.6, 9.2], rtol=1e-6)
+            np.testing.assert_allclose(data_df["WTMP"], [9.7, 9.8], rtol=1e-6)
+            self.assertEqual(data_df["DPD"].iloc[0], 9.0)
+            self.assertTrue(pd.isna(data_df["DPD"].iloc[1]))
+            self.assertTrue(data_df["DEWP"].isna().all())
+
+    def test_sync_unavailable(self):
+        db = self.buoy()
+        db.station_id = "46011"
+        with self.assertLogs("NDBC.NDBC", level="WARNING"):
+            self.assertEqual(db.sync(), 0)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_sync_lazy_archive(self):
+        path = os.path.join(self.tmp_dir, "archive")
+        self.buoy().save(path, backend="parquet")
+        db = DataBuoy.load(path, lazy=True)
+        self.server.redirect(db)
+        self.assertEqual(db.last_time(), pd.Timestamp("2020-01-01 19:30"))
+        self.assertIsInstance(db.data["stdmet"]["data"], LazyFrame)
+        self.assertEqual(db.sync(), 8)
+        self.assertEqual(len(db.stdmet), 48)
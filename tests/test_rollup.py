@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Rollup tests
+
+Verifying precomputed aggregates match resampling the raw observations, are
+updated as periods are loaded and persist with archives.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.repository.storage import LazyFrame, pa
+from NDBC.rollup import Rollup
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+STATS = ["mean", "min", "max", "count"]
+
+
+def observations(start, end, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, end, freq="10min", name="datetime")
+    data = pd.DataFrame(
+        {
+            "WSPD": rng.uniform(0, 20, len(index)),
+            "WVHT": rng.uniform(0.3, 6, len(index)),
+        },
+        index=index,
+    )
+    # Masked bad data flags
+    data.loc[rng.random(len(index)) < 0.1, "WVHT"] = np.nan
+    return data
+
+
+def resampled(data, freq):
+    expected = data.resample(freq).agg(STATS)
+    expected = expected[expected.xs("count", axis=1, level=1).sum(axis=1) > 0]
+    return expected
+
+
+class RollupTests(TestCase):
+    def setUp(self) -> None:
+        self.data = observations("2019-11-20", "2020-02-10 23:50")
+
+    def assert_matches(self, rollup, data):
+        for freq, rule in [("hour", "H"), ("day", "D"), ("month", "MS")]:
+            expected = resampled(data, rule)
+            result = rollup.query(freq, STATS)
+            pd.testing.assert_frame_equal(
+                result, expected, check_dtype=False, check_freq=False, check_names=False
+            )
+
+    def test_chunks_in_order(self):
+        rollup = Rollup()
+        # Chunks splitting a day and a month, as realtime syncs do
+        for start, end in [
+            ("2019-11-20", "2019-12-15 12:05"),
+            ("2019-12-15 12:10", "2020-01-31"),
+            ("2020-01-31 00:10", "2020-02-11"),
+        ]:
+            rollup.update(self.data.loc[start:end])
+        self.assert_matches(rollup, self.data)
+
+    def test_chunks_out_of_order(self):
+        rollup = Rollup()
+        rollup.update(self.data.loc["2020-01"])
+        rollup.update(self.data.loc["2019-12-01":"2019-12-20 06:00"])
+        rollup.update(self.data.reset_index())
+        self.assert_matches(rollup, self.data)
+
+    def test_repeated_periods(self):
+        rollup = Rollup(["day"])
+        self.assertEqual(rollup.update(self.data), len(self.data))
+        self.assertEqual(rollup.update(self.data.loc["2020-01"]), 0)
+        result = rollup.query("day", ["count"], columns=["WSPD"])
+        self.assertEqual(result[("WSPD", "count")].max(), 144)
+
+    def test_corrected_period(self):
+        rollup = Rollup()
+        for month in ["2019-11", "2019-12", "2020-01", "2020-02"]:
+            rollup.update(self.data.loc[month])
+        corrected = self.data.copy()
+        corrected.loc["2019-12", "WSPD"] += 1.0
+        # Loading a period again replaces its aggregates
+        self.assertEqual(
+            rollup.update(corrected.loc["2019-12"]), len(self.data.loc["2019-12"])
+        )
+        self.assert_matches(rollup, corrected)
+        self.assertEqual(len(rollup.parts), 4)
+
+    def test_new_columns(self):
+        rollup = Rollup()
+        rollup.update(self.data[["WSPD"]])
+        # Rows already rolled up are added for the columns not yet aggregated
+        self.assertEqual(rollup.update(self.data.loc["2020-01"]), 31 * 144)
+        result = rollup.query("day", ["count"], start="2020-01-01", end="2020-01-31")
+        self.assertEqual(result[("WSPD", "count")].max(), 144)
+        pd.testing.assert_series_equal(
+            result[("WVHT", "count")],
+            self.data.loc["2020-01", "WVHT"].resample("D").count(),
+            check_names=False,
+            check_dtype=False,
+            check_freq=False,
+        )
+        self.assertEqual(len(rollup.spans["WVHT"]), 1)
+        rollup.update(self.data)
+        self.assert_matches(rollup, self.data)
+
+    def test_query(self):
+        rollup = Rollup(["day", "month"])
+        rollup.update(self.data)
+        result = rollup.query(
+            "day",
+            ["mean", "max"],
+            columns=["WVHT"],
+            start="2020-01-01",
+            end="2020-01-31",
+        )
+        self.assertEqual(len(result), 31)
+        self.assertEqual(result.columns.to_list(), [("WVHT", "mean"), ("WVHT", "max")])
+        with self.assertRaises(ValueError):
+            rollup.query("hour")
+        with self.assertRaises(ValueError):
+            rollup.query("day", ["median"])
+        with self.assertRaises(ValueError):
+            Rollup(["week"])
+
+
+class DataBuoyRollupTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2018, 2019, 2020]
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_updated_as_periods_load(self):
+        db = self.server.buoy()
+        db.get_data(years=[2018], datetime_index=True)
+        db.track_rollups("stdmet", ["hour", "day"])
+        db.get_data(years=[2019, 2020], datetime_index=True)
+        expected = db.stdmet.resample("D").agg(["mean", "max"])
+        expected = expected.dropna(how="all")
+        result = db.rollup(freq="day", stats=["mean", "max"])
+        pd.testing.assert_frame_equal(
+            result[expected.columns], expected, check_freq=False, check_names=False
+        )
+        with self.assertRaises(LookupError):
+            db.rollup("cwind")
+        with self.assertRaises(ValueError):
+            db.track_rollups("waves")
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_archive(self):
+        db = self.server.buoy()
+        db.track_rollups()
+        db.get_data(years=[2018, 2019, 2020])
+        path = os.path.join(self.tmp_dir, "archive")
+        db.save(path, backend="parquet")
+        loaded = DataBuoy.load(path, lazy=True)
+        pd.testing.assert_frame_equal(
+            loaded.rollup(freq="month", stats=STATS),
+            db.rollup(freq="month", stats=STATS),
+            check_freq=False,
+        )
+        # Coarse queries leave the observations on disk
+        self.assertIsInstance(loaded.data["stdmet"]["data"], LazyFrame)
+        self.assertEqual(loaded.rollups["stdmet"].spans, db.rollups["stdmet"].spans)
+        # Periods loaded again after the archive replace their aggregates
+        self.server.redirect(loaded)
+        loaded.get_data(years=[2019])
+        pd.testing.assert_frame_equal(
+            loaded.rollup(freq="day", stats=STATS),
+            db.rollup(freq="day", stats=STATS),
+            check_freq=False,
+        )
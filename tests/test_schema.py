@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Compact data type tests
+
+Verifying the per-package schema registry and the compact parsing mode of
+DataBuoy against the default float64 parsing.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.cache import FrameCache, feather
+from NDBC.schema import PACKAGE_SCHEMAS, compact_frame, package_schema
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+BINS = [".0200", ".0325", ".0375", ".0425", ".0475", ".0525"]
+SWDEN = (
+    "#YY  MM DD hh mm " + " ".join(BINS) + "\n"
+    "2020 01 01 00 40 0.00 0.05 1.12 4.31 12.10 8.44\n"
+    "2020 01 01 01 40 0.00 0.07 0.98 3.87 999.00 7.92\n"
+    "2020 01 01 02 40 0.00 0.04 1.30 5.02 14.66 9.01\n"
+)
+
+
+def parse(db, text, data_type, compact):
+    return db._parse_text(
+        text, datetime_index=True, data_type=data_type, compact=compact
+    )[0]
+
+
+class SchemaTests(TestCase):
+    def setUp(self) -> None:
+        self.DB = DataBuoy("46042")
+        with open(os.path.join(DATA_DIR, "46042h2020.txt")) as f:
+            self.stdmet_text = f.read()
+
+    def test_registry_covers_packages(self):
+        self.assertEqual(set(PACKAGE_SCHEMAS), set(DataBuoy.DATA_PACKAGES))
+        with self.assertRaises(ValueError):
+            package_schema("unknown")
+
+    def test_compact_stdmet(self):
+        default = parse(self.DB, self.stdmet_text, "stdmet", compact=False)
+        compact = parse(self.DB, self.stdmet_text, "stdmet", compact=True)
+        self.assertEqual(str(compact["WDIR"].dtype), "Int16")
+        self.assertEqual(str(compact["MWD"].dtype), "Int16")
+        self.assertEqual(compact["WSPD"].dtype, np.float32)
+        pd.testing.assert_frame_equal(
+            compact.astype("float64"), default.astype("float64"), atol=1e-4
+        )
+        # stdmet values have at most two decimals
+        pd.testing.assert_frame_equal(
+            compact.astype("float64").round(2), default.astype("float64").round(2)
+        )
+        self.assertLess(
+            compact.memory_usage(deep=True).sum(),
+            default.memory_usage(deep=True).sum(),
+        )
+
+    def test_compact_spectral(self):
+        compact = parse(self.DB, SWDEN, "swden", compact=True)
+        self.assertEqual(compact.columns.to_list(), BINS)
+        self.assertTrue((compact.dtypes == np.float32).all())
+        self.assertTrue(np.isnan(compact.loc["2020-01-01 01:40", ".0475"]))
+
+    def test_compact_two_digit_years(self):
+        with open(os.path.join(DATA_DIR, "46042h1995.txt")) as f:
+            compact = parse(self.DB, f.read(), "stdmet", compact=True)
+        self.assertEqual(compact.index[0].year, 1995)
+        self.assertEqual(str(compact["WD"].dtype), "Int16")
+
+    def test_compact_frame_loaded_data(self):
+        default = parse(self.DB, self.stdmet_text, "stdmet", compact=False)
+        compact = compact_frame(default.copy(), "stdmet")
+        self.assertEqual(str(compact["WDIR"].dtype), "Int16")
+        self.assertEqual(compact["PRES"].dtype, np.float32)
+
+
+class CompactGetDataTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year)
+            for year in [2017, 2018]
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_memory_usage(self):
+        default = self.server.buoy()
+        default.get_data(years=[2017, 2018], datetime_index=True)
+        compact = self.server.buoy()
+        compact.get_data(years=[2017, 2018], datetime_index=True, compact=True)
+        self.assertEqual(str(compact.stdmet["WDIR"].dtype), "Int16")
+        self.assertLess(
+            compact.memory_usage()["stdmet"], default.memory_usage()["stdmet"]
+        )
+
+    @unittest.skipIf(feather is None, "pyarrow is not installed")
+    def test_frame_cache_keeps_variants(self):
+        cache = FrameCache(os.path.join(self.tmp_dir, "frames"))
+        self.server.buoy(frame_cache=cache).get_data(years=[2017], compact=True)
+        default = self.server.buoy(frame_cache=cache)
+        default.get_data(years=[2017])
+        self.assertEqual(default.stdmet["WDIR"].dtype, np.float64)
+        compact = self.server.buoy(frame_cache=cache)
+        compact.get_data(years=[2017], compact=True)
+        self.assertEqual(str(compact.stdmet["WDIR"].dtype), "Int16")
+        self.assertEqual(cache.stats()["hits"], 1)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Shared memory tests
+
+Verifying frames handed between processes in shared memory are mapped
+unchanged and without copies.
+"""
+import gc
+import pickle
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.shm import SharedFrame
+from tests.ndbc_server import stdmet_year
+
+
+def open_and_sum(handle: SharedFrame) -> float:
+    """Map a shared frame in a worker process and sum a column"""
+    return float(handle.open(unlink=False)["WVHT"].sum())
+
+
+class SharedFrameTests(TestCase):
+    def setUp(self) -> None:
+        self.text = stdmet_year(2020)
+
+    def assertReleased(self, handle: SharedFrame) -> None:
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(handle.name)
+
+    def test_round_trip(self):
+        for datetime_index in [True, False]:
+            for compact in [True, False]:
+                data_df, _ = DataBuoy._parse_text(
+                    self.text, datetime_index, compact=compact
+                )
+                handle = SharedFrame.publish(data_df)
+                pd.testing.assert_frame_equal(handle.open(), data_df)
+                self.assertReleased(handle)
+
+    def test_handle_is_small(self):
+        data_df, _ = DataBuoy._parse_text(self.text, True, compact=True)
+        handle = SharedFrame.publish(data_df)
+        self.assertLess(len(pickle.dumps(handle)), 1024)
+        handle.unlink()
+        self.assertReleased(handle)
+
+    def test_mappings_share_memory(self):
+        data_df, _ = DataBuoy._parse_text(self.text, True)
+        handle = SharedFrame.publish(data_df)
+        first = handle.open(unlink=False)
+        second = handle.open()
+        first.iloc[0, first.columns.get_loc("WVHT")] = 123.0
+        self.assertEqual(second["WVHT"].iloc[0], 123.0)
+
+    def test_views_outlive_frame(self):
+        data_df, _ = DataBuoy._parse_text(self.text, True, compact=True)
+        shared = SharedFrame.publish(data_df).open()
+        wvht, wdir = shared["WVHT"].to_numpy(), shared["WDIR"].array
+        del shared
+        gc.collect()
+        # The block stays mapped while arrays view it
+        np.testing.assert_array_equal(wvht, data_df["WVHT"].to_numpy())
+        pd.testing.assert_extension_array_equal(wdir, data_df["WDIR"].array)
+
+    def test_open_in_other_process(self):
+        data_df, _ = DataBuoy._parse_text(self.text, True)
+        handle = SharedFrame.publish(data_df)
+        try:
+            with ProcessPoolExecutor(1) as pool:
+                total = pool.submit(open_and_sum, handle).result()
+            self.assertAlmostEqual(total, data_df["WVHT"].sum())
+        finally:
+            handle.unlink()
+
+    def test_unsupported_columns(self):
+        data_df = pd.DataFrame({"station": ["46042", "46026"]})
+        with self.assertRaises(ValueError):
+            SharedFrame.publish(data_df)
+        with self.assertRaises(ValueError):
+            SharedFrame.publish(pd.DataFrame({"x": [1.0]}, index=["a"]))
+
+    def test_share_package(self):
+        db = DataBuoy("46042")
+        db.data["stdmet"] = {"data": DataBuoy._parse_text(self.text, True)[0]}
+        handle = db.share(columns=["WVHT", "DPD"], start="2020-06-01")
+        shared = handle.open()
+        pd.testing.assert_frame_equal(
+            shared, db.read(columns=["WVHT", "DPD"], start="2020-06-01")
+        )
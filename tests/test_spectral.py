@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Spectral data model tests
+
+Verifying the (time, frequency) representation of spectral wave packages and
+their alignment on shared axes.
+"""
+import io
+import unittest
+
+import numpy as np
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.spectral import SpectralData, align_spectra, xr
+
+SWDEN = (
+    "#YY  MM DD hh mm .0200 .0325 .0375 .0425\n"
+    "2020 01 01 00 40 0.00 0.05 1.12 4.31\n"
+    "2020 01 01 01 40 0.00 0.07 999.00 3.87\n"
+    "2020 01 01 02 40 0.00 0.04 1.30 5.02\n"
+)
+# Direction file with an extra bin and a missing hour
+SWDIR = (
+    "#YY  MM DD hh mm .0200 .0325 .0375 .0425 .0475\n"
+    "2020 01 01 00 40 999.0 268.0 270.0 265.0 262.0\n"
+    "2020 01 01 02 40 999.0 271.0 266.0 263.0 261.0\n"
+)
+
+
+class SpectralTests(TestCase):
+    def setUp(self) -> None:
+        self.DB = DataBuoy("46042")
+        for data_type, text in [("swden", SWDEN), ("swdir", SWDIR)]:
+            self.DB._DataBuoy__load_data(
+                io.StringIO(text), datetime_index=True, data_type=data_type
+            )
+
+    def test_spectral_array(self):
+        spec = self.DB.spectral("swden")
+        self.assertIsInstance(spec, SpectralData)
+        self.assertEqual(spec.values.shape, (3, 4))
+        self.assertEqual(spec.values.dtype, np.float32)
+        self.assertTrue(spec.values.flags["C_CONTIGUOUS"])
+        np.testing.assert_allclose(spec.frequencies, [0.02, 0.0325, 0.0375, 0.0425])
+        self.assertTrue(np.isnan(spec.values[1, 2]))
+        np.testing.assert_allclose(spec.to_frame().to_numpy(), spec.values)
+
+    def test_not_spectral(self):
+        with self.assertRaises(ValueError):
+            self.DB.spectral("stdmet")
+        with self.assertRaises(LookupError):
+            self.DB.spectral("swr1")
+
+    def test_datetime_column(self):
+        db = DataBuoy("46042")
+        db._DataBuoy__load_data(io.StringIO(SWDEN), data_type="swden")
+        np.testing.assert_array_equal(
+            db.spectral("swden").values, self.DB.spectral("swden").values
+        )
+
+    def test_align_outer(self):
+        aligned = self.DB.spectral_dataset(as_xarray=False)
+        den, dirs = aligned["swden"], aligned["swdir"]
+        self.assertEqual(den.values.shape, (3, 5))
+        self.assertEqual(dirs.values.shape, (3, 5))
+        self.assertTrue(np.isnan(den.values[:, 4]).all())
+        self.assertTrue(np.isnan(dirs.values[1]).all())
+        self.assertEqual(dirs.values[2, 1], 271.0)
+
+    def test_align_inner(self):
+        aligned = align_spectra(
+            {k: self.DB.spectral(k) for k in ["swden", "swdir"]}, join="inner"
+        )
+        self.assertEqual(aligned["swden"].values.shape, (2, 4))
+        self.assertEqual(aligned["swdir"].values.shape, (2, 4))
+        with self.assertRaises(ValueError):
+            align_spectra({}, join="left")
+
+    @unittest.skipIf(xr is None, "xarray is not installed")
+    def test_xarray_dataset(self):
+        ds = self.DB.spectral_dataset()
+        self.assertEqual(set(ds.data_vars), {"swden", "swdir"})
+        self.assertEqual(ds["swden"].dims, ("time", "frequency"))
+        self.assertEqual(ds.sizes["frequency"], 5)
+        self.assertEqual(float(ds["swdir"].sel(frequency=ds.frequency[1])[2]), 271.0)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Storage backend tests
+
+Verifying DataBuoy objects round trip through the ORM storage backends with
+data types and indexes preserved.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.repository.orm import SIDECAR_FILE, BuoyORM
+from NDBC.repository.storage import LazyFrame, StorageBackend, get_backend, pa
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+try:
+    import tables  # noqa: F401
+
+    HAS_TABLES = True
+except ImportError:
+    HAS_TABLES = False
+
+
+def loaded_buoy(datetime_index=True) -> DataBuoy:
+    db = DataBuoy("46042")
+    db.station_info = {"lat": "36.785 N", "lon": "122.398 W"}
+    db._DataBuoy__load_data(
+        os.path.join(DATA_DIR, "46042h2020.txt"), datetime_index=datetime_index
+    )
+    return db
+
+
+class StorageTests(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmp_dir)
+
+    def assertRoundTrip(self, backend, datetime_index=True):
+        db = loaded_buoy(datetime_index)
+        path = os.path.join(self.tmp_dir, f"archive_{backend}")
+        db.save(path, backend=backend)
+        self.assertTrue(os.path.exists(os.path.join(path, SIDECAR_FILE)))
+        inst = DataBuoy.load(path)
+        pd.testing.assert_frame_equal(inst.stdmet, db.stdmet)
+        self.assertEqual(inst.data["stdmet"]["meta"], db.data["stdmet"]["meta"])
+        self.assertEqual(inst.station_info, db.station_info)
+        self.assertEqual(inst.station_id, db.station_id)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet_round_trip(self):
+        self.assertRoundTrip("parquet")
+        self.assertRoundTrip("parquet", datetime_index=False)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_feather_round_trip(self):
+        self.assertRoundTrip("feather")
+        self.assertRoundTrip("feather", datetime_index=False)
+
+    def assertLazyLoad(self, backend, datetime_index=True):
+        db = loaded_buoy(datetime_index)
+        path = os.path.join(self.tmp_dir, f"lazy_{backend}_{datetime_index}")
+        db.save(path, backend=backend)
+        inst = DataBuoy.load(path, lazy=True)
+        self.assertIsInstance(inst.data["stdmet"]["data"], LazyFrame)
+        start, end = "2020-01-01 01:00", "2020-01-01 03:00"
+        expected = db.read("stdmet", columns=["WSPD", "ATMP"], start=start, end=end)
+        subset = inst.read("stdmet", columns=["WSPD", "ATMP"], start=start, end=end)
+        self.assertIsInstance(inst.data["stdmet"]["data"], LazyFrame)
+        self.assertGreater(len(subset), 0)
+        self.assertLess(len(subset), len(db.stdmet))
+        pd.testing.assert_frame_equal(
+            subset.reset_index(drop=True), expected.reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(inst.stdmet, db.stdmet)
+        self.assertIsInstance(inst.data["stdmet"]["data"], pd.DataFrame)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_parquet_lazy_load(self):
+        self.assertLazyLoad("parquet")
+        self.assertLazyLoad("parquet", datetime_index=False)
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_feather_lazy_load(self):
+        self.assertLazyLoad("feather")
+        self.assertLazyLoad("feather", datetime_index=False)
+
+    @unittest.skipUnless(HAS_TABLES, "PyTables is not installed")
+    def test_hdf5_round_trip(self):
+        self.assertRoundTrip("hdf5")
+        self.assertRoundTrip("hdf5", datetime_index=False)
+
+    @unittest.skipUnless(HAS_TABLES, "PyTables is not installed")
+    def test_hdf5_lazy_load(self):
+        self.assertLazyLoad("hdf5")
+        self.assertLazyLoad("hdf5", datetime_index=False)
+
+    def test_incomplete_backend(self):
+        class WriteOnly(StorageBackend):
+            def write_frame(self, dataframe, path):
+                pass
+
+        with self.assertRaises(TypeError):
+            WriteOnly()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend("csv")
+
+    def test_json_save_leaves_data_untouched(self):
+        db = loaded_buoy()
+        db.save(os.path.join(self.tmp_dir, "buoy.json"))
+        self.assertIsInstance(db.stdmet, pd.DataFrame)
+        self.assertNotIn("orient", db.data["stdmet"]["meta"])
+
+    def test_orm_json_round_trip(self):
+        db = loaded_buoy(datetime_index=False)
+        path = os.path.join(self.tmp_dir, "buoy.json")
+        orm = BuoyORM()
+        orm.save_to_file(db, path)
+        inst = orm.load_from_file(path)
+        self.assertIsInstance(inst, DataBuoy)
+        self.assertEqual(len(inst.stdmet), len(db.stdmet))
+        self.assertEqual(inst.station_info, db.station_info)
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming download tests
+
+Verifying DataBuoy.iter_data and chunk sinks against a local stand-in for the
+NDBC server.
+"""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.repository.storage import ChunkSink, pa
+from tests.ndbc_server import NDBCStandIn, stdmet_year
+
+YEARS = [2016, 2017, 2018]
+
+
+class IterDataTests(TestCase):
+    def setUp(self) -> None:
+        files = {
+            f"/historical/stdmet/46042h{year}.txt": stdmet_year(year) for year in YEARS
+        }
+        self.server = NDBCStandIn(files).__enter__()
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        self.server.__exit__()
+        shutil.rmtree(self.tmp_dir)
+
+    def wait_for_requests(self, count, timeout=5) -> None:
+        deadline = time.monotonic() + timeout
+        while len(self.server.requests) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def requests_per_chunk(self, prefetch) -> list:
+        """Number of requests the server had seen as each chunk was consumed"""
+        seen = []
+        chunks = self.server.buoy().iter_data(years=YEARS, prefetch=prefetch)
+        for i, _ in enumerate(chunks):
+            if prefetch:
+                self.wait_for_requests(min(i + 2, len(YEARS)))
+            seen.append(len(self.server.requests))
+        return seen
+
+    def test_chunks_in_order(self):
+        db = self.server.buoy()
+        chunks = list(db.iter_data(years=list(reversed(YEARS)), datetime_index=True))
+        self.assertEqual([k for k, _ in chunks], [f"46042/stdmet/{y}" for y in YEARS])
+        self.assertEqual(db.data, {})
+        expected = self.server.buoy()
+        expected.get_data(years=YEARS, datetime_index=True)
+        pd.testing.assert_frame_equal(
+            pd.concat([df for _, df in chunks]), expected.stdmet
+        )
+
+    def test_unavailable_period(self):
+        with self.assertLogs("NDBC.NDBC", level="WARNING") as logs:
+            keys = [k for k, _ in self.server.buoy().iter_data(years=[2015] + YEARS)]
+        self.assertEqual(len(keys), 3)
+        self.assertIn("Year 2015 not available.", logs.output[0])
+
+    def test_prefetch_overlaps_processing(self):
+        # Without prefetch nothing is requested while a chunk is processed
+        self.assertEqual(self.requests_per_chunk(prefetch=0), [1, 2, 3])
+        self.server.requests.clear()
+        # With prefetch the next file is requested before the consumer asks
+        self.assertGreaterEqual(self.requests_per_chunk(prefetch=1)[0], 2)
+
+    def test_stop_early(self):
+        chunks = self.server.buoy().iter_data(years=YEARS, prefetch=1)
+        key, _ = next(chunks)
+        chunks.close()
+        self.assertEqual(key, "46042/stdmet/2016")
+        self.assertLessEqual(len(self.server.requests), 2)
+
+    def test_unknown_package(self):
+        with self.assertRaises(ValueError):
+            next(self.server.buoy().iter_data(years=YEARS, data_type="waves"))
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_chunk_sink(self):
+        sink = ChunkSink(os.path.join(self.tmp_dir, "chunks"))
+        chunks = list(self.server.buoy().iter_data(years=YEARS, sink=sink))
+        self.assertEqual(len(sink.files), 3)
+        self.assertTrue(
+            sink.files[0].endswith(os.path.join("46042", "stdmet", "2016.parquet"))
+        )
+        for (_, df), stored in zip(chunks, sink.frames()):
+            pd.testing.assert_frame_equal(stored.load(), df)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Integrated wave parameter tests
+
+Verifying the vectorized wave parameters against analytic spectra and a per
+row reference computation.
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from unittest import TestCase
+
+from NDBC.NDBC import DataBuoy
+from NDBC.spectral import SpectralData
+from NDBC.waves import PARAMETERS, bandwidths, wave_parameters
+
+FREQS = np.round(np.arange(0.05, 0.505, 0.01), 4).astype(np.float32)
+TIMES = pd.date_range("2020-01-01", periods=50, freq="H")
+
+
+def spectrum(data_type, values):
+    return SpectralData(data_type, TIMES, FREQS, values.astype(np.float32))
+
+
+def reference(density, alpha1, r1):
+    """Compute the parameters one observation at a time"""
+    df = bandwidths(FREQS)
+    rows = []
+    for s, a, r in zip(density, alpha1, r1):
+        m0 = sum(s * df)
+        m1 = sum(s * df * FREQS)
+        m2 = sum(s * df * FREQS**2)
+        a1 = sum(s * df * r * np.cos(np.deg2rad(a))) / m0
+        b1 = sum(s * df * r * np.sin(np.deg2rad(a))) / m0
+        rows.append(
+            [
+                4 * np.sqrt(m0),
+                1 / FREQS[np.argmax(s)],
+                m0 / m1,
+                np.sqrt(m0 / m2),
+                np.rad2deg(np.arctan2(b1, a1)) % 360,
+                np.rad2deg(np.sqrt(2 * (1 - np.hypot(a1, b1)))),
+            ]
+        )
+    return np.array(rows)
+
+
+class WaveParameterTests(TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.density = rng.uniform(0, 5, (len(TIMES), len(FREQS)))
+        self.alpha1 = rng.uniform(200, 300, self.density.shape)
+        self.r1 = rng.uniform(0.3, 0.9, self.density.shape)
+
+    def test_single_bin(self):
+        density = np.zeros((len(TIMES), len(FREQS)))
+        density[:, 5] = 2.0
+        alpha1 = np.full(density.shape, 270.0)
+        params = wave_parameters(
+            spectrum("swden", density),
+            spectrum("swdir", alpha1),
+            spectrum("swr1", np.ones(density.shape)),
+        )
+        np.testing.assert_allclose(params["Hm0"], 4 * np.sqrt(2.0 * 0.01), rtol=1e-5)
+        np.testing.assert_allclose(params["Tp"], 10.0, rtol=1e-5)
+        np.testing.assert_allclose(params["Tm01"], 10.0, rtol=1e-5)
+        np.testing.assert_allclose(params["Tm02"], 10.0, rtol=1e-5)
+        np.testing.assert_allclose(params["MeanDir"], 270.0, rtol=1e-5)
+        np.testing.assert_allclose(params["Spread"], 0.0, atol=1e-2)
+
+    def test_matches_reference(self):
+        params = wave_parameters(
+            spectrum("swden", self.density),
+            spectrum("swdir", self.alpha1),
+            spectrum("swr1", self.r1),
+        )
+        expected = reference(
+            self.density.astype(np.float32),
+            self.alpha1.astype(np.float32),
+            self.r1.astype(np.float32),
+        )
+        self.assertEqual(params.columns.to_list(), PARAMETERS)
+        np.testing.assert_allclose(params.to_numpy(), expected, rtol=1e-4)
+
+    def test_chunk_size_independent(self):
+        args = [spectrum("swden", self.density), spectrum("swdir", self.alpha1)]
+        args.append(spectrum("swr1", self.r1))
+        pd.testing.assert_frame_equal(
+            wave_parameters(*args, chunk_size=7), wave_parameters(*args)
+        )
+        with self.assertRaises(ValueError):
+            wave_parameters(*args, chunk_size=0)
+
+    def test_missing_rows_and_directions(self):
+        density = self.density.copy()
+        density[3] = np.nan
+        params = wave_parameters(spectrum("swden", density))
+        self.assertTrue(params.iloc[3].isna().all())
+        self.assertFalse(
+            params[["Hm0", "Tp", "Tm01", "Tm02"]].drop(TIMES[3]).isna().any().any()
+        )
+        self.assertTrue(params["MeanDir"].isna().all())
+
+    def test_databuoy(self):
+        text = "#YY  MM DD hh mm .0500 .1000 .1500\n"
+        text += "2020 01 01 00 40 0.00 2.00 0.00\n2020 01 01 01 40 0.00 999.00 1.00\n"
+        db = DataBuoy("46042")
+        db._DataBuoy__load_data(io.StringIO(text), data_type="swden")
+        params = db.wave_parameters()
+        self.assertEqual(len(params), 2)
+        self.assertAlmostEqual(params["Tp"].iloc[0], 10.0, places=4)
+        self.assertAlmostEqual(params["Tp"].iloc[1], 1 / 0.15, places=4)